@@ -1,8 +1,29 @@
-from aws_glue_workflow_analyzer.analyzer.workflow import GlueWorkflowAnalyzer
-from aws_glue_workflow_analyzer.cli import parse_args
-from aws_glue_workflow_analyzer.exceptions import WorkflowAnalyzerError
+import sys
+from functools import partial
+
+from rich.table import Table
+
+from aws_glue_workflow_analyzer.analyzer.enrichment import EnrichmentPolicy
+from aws_glue_workflow_analyzer.analyzer.signatures import SignatureEngine
+from aws_glue_workflow_analyzer.analyzer.workflow import (
+    AnalyzerOptions,
+    GlueWorkflowAnalyzer,
+)
+from aws_glue_workflow_analyzer.cli import parse_args, parse_query_args
+from aws_glue_workflow_analyzer.exceptions import (
+    PartialAnalysisError,
+    WorkflowAnalyzerError,
+)
 from aws_glue_workflow_analyzer.logger import console, logger
-from aws_glue_workflow_analyzer.output import save_to_csv, save_to_json
+from aws_glue_workflow_analyzer.output import (
+    save_to_csv,
+    save_to_json,
+    save_to_jsonl,
+    save_to_parquet,
+    save_to_sqlite,
+)
+from aws_glue_workflow_analyzer.result_store import ResultStore
+from aws_glue_workflow_analyzer.state import IncrementalState
 
 
 def main():
@@ -14,21 +35,130 @@ def main():
     WorkflowAnalyzerError
         If an error occurs during workflow analysis.
     """
+    if sys.argv[1:2] == ["query"]:
+        query(parse_query_args(sys.argv[2:]))
+        return
     args = parse_args()
     try:
-        analyzer = GlueWorkflowAnalyzer()
-        analysis_results = analyzer.analyze_workflows(args.workflows, args.days)
-        if args.output:
-            if args.format == "json":
-                save_to_json(analysis_results, args.output)
-            elif args.format == "csv":
-                save_to_csv(analysis_results, args.output)
-        else:
-            for result in analysis_results:
-                console.print_json(data=result)
+        incremental_state = (
+            IncrementalState(args.state_file) if args.incremental else None
+        )
+        analyzer = GlueWorkflowAnalyzer(
+            AnalyzerOptions(
+                max_workers=args.max_workers,
+                two_phase_runs=args.two_phase_runs,
+                static_graph=args.static_graph,
+                log_strategy=args.log_strategy,
+                max_tail_events=args.tail_max_events,
+                max_tail_bytes=args.tail_max_bytes,
+                cache_dir=args.cache_dir,
+                cache_ttl=args.cache_ttl,
+            ),
+            incremental_state=incremental_state,
+            enrichment_policy=EnrichmentPolicy(
+                args.enrich_statuses, enrich_all=args.enrich_all
+            ),
+            signatures=(
+                SignatureEngine.from_config(args.signatures)
+                if args.signatures
+                else None
+            ),
+        )
+        errors = []
+        analysis_results = analyzer.iter_step_details(args.workflows, args.days, errors)
+        written = write_results(analysis_results, args)
+        if incremental_state is not None:
+            if written and not errors:
+                incremental_state.commit()
+            else:
+                logger.warning(
+                    f"State file {args.state_file} not updated, the runs of this analysis will be analyzed again."
+                )
+        if errors:
+            logger.error(
+                f"An error occurred during workflow analysis: {PartialAnalysisError(errors=errors)}"
+            )
     except WorkflowAnalyzerError as e:
         logger.error(f"An error occurred during workflow analysis: {e}")
 
 
+def write_results(analysis_results, args):
+    """
+    Writes the analysis results to the requested output.
+
+    Parameters
+    ----------
+    analysis_results : Iterable[Dict[str, Any]]
+        The step execution details to write, consumed as they are produced.
+    args : argparse.Namespace
+        The parsed command-line arguments.
+
+    Returns
+    -------
+    bool
+        True if every result was written, False if writing failed.
+    """
+    if args.output:
+        compression = {
+            "compression": args.compress,
+            "compression_level": args.compress_level,
+        }
+        writers = {
+            "json": partial(save_to_json, **compression),
+            "jsonl": partial(save_to_jsonl, **compression),
+            "csv": partial(
+                save_to_csv,
+                max_shard_bytes=(
+                    args.shard_size_mb * 1024 * 1024 if args.shard_size_mb else None
+                ),
+                **compression,
+            ),
+            "sqlite": save_to_sqlite,
+            "parquet": partial(
+                save_to_parquet, row_group_size=args.row_group_size, **compression
+            ),
+        }
+        if args.format == "sqlite" and args.compress:
+            logger.warning("The SQLite result store is not compressed.")
+        return writers[args.format](analysis_results, args.output)
+    for result in analysis_results:
+        console.print_json(data=result)
+    return True
+
+
+def query(args):
+    """
+    Prints aggregates of the step history stored in a SQLite result store.
+
+    Parameters
+    ----------
+    args : argparse.Namespace
+        The parsed arguments of the ``gwfa query`` subcommand.
+    """
+    try:
+        store = ResultStore(args.database, read_only=True)
+        try:
+            if args.sql:
+                columns, rows = store.execute(args.sql)
+            else:
+                columns, rows = store.aggregate(
+                    group_by=args.group_by,
+                    workflow_name=args.workflow,
+                    node=args.node,
+                    status=args.status,
+                    since=args.since,
+                    until=args.until,
+                )
+        finally:
+            store.close()
+    except WorkflowAnalyzerError as e:
+        logger.error(f"An error occurred while querying the result store: {e}")
+        return
+    table = Table(*columns)
+    for row in rows:
+        table.add_row(*("" if value is None else str(value) for value in row))
+    console.print(table)
+
+
 if __name__ == "__main__":
     main()
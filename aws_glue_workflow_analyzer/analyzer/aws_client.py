@@ -1,4 +1,7 @@
+from typing import Optional
+
 import boto3
+from botocore.config import Config
 from botocore.exceptions import (
     EndpointConnectionError,
     NoCredentialsError,
@@ -14,10 +17,16 @@ class AWSClientManager:
     Manages the initialization of AWS Glue and CloudWatch Logs clients.
     """
 
-    def __init__(self):
+    def __init__(self, max_pool_connections: Optional[int] = None):
         """
         Initializes the Glue and CloudWatch clients.
 
+        Parameters
+        ----------
+        max_pool_connections : Optional[int], optional
+            The maximum number of HTTP connections kept by each client, by default None
+            (the Boto3 default). Should be at least the number of concurrent requests.
+
         Raises
         ------
         CredentialsNotFoundError
@@ -26,8 +35,13 @@ class AWSClientManager:
             If a connection to AWS services cannot be established.
         """
         try:
-            self.glue_client = boto3.client("glue")
-            self.cloudwatch_logs_client = boto3.client("logs")
+            config = (
+                Config(max_pool_connections=max_pool_connections)
+                if max_pool_connections
+                else None
+            )
+            self.glue_client = boto3.client("glue", config=config)
+            self.cloudwatch_logs_client = boto3.client("logs", config=config)
             logger.info("AWS Glue and CloudWatch clients initialized successfully.")
         except (NoCredentialsError, PartialCredentialsError) as e:
             logger.error("AWS credentials are missing or incomplete.")
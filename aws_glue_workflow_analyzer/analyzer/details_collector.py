@@ -1,13 +1,40 @@
-from typing import Any, Dict
+import asyncio
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
 
 from botocore.exceptions import ClientError
 
-from aws_glue_workflow_analyzer.analyzer.error_retriever import ErrorContextRetriever
-from aws_glue_workflow_analyzer.analyzer.table_analyzer import TableAnalyzer
+from aws_glue_workflow_analyzer.analyzer.enrichment import (
+    EnrichmentPolicy,
+    get_node_status,
+)
+from aws_glue_workflow_analyzer.analyzer.error_retriever import (
+    NO_ERROR_CONTEXT,
+    AsyncErrorContextRetriever,
+    ErrorContextRetriever,
+)
+from aws_glue_workflow_analyzer.analyzer.signatures import SignatureEngine
+from aws_glue_workflow_analyzer.analyzer.table_analyzer import (
+    AsyncTableAnalyzer,
+    TableAnalyzer,
+)
+from aws_glue_workflow_analyzer.concurrency import (
+    SingleFlight,
+    TaskOutcome,
+    iter_ordered,
+)
 from aws_glue_workflow_analyzer.exceptions import APIRequestError
 from aws_glue_workflow_analyzer.logger import logger
 
 
+def _failure_categories(
+    signatures: SignatureEngine, error_message: Optional[str]
+) -> List[str]:
+    if not error_message or error_message == NO_ERROR_CONTEXT:
+        return []
+    return signatures.categorize(error_message)
+
+
 class StepDetailsCollector:
     """
     Collects detailed information about each step in the workflow.
@@ -17,6 +44,8 @@ class StepDetailsCollector:
         self,
         error_context_retriever: ErrorContextRetriever,
         table_analyzer: TableAnalyzer,
+        enrichment_policy: Optional[EnrichmentPolicy] = None,
+        signatures: Optional[SignatureEngine] = None,
     ):
         """
         Parameters
@@ -25,9 +54,21 @@ class StepDetailsCollector:
             An instance of ErrorContextRetriever to retrieve error context from logs.
         table_analyzer : TableAnalyzer
             An instance of TableAnalyzer to analyze affected tables in the workflow graph.
+        enrichment_policy : Optional[EnrichmentPolicy], optional
+            The policy selecting the steps whose error context and affected tables are
+            retrieved, by default only failed, stopped, timed out, errored or cancelled
+            steps.
+        signatures : Optional[SignatureEngine], optional
+            The failure signatures whose categories are reported for the error context
+            of each step, by default the keywords "error", "exception" and "failed".
         """
         self.error_context_retriever = error_context_retriever
         self.table_analyzer = table_analyzer
+        self.enrichment_policy = (
+            EnrichmentPolicy() if enrichment_policy is None else enrichment_policy
+        )
+        self.signatures = SignatureEngine() if signatures is None else signatures
+        self.error_contexts = SingleFlight()
 
     def get_step_execution_details(
         self, workflow_name: str, workflow_run: Dict[str, Any], node: Dict[str, Any]
@@ -55,59 +96,273 @@ class StepDetailsCollector:
             If the API request to AWS services fails.
         """
         try:
+            if not self.enrichment_policy.should_enrich(workflow_run, node):
+                return self.build_step_details(
+                    workflow_name, workflow_run, node, None, []
+                )
             logger.info(
                 f"Gathering step execution details for workflow: {workflow_name}, node ID: {node['Id']}, node type: {node['Type']}."
             )
-            execution_id = workflow_run["RunId"]
-            execution_status = node.get("Status", "UNKNOWN")
-            execution_start_timestamp = workflow_run.get("StartedOn", "")
-            execution_end_timestamp = workflow_run.get("CompletedOn", "")
-            duration = (
-                (execution_end_timestamp - execution_start_timestamp).total_seconds()
-                if execution_start_timestamp and execution_end_timestamp
-                else None
-            )
-
-            log_group_name = workflow_run.get("LogGroup", "")
-            log_stream_name = workflow_run.get("LogStream", "")
+            log_request = self.get_log_request(workflow_run)
 
             error_message = None
-            if (
-                log_group_name
-                and log_stream_name
-                and execution_start_timestamp
-                and execution_end_timestamp
-            ):
-                error_message = self.error_context_retriever.get_error_context(
-                    log_group_name,
-                    log_stream_name,
-                    int(execution_start_timestamp.timestamp() * 1000),
-                    int(execution_end_timestamp.timestamp() * 1000),
-                )
+            if log_request:
+                error_message = self.get_error_context(log_request)
 
             affected_tables = self.table_analyzer.get_affected_tables(
                 workflow_run["Graph"], node["Id"]
             )
 
-            step_details = {
-                "execution_id": execution_id,
-                "workflow_name": workflow_name,
-                "node_id": node["Id"],
-                "node_type": node["Type"],
-                "node_name": node["Name"],
-                "execution_status": execution_status,
-                "execution_start_timestamp": execution_start_timestamp,
-                "execution_end_timestamp": execution_end_timestamp,
-                "execution_duration": duration,
-                "error_message": error_message,
-                "affected_tables": affected_tables,
-                "log_group_name": log_group_name,
-                "log_stream_name": log_stream_name,
-                "execution_parameters": workflow_run.get("Arguments", {}),
-            }
-
-            logger.debug(f"Step execution details: {step_details}")
-            return step_details
+            return self.build_step_details(
+                workflow_name,
+                workflow_run,
+                node,
+                error_message,
+                affected_tables,
+                failure_categories=_failure_categories(self.signatures, error_message),
+            )
+        except (ClientError, APIRequestError) as e:
+            logger.error(
+                f"Failed to gather step execution details for {workflow_name}, node ID: {node['Id']}: {e}"
+            )
+            raise APIRequestError(
+                f"Failed to gather step execution details for {workflow_name}, node ID: {node['Id']}: {e}"
+            ) from e
+
+    def get_error_context(self, log_request: Tuple[str, str, int, int]) -> str:
+        """
+        Retrieves the error context of a run's logs, fetching each stream only once per run.
+
+        Every node of a run shares the run's log stream and time window, so the error
+        context is memoized on them. Concurrent requests for the same run wait for a
+        single fetch instead of downloading the stream again.
+
+        Parameters
+        ----------
+        log_request : Tuple[str, str, int, int]
+            The log group name, log stream name, start time and end time of the run.
+
+        Returns
+        -------
+        str
+            The error context string, or a message if no relevant context is found.
+        """
+        return self.error_contexts.do(
+            log_request,
+            lambda: self.error_context_retriever.get_error_context(*log_request),
+        )
+
+    def iter_step_details(
+        self,
+        steps: Iterable[Tuple[str, Dict[str, Any], Dict[str, Any]]],
+        max_workers: int = 1,
+    ) -> Iterator[TaskOutcome]:
+        """
+        Lazily gathers execution details for a stream of steps, in input order.
+
+        Parameters
+        ----------
+        steps : Iterable[Tuple[str, Dict[str, Any], Dict[str, Any]]]
+            The workflow name, workflow run and graph node of each step.
+        max_workers : int, optional
+            The maximum number of steps gathered concurrently, by default 1.
+
+        Returns
+        -------
+        Iterator[TaskOutcome]
+            The outcome of each step, carrying either its execution details or the error
+            raised while gathering them.
+        """
+        return iter_ordered(
+            lambda step: self.get_step_execution_details(*step), steps, max_workers
+        )
+
+    @staticmethod
+    def get_log_request(
+        workflow_run: Dict[str, Any],
+    ) -> Optional[Tuple[str, str, int, int]]:
+        """
+        Determines the CloudWatch log stream and time window of a workflow run.
+
+        Parameters
+        ----------
+        workflow_run : Dict[str, Any]
+            The data of the workflow run.
+
+        Returns
+        -------
+        Optional[Tuple[str, str, int, int]]
+            The log group name, log stream name, start time and end time (in milliseconds
+            since epoch) to search for error context, or None if the run has no logs.
+        """
+        log_group_name = workflow_run.get("LogGroup", "")
+        log_stream_name = workflow_run.get("LogStream", "")
+        execution_start_timestamp = workflow_run.get("StartedOn", "")
+        execution_end_timestamp = workflow_run.get("CompletedOn", "")
+        if not (
+            log_group_name
+            and log_stream_name
+            and execution_start_timestamp
+            and execution_end_timestamp
+        ):
+            return None
+        return (
+            log_group_name,
+            log_stream_name,
+            int(execution_start_timestamp.timestamp() * 1000),
+            int(execution_end_timestamp.timestamp() * 1000),
+        )
+
+    @staticmethod
+    def build_step_details(  # pylint: disable=too-many-arguments
+        workflow_name: str,
+        workflow_run: Dict[str, Any],
+        node: Dict[str, Any],
+        error_message: Optional[str],
+        affected_tables: list,
+        *,
+        failure_categories: Optional[List[str]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Builds the step execution details record from the run, the node and the collected data.
+
+        Parameters
+        ----------
+        workflow_name : str
+            The name of the workflow being analyzed.
+        workflow_run : Dict[str, Any]
+            The data of the workflow run.
+        node : Dict[str, Any]
+            The specific step node in the workflow graph.
+        error_message : Optional[str]
+            The error context retrieved from the run logs, if any.
+        affected_tables : list
+            The tables affected by a failure of the node.
+        failure_categories : Optional[List[str]], optional
+            The categories of the failure signatures found in the error context, by
+            default none.
+
+        Returns
+        -------
+        Dict[str, Any]
+            A dictionary containing detailed information about the step execution.
+        """
+        execution_start_timestamp = workflow_run.get("StartedOn", "")
+        execution_end_timestamp = workflow_run.get("CompletedOn", "")
+        duration = (
+            (execution_end_timestamp - execution_start_timestamp).total_seconds()
+            if execution_start_timestamp and execution_end_timestamp
+            else None
+        )
+
+        step_details = {
+            "execution_id": workflow_run["RunId"],
+            "workflow_name": workflow_name,
+            "node_id": node["Id"],
+            "node_type": node["Type"],
+            "node_name": node["Name"],
+            "execution_status": get_node_status(node) or "UNKNOWN",
+            "execution_start_timestamp": execution_start_timestamp,
+            "execution_end_timestamp": execution_end_timestamp,
+            "execution_duration": duration,
+            "error_message": error_message,
+            "failure_categories": failure_categories or [],
+            "affected_tables": affected_tables,
+            "log_group_name": workflow_run.get("LogGroup", ""),
+            "log_stream_name": workflow_run.get("LogStream", ""),
+            "execution_parameters": workflow_run.get("Arguments", {}),
+        }
+
+        logger.debug(f"Step execution details: {step_details}")
+        return step_details
+
+
+class AsyncStepDetailsCollector:
+    """
+    Collects step execution details from coroutines, producing the same records as StepDetailsCollector.
+    """
+
+    def __init__(
+        self,
+        error_context_retriever: AsyncErrorContextRetriever,
+        table_analyzer: AsyncTableAnalyzer,
+        enrichment_policy: Optional[EnrichmentPolicy] = None,
+        signatures: Optional[SignatureEngine] = None,
+    ):
+        """
+        Parameters
+        ----------
+        error_context_retriever : AsyncErrorContextRetriever
+            An instance of AsyncErrorContextRetriever to retrieve error context from logs.
+        table_analyzer : AsyncTableAnalyzer
+            An instance of AsyncTableAnalyzer to analyze affected tables in the workflow graph.
+        enrichment_policy : Optional[EnrichmentPolicy], optional
+            The policy selecting the steps whose error context and affected tables are
+            retrieved, by default only failed, stopped, timed out, errored or cancelled
+            steps.
+        signatures : Optional[SignatureEngine], optional
+            The failure signatures whose categories are reported for the error context
+            of each step, by default the keywords "error", "exception" and "failed".
+        """
+        self.error_context_retriever = error_context_retriever
+        self.table_analyzer = table_analyzer
+        self.enrichment_policy = (
+            EnrichmentPolicy() if enrichment_policy is None else enrichment_policy
+        )
+        self.signatures = SignatureEngine() if signatures is None else signatures
+        self.max_error_contexts = 128
+        self._error_contexts: OrderedDict = OrderedDict()
+
+    async def get_step_execution_details(
+        self, workflow_name: str, workflow_run: Dict[str, Any], node: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """
+        Gathers detailed execution data for a specific step, fetching logs and tables concurrently.
+
+        Parameters
+        ----------
+        workflow_name : str
+            The name of the workflow being analyzed.
+        workflow_run : Dict[str, Any]
+            The data of the workflow run.
+        node : Dict[str, Any]
+            The specific step node in the workflow graph.
+
+        Returns
+        -------
+        Dict[str, Any]
+            A dictionary containing detailed information about the step execution.
+
+        Raises
+        ------
+        APIRequestError
+            If the API request to AWS services fails.
+        """
+        try:
+            if not self.enrichment_policy.should_enrich(workflow_run, node):
+                return StepDetailsCollector.build_step_details(
+                    workflow_name, workflow_run, node, None, []
+                )
+            logger.info(
+                f"Gathering step execution details for workflow: {workflow_name}, node ID: {node['Id']}, node type: {node['Type']}."
+            )
+            log_request = StepDetailsCollector.get_log_request(workflow_run)
+
+            error_message, affected_tables = await asyncio.gather(
+                self._get_error_context(log_request),
+                self.table_analyzer.get_affected_tables(
+                    workflow_run["Graph"], node["Id"]
+                ),
+            )
+
+            return StepDetailsCollector.build_step_details(
+                workflow_name,
+                workflow_run,
+                node,
+                error_message,
+                affected_tables,
+                failure_categories=_failure_categories(self.signatures, error_message),
+            )
         except (ClientError, APIRequestError) as e:
             logger.error(
                 f"Failed to gather step execution details for {workflow_name}, node ID: {node['Id']}: {e}"
@@ -115,3 +370,20 @@ class StepDetailsCollector:
             raise APIRequestError(
                 f"Failed to gather step execution details for {workflow_name}, node ID: {node['Id']}: {e}"
             ) from e
+
+    async def _get_error_context(
+        self, log_request: Optional[Tuple[str, str, int, int]]
+    ) -> Optional[str]:
+        if not log_request:
+            return None
+        # Nodes of the same run share one fetch of the run's log stream.
+        task = self._error_contexts.get(log_request)
+        if task is None or task.cancelled() or (task.done() and task.exception()):
+            task = asyncio.ensure_future(
+                self.error_context_retriever.get_error_context(*log_request)
+            )
+            self._error_contexts[log_request] = task
+            while len(self._error_contexts) > self.max_error_contexts:
+                self._error_contexts.popitem(last=False)
+        self._error_contexts.move_to_end(log_request)
+        return await asyncio.shield(task)
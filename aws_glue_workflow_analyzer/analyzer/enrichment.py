@@ -0,0 +1,102 @@
+from typing import Any, Dict, Iterable, Optional
+
+from aws_glue_workflow_analyzer.analyzer.run_retriever import WorkflowRunRetriever
+from aws_glue_workflow_analyzer.constants import FAILURE_STATUSES
+
+
+def get_node_status(node: Dict[str, Any]) -> Optional[str]:
+    """
+    Determines the status of a step from its graph node.
+
+    Parameters
+    ----------
+    node : Dict[str, Any]
+        The step node of a workflow run graph.
+
+    Returns
+    -------
+    Optional[str]
+        The node's "Status", or else the state of its last job run or crawl, or None
+        if the node carries no status, as for triggers.
+    """
+    if node.get("Status"):
+        return node["Status"]
+    job_runs = (node.get("JobDetails") or {}).get("JobRuns") or []
+    if job_runs and job_runs[-1].get("JobRunState"):
+        return job_runs[-1]["JobRunState"]
+    crawls = (node.get("CrawlerDetails") or {}).get("Crawls") or []
+    if crawls and crawls[-1].get("State"):
+        return crawls[-1]["State"]
+    return None
+
+
+class EnrichmentPolicy:
+    """
+    Decides which steps are enriched with their error context and affected tables.
+
+    Searching the logs and traversing the graph for affected tables cost several AWS
+    requests per step, while they only explain failures. By default only steps that
+    failed, stopped, timed out, errored or were cancelled are enriched, and the other
+    steps get a record built from the graph alone. Steps without a status, such as
+    triggers, are enriched unless the run's statistics show that none of its actions
+    failed.
+    """
+
+    def __init__(
+        self, statuses: Iterable[str] = FAILURE_STATUSES, enrich_all: bool = False
+    ):
+        """
+        Parameters
+        ----------
+        statuses : Iterable[str], optional
+            The step statuses to enrich, by default "FAILED", "STOPPED", "TIMEOUT",
+            "ERROR" and "CANCELLED".
+        enrich_all : bool, optional
+            Whether to enrich every step regardless of its status, by default False.
+        """
+        self.statuses = frozenset(status.upper() for status in statuses)
+        self.enrich_all = enrich_all
+
+    def should_enrich(self, workflow_run: Dict[str, Any], node: Dict[str, Any]) -> bool:
+        """
+        Determines whether a step is enriched.
+
+        Parameters
+        ----------
+        workflow_run : Dict[str, Any]
+            The data of the workflow run.
+        node : Dict[str, Any]
+            The step node in the workflow graph.
+
+        Returns
+        -------
+        bool
+            True if the error context and affected tables of the step are retrieved.
+        """
+        if self.enrich_all:
+            return True
+        status = get_node_status(node)
+        if status is not None:
+            return status.upper() in self.statuses
+        return not workflow_run.get(
+            "Statistics"
+        ) or WorkflowRunRetriever.has_failed_actions(workflow_run)
+
+    def enriches_run(self, workflow_run: Dict[str, Any]) -> bool:
+        """
+        Determines whether any step of a run is enriched.
+
+        Parameters
+        ----------
+        workflow_run : Dict[str, Any]
+            The data of the workflow run, including its graph.
+
+        Returns
+        -------
+        bool
+            True if at least one node of the run's graph is enriched.
+        """
+        return any(
+            self.should_enrich(workflow_run, node)
+            for node in workflow_run.get("Graph", {}).get("Nodes", [])
+        )
@@ -1,23 +1,105 @@
+from collections import deque
+from typing import Any, Dict, Iterable, Optional, Tuple
+
 from botocore.exceptions import ClientError
 
+from aws_glue_workflow_analyzer.analyzer.insights import InsightsErrorContextBatcher
+from aws_glue_workflow_analyzer.analyzer.log_scanner import ErrorContextScanner
+from aws_glue_workflow_analyzer.analyzer.signatures import SignatureEngine
+from aws_glue_workflow_analyzer.concurrency import AsyncExecutor
 from aws_glue_workflow_analyzer.exceptions import APIRequestError
 from aws_glue_workflow_analyzer.logger import logger
-from aws_glue_workflow_analyzer.paginator import paginate_boto3
+from aws_glue_workflow_analyzer.paginator import iter_paginate_boto3
+
+LOG_STRATEGIES = ("scan", "filter", "insights", "tail")
+
+# The error context reported when the logs of a run contain no failure line.
+NO_ERROR_CONTEXT = "No relevant error context found."
 
 
-class ErrorContextRetriever:
+class ErrorContextRetriever:  # pylint: disable=too-many-instance-attributes
     """
     Handles the retrieval of error context from AWS CloudWatch Logs.
     """
 
-    def __init__(self, cloudwatch_logs_client):
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        cloudwatch_logs_client,
+        *,
+        strategy: str = "scan",
+        context_events: int = 25,
+        max_tail_events: int = 10000,
+        max_tail_bytes: int = 10 * 1024 * 1024,
+        signatures: Optional[SignatureEngine] = None,
+    ):
         """
         Parameters
         ----------
         cloudwatch_logs_client : boto3.client
             An initialized CloudWatch Logs client.
+        strategy : str, optional
+            How failure lines are located, by default "scan". "scan" reads the whole
+            stream and searches it locally. "filter" lets CloudWatch Logs search the
+            stream with FilterLogEvents and only reads the events around the first match,
+            falling back to "scan" when the filter finds nothing. "insights" searches
+            the streams of many runs at once with Logs Insights queries submitted by
+            ``prefetch_error_contexts`` and only reads the events around the first
+            match, falling back to "scan" for runs that were not prefetched. "tail"
+            reads the stream backwards from its end and stops at the last failure line,
+            reading at most ``max_tail_events`` events and ``max_tail_bytes`` bytes.
+        context_events : int, optional
+            The number of events read on each side of a match found by the "filter" or
+            "insights" strategy, or before a match found by the "tail" strategy, by
+            default 25.
+        max_tail_events : int, optional
+            The maximum number of events read from a stream by the "tail" strategy, by
+            default 10000.
+        max_tail_bytes : int, optional
+            The maximum number of message bytes read from a stream by the "tail"
+            strategy, by default 10 MiB.
+        signatures : Optional[SignatureEngine], optional
+            The failure signatures identifying failure lines, by default the keywords
+            "error", "exception" and "failed", matched case-insensitively.
         """
+        if strategy not in LOG_STRATEGIES:
+            raise ValueError(
+                f"Unknown log strategy '{strategy}', expected one of {LOG_STRATEGIES}."
+            )
         self.cloudwatch_logs_client = cloudwatch_logs_client
+        self.strategy = strategy
+        self.context_events = context_events
+        self.max_tail_events = max_tail_events
+        self.max_tail_bytes = max_tail_bytes
+        self.scanner = ErrorContextScanner(signatures=signatures)
+        self.insights_batcher = InsightsErrorContextBatcher(
+            cloudwatch_logs_client, self.scanner
+        )
+        self._prefetched: Dict[Tuple[str, str, int, int], Optional[int]] = {}
+
+    def prefetch_error_contexts(
+        self, log_requests: Iterable[Tuple[str, str, int, int]]
+    ) -> None:
+        """
+        Locates the first failure event of many runs with batched Logs Insights queries.
+
+        Only used by the "insights" strategy. The failure timestamps are kept until
+        ``get_error_context`` reads the events around them, once per run.
+
+        Parameters
+        ----------
+        log_requests : Iterable[Tuple[str, str, int, int]]
+            The log group name, log stream name, start time and end time of each run.
+
+        Raises
+        ------
+        APIRequestError
+            If a Logs Insights query fails.
+        """
+        if self.strategy != "insights":
+            return
+        self._prefetched.update(
+            self.insights_batcher.get_failure_timestamps(log_requests)
+        )
 
     def get_error_context(
         self, log_group_name: str, log_stream_name: str, start_time: int, end_time: int
@@ -50,36 +132,306 @@ class ErrorContextRetriever:
             logger.info(
                 f"Fetching error context from logs in group '{log_group_name}', stream '{log_stream_name}'."
             )
-            logs = paginate_boto3(
-                self.cloudwatch_logs_client.get_log_events,
-                dict_key="events",
-                logGroupName=log_group_name,
-                logStreamName=log_stream_name,
-                startTime=start_time,
-                endTime=end_time,
-                limit=1000,
-            )
-
-            full_log = ""
-            for event in logs:
-                full_log += event["message"] + "\n"
-
-            for line in full_log.splitlines():
-                if any(keyword in line for keyword in ["error", "exception", "failed"]):
-                    context_start = max(0, full_log.index(line) - 100)
-                    context_end = min(
-                        len(full_log), full_log.index(line) + len(line) + 100
+            log_request = (log_group_name, log_stream_name, start_time, end_time)
+            context: Optional[str] = None
+            if log_request in self._prefetched:
+                timestamp = self._prefetched.pop(log_request)
+                if timestamp is not None:
+                    context = self._context_around(
+                        *log_request, timestamp
+                    ) or self._scan_error_context(*log_request)
+            else:
+                if self.strategy == "filter":
+                    context = self._filter_error_context(
+                        log_group_name, log_stream_name, start_time, end_time
                     )
-                    logger.debug(
-                        f"Error context found: {full_log[context_start:context_end]}"
+                elif self.strategy == "tail":
+                    context = self._tail_error_context(
+                        log_group_name, log_stream_name, start_time, end_time
                     )
-                    return full_log[context_start:context_end]
+                if context is None and self.strategy != "tail":
+                    context = self._scan_error_context(
+                        log_group_name, log_stream_name, start_time, end_time
+                    )
+            if context is not None:
+                logger.debug(f"Error context found: {context}")
+                return context
 
             logger.info("No relevant error context found in logs.")
-            return "No relevant error context found."
+            return NO_ERROR_CONTEXT
 
         except ClientError as e:
             logger.error(f"Failed to retrieve log events from CloudWatch Logs: {e}")
             raise APIRequestError(
                 f"Failed to retrieve log events from CloudWatch Logs: {e}"
             ) from e
+
+    def _scan_error_context(
+        self, log_group_name: str, log_stream_name: str, start_time: int, end_time: int
+    ) -> Optional[str]:
+        """
+        Reads the log stream from its head and searches it locally for the first failure line.
+
+        Parameters
+        ----------
+        log_group_name : str
+            The name of the CloudWatch log group.
+        log_stream_name : str
+            The name of the CloudWatch log stream.
+        start_time : int
+            The start time for log retrieval, in milliseconds since epoch.
+        end_time : int
+            The end time for log retrieval, in milliseconds since epoch.
+
+        Returns
+        -------
+        Optional[str]
+            The error context string, or None if no failure line is found.
+        """
+        logs = iter_paginate_boto3(
+            self.cloudwatch_logs_client.get_log_events,
+            dict_key="events",
+            input_token="nextToken",
+            output_token="nextForwardToken",
+            logGroupName=log_group_name,
+            logStreamName=log_stream_name,
+            startTime=start_time,
+            endTime=end_time,
+            limit=1000,
+            startFromHead=True,
+        )
+        return self.scanner.scan(event["message"] for event in logs)
+
+    def _tail_error_context(
+        self, log_group_name: str, log_stream_name: str, start_time: int, end_time: int
+    ) -> Optional[str]:
+        """
+        Reads the log stream backwards from its end until a failure line is found or the budget is spent.
+
+        Once a page contains a failure line, one more page of ``context_events`` events
+        is read to complete the context preceding it.
+
+        Parameters
+        ----------
+        log_group_name : str
+            The name of the CloudWatch log group.
+        log_stream_name : str
+            The name of the CloudWatch log stream.
+        start_time : int
+            The start time for log retrieval, in milliseconds since epoch.
+        end_time : int
+            The end time for log retrieval, in milliseconds since epoch.
+
+        Returns
+        -------
+        Optional[str]
+            The context surrounding the last failure line, or None if no failure line is
+            found within the budget.
+        """
+        messages: deque = deque()
+        events_read = 0
+        bytes_read = 0
+        found = False
+        kwargs: Dict[str, Any] = {
+            "logGroupName": log_group_name,
+            "logStreamName": log_stream_name,
+            "startTime": start_time,
+            "endTime": end_time,
+            "startFromHead": False,
+        }
+        while events_read < self.max_tail_events and bytes_read < self.max_tail_bytes:
+            kwargs["limit"] = min(
+                self.context_events if found else 1000,
+                self.max_tail_events - events_read,
+            )
+            response = self.cloudwatch_logs_client.get_log_events(**kwargs)
+            page = [event["message"] for event in response["events"]]
+            messages.extendleft(reversed(page))
+            events_read += len(page)
+            bytes_read += sum(len(message.encode("utf-8")) for message in page)
+            if found:
+                break
+            found = any(
+                self.scanner.is_failure_line(line)
+                for message in page
+                for line in message.splitlines()
+            )
+            token = response.get("nextBackwardToken")
+            if not token or token == kwargs.get("nextToken"):
+                break
+            kwargs["nextToken"] = token
+
+        if events_read >= self.max_tail_events or bytes_read >= self.max_tail_bytes:
+            logger.info(
+                f"Read {events_read} events ({bytes_read} bytes) from the end of the stream, the tail budget is spent."
+            )
+        return self.scanner.scan_last(messages)
+
+    def _filter_error_context(
+        self, log_group_name: str, log_stream_name: str, start_time: int, end_time: int
+    ) -> Optional[str]:
+        """
+        Finds the first failure event with FilterLogEvents and searches only the events around it.
+
+        Parameters
+        ----------
+        log_group_name : str
+            The name of the CloudWatch log group.
+        log_stream_name : str
+            The name of the CloudWatch log stream.
+        start_time : int
+            The start time for log retrieval, in milliseconds since epoch.
+        end_time : int
+            The end time for log retrieval, in milliseconds since epoch.
+
+        Returns
+        -------
+        Optional[str]
+            The error context string, or None if the filter matches no event.
+        """
+        matches = iter_paginate_boto3(
+            self.cloudwatch_logs_client.filter_log_events,
+            dict_key="events",
+            max_items=1,
+            input_token="nextToken",
+            output_token="nextToken",
+            logGroupName=log_group_name,
+            logStreamNames=[log_stream_name],
+            startTime=start_time,
+            endTime=end_time,
+            filterPattern=self.filter_pattern,
+        )
+        match = next(matches, None)
+        if match is None:
+            logger.info(
+                "Log filter found no failure events, scanning the whole stream."
+            )
+            return None
+
+        return self._context_around(
+            log_group_name, log_stream_name, start_time, end_time, match["timestamp"]
+        )
+
+    def _context_around(
+        self,
+        log_group_name: str,
+        log_stream_name: str,
+        start_time: int,
+        end_time: int,
+        timestamp: int,
+    ) -> Optional[str]:
+        """
+        Reads the events around a failure event and searches them for the failure line.
+
+        Parameters
+        ----------
+        log_group_name : str
+            The name of the CloudWatch log group.
+        log_stream_name : str
+            The name of the CloudWatch log stream.
+        start_time : int
+            The start time for log retrieval, in milliseconds since epoch.
+        end_time : int
+            The end time for log retrieval, in milliseconds since epoch.
+        timestamp : int
+            The timestamp of the failure event, in milliseconds since epoch.
+
+        Returns
+        -------
+        Optional[str]
+            The error context string, or None if no failure line is found around the
+            event.
+        """
+        preceding_events = self.cloudwatch_logs_client.get_log_events(
+            logGroupName=log_group_name,
+            logStreamName=log_stream_name,
+            startTime=start_time,
+            endTime=timestamp,
+            limit=self.context_events,
+            startFromHead=False,
+        )["events"]
+        following_events = self.cloudwatch_logs_client.get_log_events(
+            logGroupName=log_group_name,
+            logStreamName=log_stream_name,
+            startTime=timestamp,
+            endTime=end_time,
+            limit=self.context_events,
+            startFromHead=True,
+        )["events"]
+        events = [
+            event for event in preceding_events if event["timestamp"] < timestamp
+        ] + following_events
+        return self.scanner.scan(event["message"] for event in events)
+
+    @property
+    def filter_pattern(self) -> str:
+        """
+        The CloudWatch Logs filter pattern matching any of the failure keywords.
+
+        Filter patterns are case-sensitive, so unless the signatures are, each keyword
+        is also matched capitalized and in upper case. Regular expression signatures
+        cannot be expressed as filter terms and are only matched by the fallback scan.
+
+        Returns
+        -------
+        str
+            The filter pattern.
+        """
+        signatures = self.scanner.signatures
+        terms = []
+        for keyword in signatures.keywords:
+            variants = [keyword]
+            if not signatures.case_sensitive:
+                variants += [keyword.capitalize(), keyword.upper()]
+            terms += [variant for variant in variants if variant not in terms]
+        return " ".join(f'?"{term}"' for term in terms)
+
+
+class AsyncErrorContextRetriever:
+    """
+    Retrieves error context from CloudWatch Logs from coroutines without blocking the event loop.
+    """
+
+    def __init__(
+        self, error_context_retriever: ErrorContextRetriever, executor: AsyncExecutor
+    ):
+        """
+        Parameters
+        ----------
+        error_context_retriever : ErrorContextRetriever
+            The synchronous retriever performing the CloudWatch Logs requests.
+        executor : AsyncExecutor
+            The executor bounding the number of requests in flight.
+        """
+        self.error_context_retriever = error_context_retriever
+        self.executor = executor
+
+    async def get_error_context(
+        self, log_group_name: str, log_stream_name: str, start_time: int, end_time: int
+    ) -> str:
+        """
+        Retrieves error context from CloudWatch logs surrounding failure keywords.
+
+        Parameters
+        ----------
+        log_group_name : str
+            The name of the CloudWatch log group.
+        log_stream_name : str
+            The name of the CloudWatch log stream.
+        start_time : int
+            The start time for log retrieval, in milliseconds since epoch.
+        end_time : int
+            The end time for log retrieval, in milliseconds since epoch.
+
+        Returns
+        -------
+        str
+            The error context string, or a message if no relevant context is found.
+        """
+        return await self.executor.run(
+            self.error_context_retriever.get_error_context,
+            log_group_name,
+            log_stream_name,
+            start_time,
+            end_time,
+        )
@@ -0,0 +1,339 @@
+import hashlib
+import json
+from typing import Any, Dict, List, Optional, Set
+
+# The node fields describing a single run rather than the workflow definition.
+RUN_NODE_FIELDS = ("Status", "JobDetails", "CrawlerDetails")
+
+
+class WorkflowGraph:
+    """
+    An indexed view of a Glue workflow graph.
+
+    The nodes are indexed by ID and the edges are stored as forward and reverse
+    adjacency lists, so node lookups take constant time and traversals take time
+    proportional to the number of nodes and edges visited.
+    """
+
+    def __init__(self, graph: Dict[str, Any]):
+        """
+        Parameters
+        ----------
+        graph : Dict[str, Any]
+            The workflow graph, with the "Nodes" and "Edges" returned by AWS Glue.
+        """
+        self.source = graph
+        self._structural_hash: Optional[str] = None
+        self.nodes: Dict[str, Dict[str, Any]] = {
+            node["Id"]: node for node in graph.get("Nodes", [])
+        }
+        self.successors: Dict[str, List[str]] = {}
+        self.predecessors: Dict[str, List[str]] = {}
+        for edge in graph.get("Edges", []):
+            self.successors.setdefault(edge["SourceId"], []).append(
+                edge["DestinationId"]
+            )
+            self.predecessors.setdefault(edge["DestinationId"], []).append(
+                edge["SourceId"]
+            )
+
+    @property
+    def structural_hash(self) -> str:
+        """
+        A digest of the graph's node IDs and edges, equal for graphs sharing a topology.
+
+        Returns
+        -------
+        str
+            The hexadecimal SHA-256 digest of the sorted node IDs and edges.
+        """
+        if self._structural_hash is None:
+            topology = {
+                "nodes": sorted(self.nodes),
+                "edges": sorted(
+                    [source, destination]
+                    for source, destinations in self.successors.items()
+                    for destination in destinations
+                ),
+            }
+            self._structural_hash = hashlib.sha256(
+                json.dumps(topology, separators=(",", ":")).encode("utf-8")
+            ).hexdigest()
+        return self._structural_hash
+
+    def get_node(self, node_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Retrieves a node by its ID.
+
+        Parameters
+        ----------
+        node_id : str
+            The ID of the node to retrieve.
+
+        Returns
+        -------
+        Optional[Dict[str, Any]]
+            The node data, or None if the graph has no such node.
+        """
+        return self.nodes.get(node_id)
+
+    def downstream(self, node_id: str) -> Set[str]:
+        """
+        Collects the IDs of a node and of every node reachable from it.
+
+        Parameters
+        ----------
+        node_id : str
+            The ID of the starting node.
+
+        Returns
+        -------
+        Set[str]
+            The IDs of the node and of its descendants.
+        """
+        return self._reachable(node_id, self.successors)
+
+    def upstream(self, node_id: str) -> Set[str]:
+        """
+        Collects the IDs of a node and of every node it can be reached from.
+
+        Parameters
+        ----------
+        node_id : str
+            The ID of the starting node.
+
+        Returns
+        -------
+        Set[str]
+            The IDs of the node and of its ancestors.
+        """
+        return self._reachable(node_id, self.predecessors)
+
+    @staticmethod
+    def _reachable(node_id: str, adjacency: Dict[str, List[str]]) -> Set[str]:
+        visited = {node_id}
+        stack = [node_id]
+        while stack:
+            for neighbor in adjacency.get(stack.pop(), ()):
+                if neighbor not in visited:
+                    visited.add(neighbor)
+                    stack.append(neighbor)
+        return visited
+
+
+class StaticWorkflowGraph:
+    """
+    The topology of a workflow, shared by the graphs of its runs.
+
+    Every run graph returned by AWS Glue repeats the workflow's nodes, edges and trigger
+    definitions. Overlaying a run graph on the static graph keeps only the run's own
+    job and crawler details and references the static node fields and edges instead,
+    so runs of the same workflow share a single copy of its topology in memory.
+    """
+
+    def __init__(self, graph: Dict[str, Any]):
+        """
+        Parameters
+        ----------
+        graph : Dict[str, Any]
+            The workflow graph returned by ``BatchGetWorkflows``.
+        """
+        self.nodes: Dict[str, Dict[str, Any]] = {
+            node["Id"]: {
+                key: value for key, value in node.items() if key not in RUN_NODE_FIELDS
+            }
+            for node in graph.get("Nodes", [])
+        }
+        self.edges: List[Dict[str, Any]] = graph.get("Edges", [])
+        self._edge_set = self._edge_pairs(self.edges)
+
+    def overlay(self, run_graph: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Rebuilds a run graph on top of the static topology.
+
+        Overlaid nodes keep every field of the run node, such as its status and job
+        runs, and reference the equal static fields. Nodes whose static fields differ
+        from the static graph, for instance because the workflow changed after the
+        run, are kept as they are, and so are the edges unless they match the static
+        edges.
+
+        Parameters
+        ----------
+        run_graph : Dict[str, Any]
+            The graph of a workflow run.
+
+        Returns
+        -------
+        Dict[str, Any]
+            An equivalent graph sharing the static node fields and edges.
+        """
+        nodes = []
+        for node in run_graph.get("Nodes", []):
+            static_node = self.nodes.get(node.get("Id"))
+            if static_node is None or any(
+                node.get(key) != value for key, value in static_node.items()
+            ):
+                nodes.append(node)
+                continue
+            nodes.append({**node, **static_node})
+        edges = run_graph.get("Edges", [])
+        if self._edge_pairs(edges) == self._edge_set:
+            edges = self.edges
+        return {"Nodes": nodes, "Edges": edges}
+
+    @staticmethod
+    def _edge_pairs(edges: List[Dict[str, Any]]) -> Set[tuple]:
+        return {(edge["SourceId"], edge["DestinationId"]) for edge in edges}
+
+
+class DownstreamClosure:
+    """
+    The downstream nodes of every node of a workflow graph, computed in one pass.
+
+    Node IDs are mapped to integers and each node's closure is stored as an integer
+    bitset. Strongly connected components are visited in reverse topological order,
+    so each closure is the union of the component's own nodes and the already computed
+    closures of its successors. Cycles are therefore handled as well.
+    """
+
+    def __init__(self, workflow_graph: WorkflowGraph):
+        """
+        Parameters
+        ----------
+        workflow_graph : WorkflowGraph
+            The indexed workflow graph.
+        """
+        node_ids = set(workflow_graph.nodes)
+        for source, destinations in workflow_graph.successors.items():
+            node_ids.add(source)
+            node_ids.update(destinations)
+        self.node_ids: List[str] = sorted(node_ids)
+        self.index: Dict[str, int] = {
+            node_id: position for position, node_id in enumerate(self.node_ids)
+        }
+        successors: List[List[int]] = [[] for _ in self.node_ids]
+        for source, destinations in workflow_graph.successors.items():
+            successors[self.index[source]] = [
+                self.index[destination] for destination in destinations
+            ]
+        self.bits: List[int] = self._compute(successors)
+
+    def downstream(self, node_id: str) -> Set[str]:
+        """
+        Collects the IDs of a node and of every node reachable from it.
+
+        Parameters
+        ----------
+        node_id : str
+            The ID of the starting node.
+
+        Returns
+        -------
+        Set[str]
+            The IDs of the node and of its descendants.
+        """
+        position = self.index.get(node_id)
+        if position is None:
+            return {node_id}
+        # Reading the set bits from the binary representation is much faster than
+        # clearing them one at a time, which copies the whole integer at every step.
+        binary = format(self.bits[position], "b")[::-1]
+        node_ids = set()
+        bit = binary.find("1")
+        while bit != -1:
+            node_ids.add(self.node_ids[bit])
+            bit = binary.find("1", bit + 1)
+        return node_ids
+
+    @staticmethod
+    def _compute(successors: List[List[int]]) -> List[int]:
+        """
+        Computes the closure bitsets with an iterative version of Tarjan's algorithm.
+
+        Tarjan's algorithm completes each strongly connected component only after all
+        components reachable from it, which is the order the closures are needed in.
+
+        Parameters
+        ----------
+        successors : List[List[int]]
+            The successors of each node.
+
+        Returns
+        -------
+        List[int]
+            The closure bitset of each node.
+        """
+        count = len(successors)
+        order = [-1] * count
+        low = [0] * count
+        on_stack = [False] * count
+        bits = [0] * count
+        component_stack: List[int] = []
+        counter = 0
+        for root in range(count):
+            if order[root] != -1:
+                continue
+            work = [(root, 0)]
+            while work:
+                node, next_edge = work.pop()
+                if next_edge == 0:
+                    order[node] = low[node] = counter
+                    counter += 1
+                    component_stack.append(node)
+                    on_stack[node] = True
+                if next_edge < len(successors[node]):
+                    work.append((node, next_edge + 1))
+                    successor = successors[node][next_edge]
+                    if order[successor] == -1:
+                        work.append((successor, 0))
+                    elif on_stack[successor]:
+                        low[node] = min(low[node], order[successor])
+                    continue
+                if low[node] == order[node]:
+                    DownstreamClosure._close_component(
+                        node, component_stack, on_stack, successors, bits
+                    )
+                if work:
+                    parent = work[-1][0]
+                    low[parent] = min(low[parent], low[node])
+        return bits
+
+    @staticmethod
+    def _close_component(
+        root: int,
+        component_stack: List[int],
+        on_stack: List[bool],
+        successors: List[List[int]],
+        bits: List[int],
+    ):
+        """
+        Pops a completed strongly connected component and stores its closure.
+
+        Parameters
+        ----------
+        root : int
+            The node whose component is completed, the first of it on the stack.
+        component_stack : List[int]
+            Tarjan's stack of the nodes of unfinished components.
+        on_stack : List[bool]
+            Whether each node is on ``component_stack``, updated as nodes are popped.
+        successors : List[List[int]]
+            The successors of each node.
+        bits : List[int]
+            The closure bitset of each node, already computed for the successors of
+            the component and set for its members.
+        """
+        members = []
+        while True:
+            member = component_stack.pop()
+            on_stack[member] = False
+            members.append(member)
+            if member == root:
+                break
+        closure = 0
+        for member in members:
+            closure |= 1 << member
+            for successor in successors[member]:
+                closure |= bits[successor]
+        for member in members:
+            bits[member] = closure
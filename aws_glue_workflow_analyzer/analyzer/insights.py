@@ -0,0 +1,215 @@
+import json
+import math
+import time
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from botocore.exceptions import ClientError
+
+from aws_glue_workflow_analyzer.analyzer.log_scanner import ErrorContextScanner
+from aws_glue_workflow_analyzer.exceptions import APIRequestError
+from aws_glue_workflow_analyzer.logger import logger
+
+LogRequest = Tuple[str, str, int, int]
+
+
+class InsightsErrorContextBatcher:
+    """
+    Locates the first failure event of many log streams at once with CloudWatch Logs Insights.
+
+    Instead of scanning every stream with its own GetLogEvents calls, one Insights
+    query is submitted per log group and batch of streams, covering the time range of
+    all of them. The timestamp of the earliest failure event of each stream is then
+    matched back to the request it belongs to, so only the events around it need to be
+    read. A stream appears at most once per query, so every stream is searched over the
+    combined time range of its batch.
+    """
+
+    def __init__(
+        self,
+        cloudwatch_logs_client,
+        scanner: ErrorContextScanner,
+        max_streams_per_query: int = 100,
+        poll_interval: float = 1.0,
+        timeout: float = 300.0,
+    ):
+        """
+        Parameters
+        ----------
+        cloudwatch_logs_client : boto3.client
+            An initialized CloudWatch Logs client.
+        scanner : ErrorContextScanner
+            The scanner whose failure signatures the queries search for.
+        max_streams_per_query : int, optional
+            The maximum number of log streams searched by a single query, by default 100.
+        poll_interval : float, optional
+            The number of seconds between polls of a running query, by default 1.
+        timeout : float, optional
+            The number of seconds after which a running query is abandoned, by default 300.
+        """
+        self.cloudwatch_logs_client = cloudwatch_logs_client
+        self.scanner = scanner
+        self.max_streams_per_query = max_streams_per_query
+        self.poll_interval = poll_interval
+        self.timeout = timeout
+
+    def get_failure_timestamps(
+        self, log_requests: Iterable[LogRequest]
+    ) -> Dict[LogRequest, Optional[int]]:
+        """
+        Locates the earliest failure event of every requested log stream and time window.
+
+        Parameters
+        ----------
+        log_requests : Iterable[LogRequest]
+            The log group name, log stream name, start time and end time (in
+            milliseconds since epoch) of each run to search.
+
+        Returns
+        -------
+        Dict[LogRequest, Optional[int]]
+            The timestamp of the earliest failure event of each request, in
+            milliseconds since epoch, or None if no failure line is found in its stream.
+
+        Raises
+        ------
+        APIRequestError
+            If a query cannot be started, fails or does not complete in time.
+        """
+        failure_timestamps: Dict[LogRequest, Optional[int]] = {}
+        for batch in self._batch(set(log_requests)):
+            log_group_name = batch[0][0]
+            timestamps = self._query_failure_timestamps(
+                log_group_name,
+                [log_request[1] for log_request in batch],
+                min(log_request[2] for log_request in batch),
+                max(log_request[3] for log_request in batch),
+            )
+            for log_request in batch:
+                failure_timestamps[log_request] = timestamps.get(log_request[1])
+        return failure_timestamps
+
+    def _batch(self, log_requests: Iterable[LogRequest]) -> List[List[LogRequest]]:
+        """
+        Splits requests into query batches sharing a log group, each stream at most once per batch.
+
+        Parameters
+        ----------
+        log_requests : Iterable[LogRequest]
+            The requests to split.
+
+        Returns
+        -------
+        List[List[LogRequest]]
+            The batches of requests.
+        """
+        batches: Dict[str, List[List[LogRequest]]] = defaultdict(list)
+        for log_request in sorted(log_requests):
+            group_batches = batches[log_request[0]]
+            for batch in group_batches:
+                if len(batch) < self.max_streams_per_query and all(
+                    other[1] != log_request[1] for other in batch
+                ):
+                    batch.append(log_request)
+                    break
+            else:
+                group_batches.append([log_request])
+        return [batch for group in batches.values() for batch in group]
+
+    def _query_failure_timestamps(
+        self,
+        log_group_name: str,
+        log_stream_names: Sequence[str],
+        start_time: int,
+        end_time: int,
+    ) -> Dict[str, int]:
+        """
+        Runs an Insights query returning the timestamp of the earliest failure event of each log stream.
+
+        Parameters
+        ----------
+        log_group_name : str
+            The name of the CloudWatch log group.
+        log_stream_names : Sequence[str]
+            The names of the log streams to search.
+        start_time : int
+            The start of the time range, in milliseconds since epoch.
+        end_time : int
+            The end of the time range, in milliseconds since epoch.
+
+        Returns
+        -------
+        Dict[str, int]
+            The timestamp of the earliest failure event, in milliseconds since epoch, of
+            each stream in which one was found.
+
+        Raises
+        ------
+        APIRequestError
+            If the query cannot be started, fails or does not complete in time.
+        """
+        query = self.build_query(log_stream_names)
+        try:
+            logger.info(
+                f"Querying {len(log_stream_names)} log streams in group '{log_group_name}' with Logs Insights."
+            )
+            query_id = self.cloudwatch_logs_client.start_query(
+                logGroupName=log_group_name,
+                startTime=start_time // 1000,
+                endTime=math.ceil(end_time / 1000),
+                queryString=query,
+            )["queryId"]
+
+            deadline = time.monotonic() + self.timeout
+            while True:
+                response = self.cloudwatch_logs_client.get_query_results(
+                    queryId=query_id
+                )
+                status = response["status"]
+                if status == "Complete":
+                    break
+                if status not in ("Scheduled", "Running"):
+                    raise APIRequestError(
+                        f"Logs Insights query {query_id} ended with status {status}."
+                    )
+                if time.monotonic() >= deadline:
+                    self.cloudwatch_logs_client.stop_query(queryId=query_id)
+                    raise APIRequestError(
+                        f"Logs Insights query {query_id} did not complete within {self.timeout} seconds."
+                    )
+                time.sleep(self.poll_interval)
+        except ClientError as e:
+            logger.error(f"Failed to run Logs Insights query: {e}")
+            raise APIRequestError(f"Failed to run Logs Insights query: {e}") from e
+
+        timestamps = {}
+        for row in response.get("results", []):
+            fields = {field["field"]: field["value"] for field in row}
+            if "@logStream" in fields and "timestamp" in fields:
+                timestamps[fields["@logStream"]] = int(float(fields["timestamp"]))
+        return timestamps
+
+    def build_query(self, log_stream_names: Sequence[str]) -> str:
+        """
+        Builds the Insights query selecting the earliest failure timestamp of each stream.
+
+        Parameters
+        ----------
+        log_stream_names : Sequence[str]
+            The names of the log streams to search.
+
+        Returns
+        -------
+        str
+            The Logs Insights query string.
+        """
+        streams = ", ".join(json.dumps(name) for name in log_stream_names)
+        signatures = self.scanner.signatures
+        pattern = signatures.pattern.replace("/", "\\/")
+        if not signatures.case_sensitive:
+            pattern = f"(?i){pattern}"
+        return (
+            "fields @logStream, @message, toMillis(@timestamp) as timestampMillis"
+            f" | filter @logStream in [{streams}] and @message like /{pattern}/"
+            " | stats min(timestampMillis) as timestamp by @logStream"
+        )
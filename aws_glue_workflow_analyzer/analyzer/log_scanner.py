@@ -0,0 +1,138 @@
+from typing import Iterable, Optional, Sequence
+
+from aws_glue_workflow_analyzer.analyzer.signatures import SignatureEngine
+
+
+class ErrorContextScanner:
+    """
+    Finds the first failure line in a stream of log messages and extracts its surrounding context.
+
+    Messages are scanned one at a time. Only the last ``context_chars`` characters
+    before the current message are kept, so the scan takes time proportional to the
+    size of the log and memory proportional to the context window and largest message.
+    """
+
+    def __init__(
+        self,
+        keywords: Sequence[str] = ("error", "exception", "failed"),
+        context_chars: int = 100,
+        signatures: Optional[SignatureEngine] = None,
+    ):
+        """
+        Parameters
+        ----------
+        keywords : Sequence[str], optional
+            The keywords identifying a failure line, matched case-insensitively, by
+            default "error", "exception" and "failed". Ignored if ``signatures`` is
+            given.
+        context_chars : int, optional
+            The number of characters of context kept before and after the failure
+            line, by default 100.
+        signatures : Optional[SignatureEngine], optional
+            The failure signatures identifying a failure line, by default one signature
+            per keyword.
+        """
+        if signatures is None:
+            signatures = SignatureEngine(
+                {keyword: {"keywords": [keyword]} for keyword in keywords}
+            )
+        self.signatures = signatures
+        self.keywords = tuple(signatures.keywords)
+        self.context_chars = context_chars
+
+    def is_failure_line(self, line: str) -> bool:
+        """
+        Determines whether a log line reports a failure.
+
+        Parameters
+        ----------
+        line : str
+            The log line, without its line terminator.
+
+        Returns
+        -------
+        bool
+            True if the line matches any of the failure signatures.
+        """
+        return self.signatures.matches(line)
+
+    def scan(self, messages: Iterable[str]) -> Optional[str]:
+        """
+        Scans log messages for the first failure line.
+
+        The messages are treated as the lines of a log joined by newlines. The returned
+        context spans ``context_chars`` characters before the failure line, the line
+        itself and ``context_chars`` characters after it. Messages are consumed only
+        until the trailing context is complete.
+
+        Parameters
+        ----------
+        messages : Iterable[str]
+            The log messages, in chronological order.
+
+        Returns
+        -------
+        Optional[str]
+            The context surrounding the first failure line, or None if no line reports
+            a failure.
+        """
+        before = ""
+        context = None
+        after = ""
+        for message in messages:
+            chunk = message + "\n"
+            if context is not None:
+                after += chunk[: self.context_chars - len(after)]
+            elif not self.signatures.matches(chunk):
+                before = self._tail(before + chunk)
+            else:
+                offset = 0
+                for line, content in zip(
+                    chunk.splitlines(keepends=True), chunk.splitlines()
+                ):
+                    if self.is_failure_line(content):
+                        context = self._tail(before + chunk[:offset]) + content
+                        after = chunk[offset + len(content) :][: self.context_chars]
+                        break
+                    offset += len(line)
+                else:
+                    before = self._tail(before + chunk)
+            if context is not None and len(after) >= self.context_chars:
+                break
+        if context is None:
+            return None
+        return context + after
+
+    def scan_last(self, messages: Sequence[str]) -> Optional[str]:
+        """
+        Scans log messages for the last failure line.
+
+        The returned context has the same shape as the one returned by ``scan``, but is
+        centered on the last failure line instead of the first.
+
+        Parameters
+        ----------
+        messages : Sequence[str]
+            The log messages, in chronological order.
+
+        Returns
+        -------
+        Optional[str]
+            The context surrounding the last failure line, or None if no line reports a
+            failure.
+        """
+        text = "".join(message + "\n" for message in messages)
+        if not self.signatures.matches(text):
+            return None
+        offset = len(text)
+        for line, content in zip(
+            reversed(text.splitlines(keepends=True)), reversed(text.splitlines())
+        ):
+            offset -= len(line)
+            if self.is_failure_line(content):
+                after = text[offset + len(content) :][: self.context_chars]
+                return self._tail(text[:offset]) + content + after
+        return None
+
+    def _tail(self, text: str) -> str:
+        return text[max(0, len(text) - self.context_chars) :]
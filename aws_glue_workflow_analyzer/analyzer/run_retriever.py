@@ -1,11 +1,30 @@
 import datetime
-from typing import Any, Dict, List
+from itertools import chain, islice
+from typing import Any, Callable, Dict, Iterator, List, Optional
 
 from botocore.exceptions import ClientError
 
+from aws_glue_workflow_analyzer.analyzer.graph import StaticWorkflowGraph
+from aws_glue_workflow_analyzer.concurrency import (
+    AsyncExecutor,
+    SingleFlight,
+    iter_ordered,
+)
+from aws_glue_workflow_analyzer.disk_cache import DiskCache
 from aws_glue_workflow_analyzer.exceptions import APIRequestError
 from aws_glue_workflow_analyzer.logger import logger
-from aws_glue_workflow_analyzer.paginator import paginate_boto3
+from aws_glue_workflow_analyzer.paginator import iter_paginate_boto3
+from aws_glue_workflow_analyzer.state import IncrementalState, as_aware
+
+# The number of runs requested per GetWorkflowRuns page.
+_PAGE_SIZE = 100
+
+_FAILED_ACTION_STATISTICS = (
+    "FailedActions",
+    "StoppedActions",
+    "TimeoutActions",
+    "ErroredActions",
+)
 
 
 class WorkflowRunRetriever:
@@ -13,14 +32,50 @@ class WorkflowRunRetriever:
     Handles the retrieval of workflow runs from AWS Glue.
     """
 
-    def __init__(self, glue_client):
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        glue_client,
+        *,
+        two_phase: bool = False,
+        max_workers: int = 1,
+        disk_cache: Optional[DiskCache] = None,
+        static_graph: bool = False,
+        state: Optional[IncrementalState] = None,
+    ):
         """
         Parameters
         ----------
         glue_client : boto3.client
             An initialized Glue client.
+        two_phase : bool, optional
+            Whether to list runs without their graphs and only fetch the graphs of runs
+            with failed, stopped, timed out or errored actions, by default False. Runs
+            without failures are then yielded without a ``Graph``.
+        max_workers : int, optional
+            The maximum number of run graphs fetched concurrently when runs are listed
+            without them, by default 1.
+        disk_cache : Optional[DiskCache], optional
+            The persistent cache of completed runs, by default None. When given and
+            most of the newest runs are cached, runs are listed without their graphs,
+            which are then read from the cache or fetched run by run. Otherwise runs
+            are listed with their graphs. Completed runs are cached either way.
+        static_graph : bool, optional
+            Whether to fetch each workflow's static graph once with
+            ``BatchGetWorkflows`` and overlay the run graphs on it, so that runs share
+            a single copy of the workflow topology, by default False.
+        state : Optional[IncrementalState], optional
+            The high-water marks of previous analyses, by default None. When given,
+            only runs started after a workflow's mark and runs that had not finished
+            are yielded, and pagination stops at the mark. The marks are not moved
+            here, but once the yielded runs are analyzed and their results written.
         """
         self.glue_client = glue_client
+        self.two_phase = two_phase
+        self.max_workers = max_workers
+        self.disk_cache = disk_cache
+        self.static_graph = static_graph
+        self.static_graphs = SingleFlight()
+        self.state = state
 
     def get_workflow_runs(
         self, workflow_name: str, days: int = 30
@@ -40,6 +95,35 @@ class WorkflowRunRetriever:
         List[Dict[str, Any]]
             A list of workflow runs within the specified time period.
 
+        Raises
+        ------
+        APIRequestError
+            If the API request to AWS Glue fails.
+        """
+        filtered_runs = list(self.iter_workflow_runs(workflow_name, days))
+        logger.debug(
+            f"Retrieved {len(filtered_runs)} filtered runs for workflow '{workflow_name}'."
+        )
+        return filtered_runs
+
+    def iter_workflow_runs(
+        self, workflow_name: str, days: int = 30
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Lazily yields the workflow runs within the last specified number of days.
+
+        Parameters
+        ----------
+        workflow_name : str
+            The name of the Glue workflow to analyze.
+        days : int, optional
+            The number of days to look back for workflow runs, by default 30.
+
+        Yields
+        ------
+        Dict[str, Any]
+            Each workflow run within the specified time period.
+
         Raises
         ------
         APIRequestError
@@ -49,29 +133,268 @@ class WorkflowRunRetriever:
             logger.info(
                 f"Fetching workflow runs for '{workflow_name}' for the past {days} days."
             )
-            start_from = datetime.datetime.now() - datetime.timedelta(days=days)
-
-            workflow_runs = paginate_boto3(
-                self.glue_client.get_workflow_runs,
-                dict_key="Runs",
-                Name=workflow_name,
-                IncludeGraph=True,
-                MaxResults=100,
-            )
+            start_from = datetime.datetime.now(
+                datetime.timezone.utc
+            ) - datetime.timedelta(days=days)
 
-            filtered_runs = [
-                run
-                for run in workflow_runs
-                if run.get("StartedOn") and run["StartedOn"] >= start_from
-            ]
+            mark = self.state.get_mark(workflow_name) if self.state else None
+            if mark is not None:
+                start_from = max(start_from, mark.floor)
+                logger.info(
+                    f"Fetching runs of '{workflow_name}' started after run '{mark.run_id}'."
+                )
 
-            logger.debug(
-                f"Retrieved {len(filtered_runs)} filtered runs for workflow '{workflow_name}'."
+            def is_before_cutoff(run: Dict[str, Any]) -> bool:
+                return bool(run.get("StartedOn")) and (
+                    as_aware(run["StartedOn"]) < start_from
+                )
+
+            def list_runs(include_graph: bool) -> Iterator[Dict[str, Any]]:
+                # GetWorkflowRuns returns the newest runs first, so the first run
+                # started before the cutoff means every remaining page is outside the
+                # window.
+                workflow_runs = iter_paginate_boto3(
+                    self.glue_client.get_workflow_runs,
+                    dict_key="Runs",
+                    stop_when=is_before_cutoff,
+                    Name=workflow_name,
+                    IncludeGraph=include_graph,
+                    MaxResults=_PAGE_SIZE,
+                )
+                return (
+                    run
+                    for run in workflow_runs
+                    if run.get("StartedOn") and (mark is None or mark.is_new(run))
+                )
+
+            if self.two_phase:
+                workflow_runs = self._iter_with_graphs(workflow_name, list_runs(False))
+            elif self.disk_cache is not None:
+                workflow_runs = self._iter_through_disk_cache(
+                    workflow_name, list_runs, self.disk_cache
+                )
+            else:
+                workflow_runs = list_runs(True)
+            static_graph = (
+                self.get_static_graph(workflow_name) if self.static_graph else None
             )
-            return filtered_runs
+            for run in workflow_runs:
+                if static_graph is not None and "Graph" in run:
+                    run = {**run, "Graph": static_graph.overlay(run["Graph"])}
+                yield run
 
         except ClientError as e:
             logger.error(f"Failed to retrieve workflow runs for {workflow_name}: {e}")
             raise APIRequestError(
                 f"Failed to retrieve workflow runs for {workflow_name}: {e}"
             ) from e
+
+    def get_static_graph(self, workflow_name: str) -> Optional[StaticWorkflowGraph]:
+        """
+        Retrieves the static graph of a workflow, fetching it only once.
+
+        Parameters
+        ----------
+        workflow_name : str
+            The name of the Glue workflow.
+
+        Returns
+        -------
+        Optional[StaticWorkflowGraph]
+            The static graph of the workflow, or None if AWS Glue did not return it.
+
+        Raises
+        ------
+        APIRequestError
+            If the API request to AWS Glue fails.
+        """
+        try:
+            return self.static_graphs.do(
+                workflow_name, lambda: self._fetch_static_graph(workflow_name)
+            )
+        except ClientError as e:
+            raise APIRequestError(
+                f"Failed to retrieve the graph of workflow {workflow_name}: {e}"
+            ) from e
+
+    def _fetch_static_graph(self, workflow_name: str) -> Optional[StaticWorkflowGraph]:
+        logger.debug(f"Fetching the static graph of '{workflow_name}'.")
+        response = self.glue_client.batch_get_workflows(
+            Names=[workflow_name], IncludeGraph=True
+        )
+        for workflow in response.get("Workflows", []):
+            if workflow.get("Name") == workflow_name and "Graph" in workflow:
+                return StaticWorkflowGraph(workflow["Graph"])
+        logger.warning(
+            f"No static graph returned for '{workflow_name}', keeping full run graphs."
+        )
+        return None
+
+    def _iter_through_disk_cache(
+        self,
+        workflow_name: str,
+        list_runs: Callable[[bool], Iterator[Dict[str, Any]]],
+        disk_cache: DiskCache,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Yields runs with their graphs, reading the completed runs from the disk cache.
+
+        The first page of runs is listed without graphs. If most of its runs are
+        cached, the listing goes on without graphs and only the other runs are fetched
+        one by one. Otherwise, as on the first invocation, fetching each run would
+        cost a request per run, so the runs are listed again with their graphs and
+        the completed ones are cached from the listing pages.
+
+        Parameters
+        ----------
+        workflow_name : str
+            The name of the Glue workflow.
+        list_runs : Callable[[bool], Iterator[Dict[str, Any]]]
+            Lists the runs of the workflow in the analyzed window, with their graphs
+            if called with True.
+        disk_cache : DiskCache
+            The persistent cache of completed runs.
+
+        Yields
+        ------
+        Dict[str, Any]
+            Each workflow run, including its graph, in the listed order.
+        """
+        workflow_runs = list_runs(False)
+        first_page = list(islice(workflow_runs, _PAGE_SIZE))
+        cached = disk_cache.count_runs(
+            workflow_name, [run["RunId"] for run in first_page]
+        )
+        if 2 * cached >= len(first_page):
+            yield from self._iter_with_graphs(
+                workflow_name, chain(first_page, workflow_runs)
+            )
+            return
+        logger.info(
+            f"{len(first_page) - cached} of the {len(first_page)} newest runs of '{workflow_name}' are not cached, listing the runs with their graphs."
+        )
+        for run in list_runs(True):
+            disk_cache.put_run(workflow_name, run)
+            yield run
+
+    def _iter_with_graphs(
+        self, workflow_name: str, workflow_runs: Iterator[Dict[str, Any]]
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Adds their graphs, concurrently, to runs listed without them.
+
+        Parameters
+        ----------
+        workflow_name : str
+            The name of the Glue workflow the runs belong to.
+        workflow_runs : Iterator[Dict[str, Any]]
+            The workflow runs, as listed without their graphs.
+
+        Yields
+        ------
+        Dict[str, Any]
+            Each workflow run, in the listed order.
+        """
+        run_outcomes = iter_ordered(
+            lambda run: self._with_graph(workflow_name, run),
+            workflow_runs,
+            self.max_workers,
+        )
+        for outcome in run_outcomes:
+            if outcome.error is not None:
+                raise outcome.error
+            yield outcome.result
+
+    def _with_graph(self, workflow_name: str, run: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Adds the graph to a run listed without it, unless two-phase mode skips the run.
+
+        Parameters
+        ----------
+        workflow_name : str
+            The name of the Glue workflow the run belongs to.
+        run : Dict[str, Any]
+            The workflow run, as listed without its graph.
+
+        Returns
+        -------
+        Dict[str, Any]
+            The workflow run including its graph, or the listed run if two-phase mode is
+            enabled and the run has no failed actions.
+        """
+        if self.two_phase and not self.has_failed_actions(run):
+            return run
+        if self.disk_cache is not None:
+            cached_run = self.disk_cache.get_run(workflow_name, run["RunId"])
+            if cached_run is not None and cached_run.get("CompletedOn") == run.get(
+                "CompletedOn"
+            ):
+                return cached_run
+        logger.debug(f"Fetching graph of run '{run['RunId']}' of '{workflow_name}'.")
+        full_run = self.glue_client.get_workflow_run(
+            Name=workflow_name, RunId=run["RunId"], IncludeGraph=True
+        )["Run"]
+        if self.disk_cache is not None:
+            self.disk_cache.put_run(workflow_name, full_run)
+        return full_run
+
+    @staticmethod
+    def has_failed_actions(run: Dict[str, Any]) -> bool:
+        """
+        Determines from its status and statistics whether a workflow run has failed actions.
+
+        Parameters
+        ----------
+        run : Dict[str, Any]
+            The workflow run.
+
+        Returns
+        -------
+        bool
+            True if the run errored or was stopped, or if any of its actions failed,
+            stopped, timed out or errored.
+        """
+        statistics = run.get("Statistics", {})
+        return run.get("Status") in ("STOPPED", "ERROR") or any(
+            statistics.get(key, 0) for key in _FAILED_ACTION_STATISTICS
+        )
+
+
+class AsyncWorkflowRunRetriever:
+    """
+    Retrieves workflow runs from coroutines without blocking the event loop.
+    """
+
+    def __init__(self, run_retriever: WorkflowRunRetriever, executor: AsyncExecutor):
+        """
+        Parameters
+        ----------
+        run_retriever : WorkflowRunRetriever
+            The synchronous retriever performing the Glue requests.
+        executor : AsyncExecutor
+            The executor bounding the number of requests in flight.
+        """
+        self.run_retriever = run_retriever
+        self.executor = executor
+
+    async def get_workflow_runs(
+        self, workflow_name: str, days: int = 30
+    ) -> List[Dict[str, Any]]:
+        """
+        Retrieves all workflow runs within the last specified number of days.
+
+        Parameters
+        ----------
+        workflow_name : str
+            The name of the Glue workflow to analyze.
+        days : int, optional
+            The number of days to look back for workflow runs, by default 30.
+
+        Returns
+        -------
+        List[Dict[str, Any]]
+            A list of workflow runs within the specified time period.
+        """
+        return await self.executor.run(
+            self.run_retriever.get_workflow_runs, workflow_name, days
+        )
@@ -0,0 +1,214 @@
+import json
+import re
+from typing import Any, Dict, Iterator, List, Mapping, NamedTuple, Optional, Sequence
+
+from aws_glue_workflow_analyzer.exceptions import WorkflowAnalyzerError
+
+DEFAULT_SIGNATURES: Dict[str, Dict[str, List[str]]] = {
+    "error": {"keywords": ["error"], "regexes": []},
+    "exception": {"keywords": ["exception"], "regexes": []},
+    "failed": {"keywords": ["failed"], "regexes": []},
+}
+
+
+class SignatureMatch(NamedTuple):
+    """
+    A failure signature found in a text.
+
+    Attributes
+    ----------
+    category : str
+        The category of the signature that matched.
+    offset : int
+        The position of the match in the text.
+    text : str
+        The matched text.
+    """
+
+    category: str
+    offset: int
+    text: str
+
+
+class SignatureEngine:
+    """
+    Matches log text against categorized failure signatures with a single compiled pattern.
+
+    Every keyword and regular expression is combined into one alternation with a named
+    group per category, so a text is scanned once regardless of the number of
+    signatures. Matching is case-insensitive unless configured otherwise.
+    """
+
+    def __init__(
+        self,
+        signatures: Optional[Mapping[str, Mapping[str, Sequence[str]]]] = None,
+        case_sensitive: bool = False,
+    ):
+        """
+        Parameters
+        ----------
+        signatures : Optional[Mapping[str, Mapping[str, Sequence[str]]]], optional
+            The signatures of each category, as lists of literal "keywords" and
+            "regexes". By default, the categories "error", "exception" and "failed",
+            each matching its own name.
+        case_sensitive : bool, optional
+            Whether signatures are matched case-sensitively, by default False.
+
+        Raises
+        ------
+        WorkflowAnalyzerError
+            If no signature is given or a regular expression is invalid.
+        """
+        if signatures is None:
+            signatures = DEFAULT_SIGNATURES
+        self.case_sensitive = case_sensitive
+        self.categories: List[str] = []
+        self.keywords: List[str] = []
+        alternatives: List[str] = []
+        groups: List[str] = []
+        prefilter: List[str] = []
+        for category, definition in signatures.items():
+            keywords = list(definition.get("keywords", []))
+            patterns = [re.escape(keyword) for keyword in keywords]
+            patterns += list(definition.get("regexes", []))
+            if not patterns:
+                continue
+            self.keywords += keywords
+            prefilter += [
+                re.escape(keyword if case_sensitive else keyword.lower())
+                for keyword in keywords
+            ]
+            prefilter += [
+                f"(?:{regex})" if case_sensitive else f"(?i:{regex})"
+                for regex in definition.get("regexes", [])
+            ]
+            self.categories.append(category)
+            alternatives.append("|".join(f"(?:{pattern})" for pattern in patterns))
+            groups.append(f"(?P<c{len(groups)}>{alternatives[-1]})")
+        if not groups:
+            raise WorkflowAnalyzerError("At least one failure signature is required.")
+
+        self.pattern = "|".join(alternatives)
+        flags = 0 if case_sensitive else re.IGNORECASE
+        try:
+            self._regex = re.compile("|".join(groups), flags)
+            # Case-insensitive matching of literals is several times slower than
+            # case-sensitive matching in CPython, so unless the signatures are
+            # case-sensitive, keywords are lowercased and matched against lowercased
+            # text, and only regular expressions keep the IGNORECASE flag.
+            self._prefilter = re.compile("|".join(prefilter))
+        except re.error as e:
+            raise WorkflowAnalyzerError(f"Invalid failure signature: {e}") from e
+
+    @classmethod
+    def from_config(cls, path: str) -> "SignatureEngine":
+        """
+        Loads failure signatures from a JSON configuration file.
+
+        The file holds a "signatures" object mapping each category to its "keywords"
+        and "regexes" lists, and an optional "case_sensitive" flag.
+
+        Parameters
+        ----------
+        path : str
+            The path of the configuration file.
+
+        Returns
+        -------
+        SignatureEngine
+            The engine matching the configured signatures.
+
+        Raises
+        ------
+        WorkflowAnalyzerError
+            If the file cannot be read or does not hold a valid configuration.
+        """
+        try:
+            with open(path, "r", encoding="utf-8") as file:
+                config: Dict[str, Any] = json.load(file)
+            return cls(
+                config["signatures"], case_sensitive=config.get("case_sensitive", False)
+            )
+        except (OSError, ValueError, KeyError, TypeError, AttributeError) as e:
+            raise WorkflowAnalyzerError(
+                f"Failed to load failure signatures from {path}: {e}"
+            ) from e
+
+    def matches(self, text: str) -> bool:
+        """
+        Determines whether a text contains any failure signature.
+
+        Parameters
+        ----------
+        text : str
+            The text to search.
+
+        Returns
+        -------
+        bool
+            True if any signature matches the text.
+        """
+        haystack = text if self.case_sensitive else text.lower()
+        return self._prefilter.search(haystack) is not None
+
+    def search(self, text: str) -> Optional[SignatureMatch]:
+        """
+        Finds the first failure signature in a text.
+
+        Parameters
+        ----------
+        text : str
+            The text to search.
+
+        Returns
+        -------
+        Optional[SignatureMatch]
+            The first match, or None if no signature matches.
+        """
+        if not self.matches(text):
+            return None
+        match = self._regex.search(text)
+        return self._to_signature_match(match) if match else None
+
+    def iter_matches(self, text: str) -> Iterator[SignatureMatch]:
+        """
+        Finds every non-overlapping failure signature in a text.
+
+        Parameters
+        ----------
+        text : str
+            The text to search.
+
+        Yields
+        ------
+        SignatureMatch
+            Each match, in order of position.
+        """
+        if not self.matches(text):
+            return
+        for match in self._regex.finditer(text):
+            yield self._to_signature_match(match)
+
+    def categorize(self, text: str) -> List[str]:
+        """
+        Lists the categories of the failure signatures found in a text.
+
+        Parameters
+        ----------
+        text : str
+            The text to search.
+
+        Returns
+        -------
+        List[str]
+            The distinct categories matched, in order of their first match.
+        """
+        return list(dict.fromkeys(match.category for match in self.iter_matches(text)))
+
+    def _to_signature_match(self, match: "re.Match") -> SignatureMatch:
+        index = next(
+            index
+            for index in range(len(self.categories))
+            if match.start(f"c{index}") != -1
+        )
+        return SignatureMatch(self.categories[index], match.start(), match.group())
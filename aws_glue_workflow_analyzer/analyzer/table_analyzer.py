@@ -1,8 +1,20 @@
-from typing import Any, Dict, List
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
 
 from botocore.exceptions import ClientError
 
+from aws_glue_workflow_analyzer.analyzer.graph import DownstreamClosure, WorkflowGraph
+from aws_glue_workflow_analyzer.cache import TTLCache
+from aws_glue_workflow_analyzer.concurrency import (
+    AsyncExecutor,
+    SingleFlight,
+    iter_ordered,
+)
+from aws_glue_workflow_analyzer.disk_cache import DiskCache
 from aws_glue_workflow_analyzer.exceptions import APIRequestError
+from aws_glue_workflow_analyzer.logger import logger
+
+# The maximum number of names accepted by BatchGetJobs and BatchGetCrawlers.
+_BATCH_SIZE = 100
 
 
 class TableAnalyzer:
@@ -10,14 +22,31 @@ class TableAnalyzer:
     Analyzes the workflow graph to determine affected tables.
     """
 
-    def __init__(self, glue_client):
+    def __init__(
+        self,
+        glue_client,
+        definition_cache: Optional[TTLCache] = None,
+        disk_cache: Optional[DiskCache] = None,
+    ):
         """
         Parameters
         ----------
         glue_client : boto3.client
             An initialized Glue client.
+        definition_cache : Optional[TTLCache], optional
+            The cache of job and crawler definitions, by default a new cache keeping
+            1024 definitions for an hour.
+        disk_cache : Optional[DiskCache], optional
+            The persistent cache consulted before requesting a definition that is not
+            in ``definition_cache``, by default None.
         """
         self.glue_client = glue_client
+        self.disk_cache = disk_cache
+        self.definition_cache = (
+            TTLCache() if definition_cache is None else definition_cache
+        )
+        self.workflow_graphs = SingleFlight()
+        self.downstream_closures = SingleFlight()
 
     def get_affected_tables(
         self, graph: Dict[str, Any], failure_node_id: str
@@ -43,89 +72,86 @@ class TableAnalyzer:
             If the API request to AWS Glue fails.
         """
         try:
-            failed_nodes = self._dfs_collect_failed_nodes(graph, failure_node_id)
-            affected_tables = self._extract_tables_from_nodes(graph, failed_nodes)
+            workflow_graph = self.get_workflow_graph(graph)
+            failed_nodes = self.get_downstream_closure(workflow_graph).downstream(
+                failure_node_id
+            )
+            logger.debug(f"Failed nodes collected: {failed_nodes}")
+            affected_tables = self._extract_tables_from_nodes(
+                workflow_graph, failed_nodes
+            )
             return list(affected_tables)
         except ClientError as e:
             raise APIRequestError(f"Failed to retrieve affected tables: {e}") from e
 
-    def _dfs_collect_failed_nodes(
-        self, graph: Dict[str, Any], failure_node_id: str
-    ) -> set:
+    def get_workflow_graph(self, graph: Dict[str, Any]) -> WorkflowGraph:
         """
-        Performs DFS to collect all nodes affected by a failure, including the failure node itself.
+        Returns the indexed view of a workflow graph, building it once per graph.
+
+        Every node of a run is analyzed against the same graph, so the index is
+        memoized on the graph object and shared by all of them.
 
         Parameters
         ----------
         graph : Dict[str, Any]
             The workflow execution graph.
-        failure_node_id : str
-            The ID of the failure node in the graph.
 
         Returns
         -------
-        set
-            A set of node IDs affected by the failure.
+        WorkflowGraph
+            The indexed workflow graph.
         """
-        failed_nodes = set()
-        stack = [failure_node_id]
-
-        while stack:
-            current_node_id = stack.pop()
-            if current_node_id not in failed_nodes:
-                failed_nodes.add(current_node_id)
-                for edge in graph.get("Edges", []):
-                    if edge["SourceId"] == current_node_id:
-                        stack.append(edge["DestinationId"])
-                        print(
-                            f"Traversing from {current_node_id} to {edge['DestinationId']}"
-                        )
-
-        print(f"Failed nodes collected: {failed_nodes}")
-        return failed_nodes
+        # The memoized WorkflowGraph keeps its source alive, so the id cannot be reused.
+        return self.workflow_graphs.do(id(graph), lambda: WorkflowGraph(graph))
 
-    def _extract_tables_from_nodes(self, graph: Dict[str, Any], node_ids: set) -> set:
+    def get_downstream_closure(
+        self, workflow_graph: WorkflowGraph
+    ) -> DownstreamClosure:
         """
-        Extracts tables from the set of node IDs.
+        Returns the downstream closure of every node of a graph, computing it once per topology.
+
+        Runs of a workflow nearly always share the same graph topology, so closures are
+        memoized by the structural hash of the graph and later runs reuse them.
 
         Parameters
         ----------
-        graph : Dict[str, Any]
-            The workflow execution graph.
-        node_ids : set
-            A set of node IDs from which to extract tables.
+        workflow_graph : WorkflowGraph
+            The indexed workflow graph.
 
         Returns
         -------
-        set
-            A set of table names extracted from the nodes.
+        DownstreamClosure
+            The downstream closure of every node of the graph.
         """
-        affected_tables = set()
-        for node_id in node_ids:
-            node = self._get_node_by_id(graph, node_id)
-            if node:  # Ensure the node exists in the graph
-                tables_from_node = self._get_tables_for_node(node)
-                affected_tables.update(tables_from_node)
-                print(f"Extracted tables from node {node_id}: {tables_from_node}")
-        return affected_tables
+        return self.downstream_closures.do(
+            workflow_graph.structural_hash,
+            lambda: DownstreamClosure(workflow_graph),
+        )
 
-    def _get_node_by_id(self, graph: Dict[str, Any], node_id: str) -> Dict[str, Any]:
+    def _extract_tables_from_nodes(
+        self, workflow_graph: WorkflowGraph, node_ids: Set[str]
+    ) -> Set[str]:
         """
-        Retrieves a node from the workflow graph by its ID.
+        Extracts tables from the set of node IDs.
 
         Parameters
         ----------
-        graph : Dict[str, Any]
-            The workflow execution graph.
-        node_id : str
-            The ID of the node to retrieve.
+        workflow_graph : WorkflowGraph
+            The indexed workflow graph.
+        node_ids : Set[str]
+            A set of node IDs from which to extract tables.
 
         Returns
         -------
-        Dict[str, Any]
-            The node data.
+        Set[str]
+            A set of table names extracted from the nodes.
         """
-        return next(node for node in graph["Nodes"] if node["Id"] == node_id)
+        affected_tables = set()
+        for node_id in node_ids:
+            node = workflow_graph.get_node(node_id)
+            if node:  # Ensure the node exists in the graph
+                affected_tables.update(self._get_tables_for_node(node))
+        return affected_tables
 
     def _get_tables_for_node(self, node: Dict[str, Any]) -> set:
         """
@@ -146,9 +172,190 @@ class TableAnalyzer:
             affected_tables.update(self._get_tables_from_crawler(node["Name"]))
         elif node["Type"] == "Job":
             affected_tables.update(self._get_tables_from_job(node["Name"]))
-        print(f"Extracted tables from node {node['Id']}: {affected_tables}")
+        logger.debug(f"Extracted tables from node {node['Id']}: {affected_tables}")
         return affected_tables
 
+    def prefetch_definitions(
+        self, graphs: Iterable[Dict[str, Any]], max_workers: int = 1
+    ) -> None:
+        """
+        Resolves the definitions of every job and crawler of the given graphs in bulk.
+
+        Names that are not cached yet are requested in chunks of 100 with
+        ``batch_get_jobs`` and ``batch_get_crawlers``, with up to ``max_workers`` chunks
+        in flight, and the definitions seed the cache used by ``get_affected_tables``.
+        Names AWS Glue does not find are left to the individual lookups.
+
+        Parameters
+        ----------
+        graphs : Iterable[Dict[str, Any]]
+            The workflow execution graphs whose nodes are resolved.
+        max_workers : int, optional
+            The maximum number of chunks requested concurrently, by default 1.
+
+        Raises
+        ------
+        APIRequestError
+            If a batch request to AWS Glue fails.
+        """
+        names: Dict[str, Set[str]] = {"Job": set(), "Crawler": set()}
+        for graph in graphs:
+            for node in graph.get("Nodes", []):
+                kind, name = node.get("Type"), node.get("Name")
+                if kind in names and name and (kind, name) not in self.definition_cache:
+                    names[kind].add(name)
+        self._seed_from_disk_cache(names)
+        chunks = self._chunks(names)
+        if chunks:
+            logger.info(
+                f"Prefetching {len(names['Job'])} job and {len(names['Crawler'])} crawler definitions in {len(chunks)} batches."
+            )
+        for outcome in iter_ordered(self._batch_get_definitions, chunks, max_workers):
+            if outcome.error is not None:
+                if isinstance(outcome.error, ClientError):
+                    raise APIRequestError(
+                        f"Failed to prefetch job and crawler definitions: {outcome.error}"
+                    ) from outcome.error
+                raise outcome.error
+            kind = outcome.item[0]
+            for definition in outcome.result:
+                self.definition_cache.put((kind, definition["Name"]), definition)
+                if self.disk_cache is not None:
+                    self.disk_cache.put_definition(kind, definition["Name"], definition)
+
+    def _seed_from_disk_cache(self, names: Dict[str, Set[str]]):
+        """
+        Caches the definitions found in the disk cache and removes their names.
+
+        Parameters
+        ----------
+        names : Dict[str, Set[str]]
+            The names of the definitions to resolve, by kind, updated in place.
+        """
+        if self.disk_cache is None:
+            return
+        for kind, kind_names in names.items():
+            for name in list(kind_names):
+                definition = self.disk_cache.get_definition(kind, name)
+                if definition is not None:
+                    self.definition_cache.put((kind, name), definition)
+                    kind_names.discard(name)
+
+    @staticmethod
+    def _chunks(names: Dict[str, Set[str]]) -> List[Tuple[str, List[str]]]:
+        """
+        Splits the names to request into batches.
+
+        Parameters
+        ----------
+        names : Dict[str, Set[str]]
+            The names of the definitions to request, by kind.
+
+        Returns
+        -------
+        List[Tuple[str, List[str]]]
+            The kind and the sorted names of each batch of up to 100 definitions.
+        """
+        return [
+            (kind, sorted_names[start : start + _BATCH_SIZE])
+            for kind, kind_names in names.items()
+            for sorted_names in [sorted(kind_names)]
+            for start in range(0, len(sorted_names), _BATCH_SIZE)
+        ]
+
+    def _batch_get_definitions(
+        self, chunk: Tuple[str, List[str]]
+    ) -> List[Dict[str, Any]]:
+        """
+        Requests the definitions of up to 100 jobs or crawlers at once.
+
+        Parameters
+        ----------
+        chunk : Tuple[str, List[str]]
+            The kind of definition, "Job" or "Crawler", and the names to request.
+
+        Returns
+        -------
+        List[Dict[str, Any]]
+            The definitions found by AWS Glue.
+        """
+        kind, names = chunk
+        if kind == "Job":
+            return self.glue_client.batch_get_jobs(JobNames=names)["Jobs"]
+        return self.glue_client.batch_get_crawlers(CrawlerNames=names)["Crawlers"]
+
+    def get_job_definition(self, job_name: str) -> Dict[str, Any]:
+        """
+        Retrieves the definition of a Glue Job, requesting it only once while it is cached.
+
+        Parameters
+        ----------
+        job_name : str
+            The name of the job.
+
+        Returns
+        -------
+        Dict[str, Any]
+            The job definition returned by AWS Glue.
+        """
+        return self.definition_cache.get_or_load(
+            ("Job", job_name),
+            lambda: self._load_definition(
+                "Job", job_name, lambda: self.glue_client.get_job(Name=job_name)["Job"]
+            ),
+        )
+
+    def get_crawler_definition(self, crawler_name: str) -> Dict[str, Any]:
+        """
+        Retrieves the definition of a Glue Crawler, requesting it only once while it is cached.
+
+        Parameters
+        ----------
+        crawler_name : str
+            The name of the crawler.
+
+        Returns
+        -------
+        Dict[str, Any]
+            The crawler definition returned by AWS Glue.
+        """
+        return self.definition_cache.get_or_load(
+            ("Crawler", crawler_name),
+            lambda: self._load_definition(
+                "Crawler",
+                crawler_name,
+                lambda: self.glue_client.get_crawler(Name=crawler_name)["Crawler"],
+            ),
+        )
+
+    def _load_definition(
+        self, kind: str, name: str, fetch: Callable[[], Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """
+        Loads a definition from the persistent cache, fetching and storing it if needed.
+
+        Parameters
+        ----------
+        kind : str
+            The kind of definition, "Job" or "Crawler".
+        name : str
+            The name of the job or crawler.
+        fetch : Callable[[], Dict[str, Any]]
+            The function requesting the definition from AWS Glue.
+
+        Returns
+        -------
+        Dict[str, Any]
+            The definition.
+        """
+        if self.disk_cache is None:
+            return fetch()
+        definition = self.disk_cache.get_definition(kind, name)
+        if definition is None:
+            definition = fetch()
+            self.disk_cache.put_definition(kind, name, definition)
+        return definition
+
     def _get_tables_from_crawler(self, crawler_name: str) -> set:
         """
         Retrieves the tables affected by a specific Glue Crawler.
@@ -164,7 +371,7 @@ class TableAnalyzer:
             A set of table names affected by the crawler.
         """
         tables = set()
-        crawler = self.glue_client.get_crawler(Name=crawler_name)["Crawler"]
+        crawler = self.get_crawler_definition(crawler_name)
         if "Targets" in crawler:
             for target in crawler["Targets"]["S3Targets"]:
                 path = target["Path"]
@@ -187,10 +394,50 @@ class TableAnalyzer:
             A set of table names affected by the job.
         """
         tables = set()
-        job = self.glue_client.get_job(Name=job_name)["Job"]
+        job = self.get_job_definition(job_name)
         if "OutputDataConfig" in job:
             for output in job["OutputDataConfig"]["S3Outputs"]:
                 path = output["S3Uri"]
                 table_name = path.split("/")[-1]
                 tables.add(table_name)
         return tables
+
+
+class AsyncTableAnalyzer:
+    """
+    Determines affected tables from coroutines without blocking the event loop.
+    """
+
+    def __init__(self, table_analyzer: TableAnalyzer, executor: AsyncExecutor):
+        """
+        Parameters
+        ----------
+        table_analyzer : TableAnalyzer
+            The synchronous analyzer performing the Glue requests.
+        executor : AsyncExecutor
+            The executor bounding the number of requests in flight.
+        """
+        self.table_analyzer = table_analyzer
+        self.executor = executor
+
+    async def get_affected_tables(
+        self, graph: Dict[str, Any], failure_node_id: str
+    ) -> List[str]:
+        """
+        Identifies tables affected by a failure in the workflow by analyzing downstream nodes.
+
+        Parameters
+        ----------
+        graph : Dict[str, Any]
+            The workflow execution graph.
+        failure_node_id : str
+            The ID of the failure node in the graph.
+
+        Returns
+        -------
+        List[str]
+            A list of tables affected by the failure.
+        """
+        return await self.executor.run(
+            self.table_analyzer.get_affected_tables, graph, failure_node_id
+        )
@@ -1,14 +1,98 @@
-from typing import Any, Dict, List
+import asyncio
+from typing import (
+    AbstractSet,
+    Any,
+    Dict,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Set,
+    Tuple,
+)
 
 from botocore.exceptions import ClientError
 
 from aws_glue_workflow_analyzer.analyzer.aws_client import AWSClientManager
-from aws_glue_workflow_analyzer.analyzer.details_collector import StepDetailsCollector
-from aws_glue_workflow_analyzer.analyzer.error_retriever import ErrorContextRetriever
-from aws_glue_workflow_analyzer.analyzer.run_retriever import WorkflowRunRetriever
-from aws_glue_workflow_analyzer.analyzer.table_analyzer import TableAnalyzer
-from aws_glue_workflow_analyzer.exceptions import APIRequestError
+from aws_glue_workflow_analyzer.analyzer.details_collector import (
+    AsyncStepDetailsCollector,
+    StepDetailsCollector,
+)
+from aws_glue_workflow_analyzer.analyzer.enrichment import EnrichmentPolicy
+from aws_glue_workflow_analyzer.analyzer.error_retriever import (
+    AsyncErrorContextRetriever,
+    ErrorContextRetriever,
+)
+from aws_glue_workflow_analyzer.analyzer.run_retriever import (
+    AsyncWorkflowRunRetriever,
+    WorkflowRunRetriever,
+)
+from aws_glue_workflow_analyzer.analyzer.signatures import SignatureEngine
+from aws_glue_workflow_analyzer.analyzer.table_analyzer import (
+    AsyncTableAnalyzer,
+    TableAnalyzer,
+)
+from aws_glue_workflow_analyzer.concurrency import (
+    AsyncExecutor,
+    TaskOutcome,
+    iter_flattened,
+)
+from aws_glue_workflow_analyzer.disk_cache import DiskCache
+from aws_glue_workflow_analyzer.exceptions import APIRequestError, PartialAnalysisError
 from aws_glue_workflow_analyzer.logger import logger
+from aws_glue_workflow_analyzer.state import IncrementalState
+
+
+class AnalyzerOptions(NamedTuple):
+    """
+    The tuning options of a ``GlueWorkflowAnalyzer``.
+
+    Attributes
+    ----------
+    max_workers : int
+        The maximum number of concurrent AWS requests used to retrieve workflow runs
+        and step details, by default 1 (serial execution).
+    max_concurrency : int
+        The maximum number of AWS requests in flight in ``analyze_workflows_async``,
+        by default 100.
+    two_phase_runs : bool
+        Whether to list runs without their graphs and only fetch the graphs of runs
+        with failed actions, by default False. Steps of healthy runs are then not
+        analyzed.
+    static_graph : bool
+        Whether to fetch each workflow's static graph once and overlay the run graphs
+        on it, so runs share a single copy of the workflow topology, by default False.
+    log_strategy : str
+        How failure lines are located in CloudWatch Logs, by default "scan". See
+        ``ErrorContextRetriever`` for the available strategies.
+    prefetch_batch_size : int
+        The number of runs whose job and crawler definitions are requested together,
+        and whose logs are searched together with the "insights" log strategy, by
+        default 100.
+    max_tail_events : int
+        The maximum number of events read from each log stream with the "tail" log
+        strategy, by default 10000.
+    max_tail_bytes : int
+        The maximum number of message bytes read from each log stream with the "tail"
+        log strategy, by default 10 MiB.
+    cache_dir : Optional[str]
+        The directory of a persistent cache of job and crawler definitions and of
+        completed runs, shared across analyses, by default None (no persistent cache).
+    cache_ttl : float
+        The number of seconds a persistently cached job or crawler definition is used
+        before being fetched again, by default 3600.
+    """
+
+    max_workers: int = 1
+    max_concurrency: int = 100
+    two_phase_runs: bool = False
+    static_graph: bool = False
+    log_strategy: str = "scan"
+    prefetch_batch_size: int = 100
+    max_tail_events: int = 10000
+    max_tail_bytes: int = 10 * 1024 * 1024
+    cache_dir: Optional[str] = None
+    cache_ttl: float = 3600.0
 
 
 class GlueWorkflowAnalyzer:
@@ -16,18 +100,68 @@ class GlueWorkflowAnalyzer:
     Coordinates the analysis of AWS Glue workflows, retrieving and processing details of each step.
     """
 
-    def __init__(self):
+    def __init__(
+        self,
+        options: Optional[AnalyzerOptions] = None,
+        incremental_state: Optional[IncrementalState] = None,
+        enrichment_policy: Optional[EnrichmentPolicy] = None,
+        signatures: Optional[SignatureEngine] = None,
+    ):
         """
         Initializes the GlueWorkflowAnalyzer with AWS clients and auxiliary classes.
+
+        Parameters
+        ----------
+        options : Optional[AnalyzerOptions], optional
+            The concurrency, run retrieval, log search and cache options, by default
+            ``AnalyzerOptions()``.
+        incremental_state : Optional[IncrementalState], optional
+            The high-water marks of previous analyses, by default None. When given,
+            only the runs started since the previous analysis and the runs that had
+            not finished are analyzed, and the runs whose steps were all analyzed are
+            staged in it. The caller commits the state once the results are written.
+        enrichment_policy : Optional[EnrichmentPolicy], optional
+            The policy selecting the steps whose error context and affected tables are
+            retrieved, by default only failed, stopped, timed out, errored or cancelled
+            steps. Other steps are reported from their run graph alone.
+        signatures : Optional[SignatureEngine], optional
+            The failure signatures searched for in CloudWatch Logs, by default the
+            keywords "error", "exception" and "failed", matched case-insensitively.
         """
-        self.client_manager = AWSClientManager()
-        self.run_retriever = WorkflowRunRetriever(self.client_manager.glue_client)
+        self.options = AnalyzerOptions() if options is None else options
+        self.client_manager = AWSClientManager(
+            max_pool_connections=max(
+                self.options.max_workers, self.options.max_concurrency
+            )
+        )
+        disk_cache = (
+            DiskCache(self.options.cache_dir, definition_ttl=self.options.cache_ttl)
+            if self.options.cache_dir
+            else None
+        )
+        self.run_retriever = WorkflowRunRetriever(
+            self.client_manager.glue_client,
+            two_phase=self.options.two_phase_runs,
+            static_graph=self.options.static_graph,
+            state=incremental_state,
+            max_workers=self.options.max_workers,
+            disk_cache=disk_cache,
+        )
         self.error_context_retriever = ErrorContextRetriever(
-            self.client_manager.cloudwatch_logs_client
+            self.client_manager.cloudwatch_logs_client,
+            strategy=self.options.log_strategy,
+            max_tail_events=self.options.max_tail_events,
+            max_tail_bytes=self.options.max_tail_bytes,
+            signatures=signatures,
+        )
+        self.table_analyzer = TableAnalyzer(
+            self.client_manager.glue_client, disk_cache=disk_cache
         )
-        self.table_analyzer = TableAnalyzer(self.client_manager.glue_client)
         self.step_details_collector = StepDetailsCollector(
-            self.error_context_retriever, self.table_analyzer
+            self.error_context_retriever,
+            self.table_analyzer,
+            EnrichmentPolicy() if enrichment_policy is None else enrichment_policy,
+            self.error_context_retriever.scanner.signatures,
         )
 
     def analyze_workflows(
@@ -36,6 +170,10 @@ class GlueWorkflowAnalyzer:
         """
         Analyzes multiple workflows, gathering step-level execution details for each.
 
+        Workflows and steps are processed on up to ``max_workers`` threads. Results are
+        returned in workflow, run and node order regardless of completion order, and a
+        failing workflow or step does not prevent the remaining ones from being analyzed.
+
         Parameters
         ----------
         workflow_names : List[str]
@@ -50,31 +188,419 @@ class GlueWorkflowAnalyzer:
 
         Raises
         ------
+        PartialAnalysisError
+            If some workflows or steps failed. The exception carries the successfully
+            collected results and the individual errors.
         APIRequestError
             If the API request to AWS services fails.
         """
         try:
-            logger.info(
-                f"Analyzing workflows: {workflow_names} for the past {days} days."
-            )
-            all_step_data = []
+            errors: List[APIRequestError] = []
+            all_step_data = list(self.iter_step_details(workflow_names, days, errors))
+            if errors:
+                raise PartialAnalysisError(all_step_data, errors)
+            return all_step_data
+        except PartialAnalysisError:
+            raise
+        except (ClientError, APIRequestError) as e:
+            logger.error(f"Failed to analyze workflows: {e}")
+            raise APIRequestError(f"Failed to analyze workflows: {e}") from e
+
+    def iter_step_details(
+        self,
+        workflow_names: List[str],
+        days: int = 30,
+        errors: Optional[List[APIRequestError]] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Lazily analyzes multiple workflows, yielding step-level execution details as they are gathered.
+
+        Runs are streamed page by page from AWS Glue and only a bounded number of runs
+        and steps are held in memory at any time, regardless of the lookback period.
+
+        Parameters
+        ----------
+        workflow_names : List[str]
+            A list of workflow names to analyze.
+        days : int, optional
+            The number of days to look back for workflow runs, by default 30.
+        errors : Optional[List[APIRequestError]], optional
+            A list to which the errors of failing workflows and steps are appended. If
+            omitted, they are raised together once the stream is exhausted.
 
-            for workflow_name in workflow_names:
-                workflow_runs = self.run_retriever.get_workflow_runs(
-                    workflow_name, days
+        Yields
+        ------
+        Dict[str, Any]
+            The details of each step execution, in workflow, run and node order.
+
+        Raises
+        ------
+        PartialAnalysisError
+            If some workflows or steps failed and no ``errors`` list was given.
+        """
+        logger.info(f"Analyzing workflows: {workflow_names} for the past {days} days.")
+        collected_errors: List[APIRequestError] = [] if errors is None else errors
+        failed = len(collected_errors)
+
+        step_outcomes = self.step_details_collector.iter_step_details(
+            self._iter_steps(workflow_names, days, collected_errors),
+            self.options.max_workers,
+        )
+        # Steps arrive in run order, so a run is staged once the first step of the
+        # next run arrives, after the consumer has taken all of its steps.
+        current_workflow, current_run, run_failed = "", None, False
+        for outcome in step_outcomes:
+            workflow_name, workflow_run, _ = outcome.item
+            if workflow_run is not current_run:
+                if current_run is not None and not run_failed:
+                    self._stage_runs({current_workflow: [current_run]})
+                current_workflow, current_run, run_failed = (
+                    workflow_name,
+                    workflow_run,
+                    False,
                 )
+            if outcome.error is None:
+                yield outcome.result
+            else:
+                run_failed = True
+                error = self._as_api_request_error(outcome.error)
+                logger.error(f"Workflow analysis item failed: {error}")
+                collected_errors.append(error)
+        if current_run is not None and not run_failed:
+            self._stage_runs({current_workflow: [current_run]})
 
-                for workflow_run in workflow_runs:
-                    for node in workflow_run["Graph"]["Nodes"]:
-                        step_data = (
-                            self.step_details_collector.get_step_execution_details(
-                                workflow_name, workflow_run, node
-                            )
-                        )
-                        all_step_data.append(step_data)
+        logger.debug(
+            f"Job and crawler definition cache: {self.table_analyzer.definition_cache.stats}"
+        )
+        if len(collected_errors) == failed:
+            logger.info("Workflow step analysis completed successfully.")
+        elif errors is None:
+            raise PartialAnalysisError(errors=collected_errors)
+
+    async def analyze_workflows_async(
+        self, workflow_names: List[str], days: int = 30
+    ) -> List[Dict[str, Any]]:
+        """
+        Analyzes multiple workflows from a coroutine, without blocking the event loop.
+
+        Produces the same results, in the same order, as ``analyze_workflows``. Up to
+        ``max_concurrency`` Glue and CloudWatch Logs requests are kept in flight.
+
+        Parameters
+        ----------
+        workflow_names : List[str]
+            A list of workflow names to analyze.
+        days : int, optional
+            The number of days to look back for workflow runs, by default 30.
+
+        Returns
+        -------
+        List[Dict[str, Any]]
+            A list of dictionaries, each containing details of a step execution.
+
+        Raises
+        ------
+        PartialAnalysisError
+            If some workflows or steps failed. The exception carries the successfully
+            collected results and the individual errors.
+        """
+        logger.info(f"Analyzing workflows: {workflow_names} for the past {days} days.")
+        executor = AsyncExecutor(self.options.max_concurrency)
+        try:
+            run_retriever = AsyncWorkflowRunRetriever(self.run_retriever, executor)
+            step_details_collector = AsyncStepDetailsCollector(
+                AsyncErrorContextRetriever(self.error_context_retriever, executor),
+                AsyncTableAnalyzer(self.table_analyzer, executor),
+                self.step_details_collector.enrichment_policy,
+                self.error_context_retriever.scanner.signatures,
+            )
+            errors: List[APIRequestError] = []
+
+            runs_by_workflow = await self._retrieve_runs_async(
+                run_retriever, workflow_names, days, errors
+            )
+            await executor.run(
+                self._prefetch,
+                [run for runs in runs_by_workflow.values() for run in runs],
+            )
+            all_step_data = await self._analyze_steps_async(
+                step_details_collector, runs_by_workflow, errors
+            )
+
+            if errors:
+                for error in errors:
+                    logger.error(f"Workflow analysis item failed: {error}")
+                raise PartialAnalysisError(all_step_data, errors)
 
             logger.info("Workflow step analysis completed successfully.")
             return all_step_data
-        except (ClientError, APIRequestError) as e:
-            logger.error(f"Failed to analyze workflows: {e}")
-            raise APIRequestError(f"Failed to analyze workflows: {e}") from e
+        finally:
+            executor.close()
+
+    async def _retrieve_runs_async(
+        self,
+        run_retriever: AsyncWorkflowRunRetriever,
+        workflow_names: List[str],
+        days: int,
+        errors: List[APIRequestError],
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Retrieves the runs of every workflow concurrently.
+
+        Parameters
+        ----------
+        run_retriever : AsyncWorkflowRunRetriever
+            The retriever of workflow runs.
+        workflow_names : List[str]
+            A list of workflow names to analyze.
+        days : int
+            The number of days to look back for workflow runs.
+        errors : List[APIRequestError]
+            A list to which workflow retrieval failures are appended.
+
+        Returns
+        -------
+        Dict[str, List[Dict[str, Any]]]
+            The runs of the workflows that were retrieved, by workflow name, in the
+            order of ``workflow_names``.
+        """
+        run_results = await asyncio.gather(
+            *(
+                run_retriever.get_workflow_runs(workflow_name, days)
+                for workflow_name in workflow_names
+            ),
+            return_exceptions=True,
+        )
+        runs_by_workflow: Dict[str, List[Dict[str, Any]]] = {}
+        for workflow_name, workflow_runs in zip(workflow_names, run_results):
+            if isinstance(workflow_runs, BaseException):
+                errors.append(self._as_api_request_error(workflow_runs))
+            else:
+                runs_by_workflow[workflow_name] = workflow_runs
+        return runs_by_workflow
+
+    async def _analyze_steps_async(
+        self,
+        step_details_collector: AsyncStepDetailsCollector,
+        runs_by_workflow: Dict[str, List[Dict[str, Any]]],
+        errors: List[APIRequestError],
+    ) -> List[Dict[str, Any]]:
+        """
+        Collects the details of every step of the runs concurrently.
+
+        Runs whose steps were all analyzed are staged in the incremental state.
+
+        Parameters
+        ----------
+        step_details_collector : AsyncStepDetailsCollector
+            The collector of step details.
+        runs_by_workflow : Dict[str, List[Dict[str, Any]]]
+            The runs to analyze, by workflow name.
+        errors : List[APIRequestError]
+            A list to which step failures are appended.
+
+        Returns
+        -------
+        List[Dict[str, Any]]
+            The details of the steps that were analyzed, in workflow, run and node
+            order.
+        """
+        steps = [
+            (workflow_name, workflow_run, node)
+            for workflow_name, workflow_runs in runs_by_workflow.items()
+            for workflow_run in workflow_runs
+            for node in workflow_run.get("Graph", {}).get("Nodes", [])
+        ]
+        step_results = await asyncio.gather(
+            *(
+                step_details_collector.get_step_execution_details(*step)
+                for step in steps
+            ),
+            return_exceptions=True,
+        )
+        all_step_data: List[Dict[str, Any]] = []
+        failed_runs: Set[int] = set()
+        for step, step_data in zip(steps, step_results):
+            if isinstance(step_data, BaseException):
+                errors.append(self._as_api_request_error(step_data))
+                failed_runs.add(id(step[1]))
+            else:
+                all_step_data.append(step_data)
+        self._stage_runs(runs_by_workflow, failed_runs)
+        return all_step_data
+
+    def _iter_steps(
+        self, workflow_names: List[str], days: int, errors: List[APIRequestError]
+    ) -> Iterator[Tuple[str, Dict[str, Any], Dict[str, Any]]]:
+        """
+        Streams the runs of each workflow concurrently and yields every step to analyze.
+
+        Parameters
+        ----------
+        workflow_names : List[str]
+            A list of workflow names to analyze.
+        days : int
+            The number of days to look back for workflow runs.
+        errors : List[APIRequestError]
+            A list to which workflow retrieval failures are appended.
+
+        Yields
+        ------
+        Tuple[str, Dict[str, Any], Dict[str, Any]]
+            The workflow name, workflow run and graph node of each step.
+        """
+        run_outcomes = iter_flattened(
+            lambda workflow_name: self.run_retriever.iter_workflow_runs(
+                workflow_name, days
+            ),
+            workflow_names,
+            self.options.max_workers,
+        )
+        batch: List[TaskOutcome] = []
+        for outcome in run_outcomes:
+            if outcome.error is not None:
+                error = self._as_api_request_error(outcome.error)
+                logger.error(f"Workflow analysis item failed: {error}")
+                errors.append(error)
+                continue
+            batch.append(outcome)
+            if len(batch) >= self.options.prefetch_batch_size:
+                yield from self._prefetched_steps(batch)
+                batch = []
+        yield from self._prefetched_steps(batch)
+
+    def _prefetched_steps(
+        self, run_outcomes: List[TaskOutcome]
+    ) -> Iterator[Tuple[str, Dict[str, Any], Dict[str, Any]]]:
+        """
+        Resolves the definitions and searches the logs of a batch of runs at once, then yields their steps.
+
+        Parameters
+        ----------
+        run_outcomes : List[TaskOutcome]
+            The workflow name and workflow run of each run in the batch.
+
+        Yields
+        ------
+        Tuple[str, Dict[str, Any], Dict[str, Any]]
+            The workflow name, workflow run and graph node of each step.
+        """
+        if not run_outcomes:
+            return
+        self._prefetch([outcome.result for outcome in run_outcomes])
+        for outcome in run_outcomes:
+            if not outcome.result.get("Graph", {}).get("Nodes"):
+                self._stage_runs({outcome.item: [outcome.result]})
+            yield from self._steps_of(outcome)
+
+    def _stage_runs(
+        self,
+        runs_by_workflow: Dict[str, List[Dict[str, Any]]],
+        failed_runs: AbstractSet[int] = frozenset(),
+    ):
+        """
+        Stages analyzed runs in the incremental state, if any, to be committed once written.
+
+        Parameters
+        ----------
+        runs_by_workflow : Dict[str, List[Dict[str, Any]]]
+            The analyzed runs, by workflow name.
+        failed_runs : AbstractSet[int], optional
+            The ``id`` of the runs with a failed step, which are not staged so they
+            are analyzed again, by default none.
+        """
+        if self.run_retriever.state is None:
+            return
+        for workflow_name, workflow_runs in runs_by_workflow.items():
+            analyzed = [run for run in workflow_runs if id(run) not in failed_runs]
+            if analyzed:
+                self.run_retriever.state.stage(workflow_name, analyzed)
+
+    def _prefetch(self, workflow_runs: List[Dict[str, Any]]):
+        """
+        Resolves the job and crawler definitions of many runs with batched requests and,
+        with the "insights" log strategy, searches their logs with batched queries.
+
+        Runs without any step selected by the enrichment policy are skipped. If a
+        batched request fails for any reason, including a malformed response or a disk
+        cache error, the definitions or error contexts are retrieved step by step
+        instead.
+
+        Parameters
+        ----------
+        workflow_runs : List[Dict[str, Any]]
+            The workflow runs whose logs are searched.
+        """
+        workflow_runs = [
+            workflow_run
+            for workflow_run in workflow_runs
+            if self.step_details_collector.enrichment_policy.enriches_run(workflow_run)
+        ]
+        if not workflow_runs:
+            return
+        try:
+            self.table_analyzer.prefetch_definitions(
+                (workflow_run.get("Graph", {}) for workflow_run in workflow_runs),
+                self.options.max_workers,
+            )
+        except Exception as e:  # pylint: disable=broad-except
+            logger.warning(
+                f"Batched definition lookup failed, looking up one by one: {self._as_api_request_error(e)}"
+            )
+        if self.error_context_retriever.strategy != "insights":
+            return
+        log_requests = set()
+        for workflow_run in workflow_runs:
+            log_request = self.step_details_collector.get_log_request(workflow_run)
+            if log_request:
+                log_requests.add(log_request)
+        try:
+            self.error_context_retriever.prefetch_error_contexts(log_requests)
+        except Exception as e:  # pylint: disable=broad-except
+            logger.warning(
+                f"Batched log search failed, searching run by run: {self._as_api_request_error(e)}"
+            )
+
+    @staticmethod
+    def _steps_of(
+        outcome: TaskOutcome,
+    ) -> Iterator[Tuple[str, Dict[str, Any], Dict[str, Any]]]:
+        for node in outcome.result.get("Graph", {}).get("Nodes", []):
+            yield outcome.item, outcome.result, node
+
+    @staticmethod
+    def _as_api_request_error(error: Optional[BaseException]) -> APIRequestError:
+        """
+        Converts the error of a failed workflow or step into an APIRequestError.
+
+        Any ``Exception`` raised while analyzing a single item, such as a malformed
+        response, is reported as an error of that item, so the other items are still
+        analyzed.
+
+        Parameters
+        ----------
+        error : Optional[BaseException]
+            The error of the failed item.
+
+        Returns
+        -------
+        APIRequestError
+            The error, wrapped if it is not already an APIRequestError.
+
+        Raises
+        ------
+        BaseException
+            The original error, if it is not an ``Exception``, such as a
+            ``KeyboardInterrupt`` or a cancellation, which stops the whole analysis.
+        """
+        if isinstance(error, APIRequestError):
+            return error
+        if isinstance(error, ClientError):
+            return APIRequestError(str(error))
+        if isinstance(error, Exception):
+            wrapped = APIRequestError(f"{type(error).__name__}: {error}")
+            wrapped.__cause__ = error
+            return wrapped
+        if error is None:
+            return APIRequestError()
+        raise error
@@ -0,0 +1,189 @@
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Hashable, NamedTuple, Optional, Tuple
+
+
+class CacheStats(NamedTuple):
+    """
+    The counters of a cache.
+
+    Attributes
+    ----------
+    hits : int
+        The number of lookups answered from the cache.
+    misses : int
+        The number of lookups that had to load their value.
+    evictions : int
+        The number of entries dropped because the cache was full.
+    expirations : int
+        The number of entries dropped because they outlived their time to live.
+    """
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+
+
+class TTLCache:
+    """
+    A thread-safe least-recently-used cache whose entries expire after a time to live.
+
+    Concurrent lookups of a missing key wait for a single load instead of loading the
+    value once each. Failed loads are not cached.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        ttl: float = 3600.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Parameters
+        ----------
+        max_entries : int, optional
+            The maximum number of entries kept, by default 1024. The least recently
+            used entry is evicted when the cache is full.
+        ttl : float, optional
+            The number of seconds an entry stays valid, by default 3600.
+        clock : Callable[[], float], optional
+            The function returning the current time in seconds, by default
+            ``time.monotonic``.
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._entries: OrderedDict = OrderedDict()
+        self._loads: Dict[Hashable, Future] = {}
+        self._stats = CacheStats()
+
+    def get_or_load(self, key: Hashable, loader: Callable[[], Any]) -> Any:
+        """
+        Returns the cached value of a key, loading and caching it if it is missing or expired.
+
+        Parameters
+        ----------
+        key : Hashable
+            The key identifying the value.
+        loader : Callable[[], Any]
+            The function loading the value if it is not cached.
+
+        Returns
+        -------
+        Any
+            The value of the key.
+        """
+        with self._lock:
+            entry = self._get_entry(key)
+            if entry is not None:
+                self._count(hits=1)
+                return entry[0]
+            self._count(misses=1)
+            load = self._loads.get(key)
+            leader = load is None
+            if load is None:
+                load = self._loads[key] = Future()
+        if not leader:
+            return load.result()
+
+        try:
+            value = loader()
+        except Exception as e:
+            with self._lock:
+                del self._loads[key]
+            load.set_exception(e)
+            raise
+        with self._lock:
+            del self._loads[key]
+            self._put_entry(key, value)
+        load.set_result(value)
+        return value
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            return self._get_entry(key) is not None
+
+    def put(self, key: Hashable, value: Any):
+        """
+        Caches the value of a key, replacing any previous value.
+
+        Parameters
+        ----------
+        key : Hashable
+            The key identifying the value.
+        value : Any
+            The value to cache.
+        """
+        with self._lock:
+            self._put_entry(key, value)
+
+    def invalidate(self, key: Hashable) -> bool:
+        """
+        Drops the cached value of a key.
+
+        Parameters
+        ----------
+        key : Hashable
+            The key identifying the value.
+
+        Returns
+        -------
+        bool
+            True if a value was cached for the key.
+        """
+        with self._lock:
+            return self._entries.pop(key, None) is not None
+
+    def clear(self):
+        """
+        Drops every cached value.
+        """
+        with self._lock:
+            self._entries.clear()
+
+    @property
+    def stats(self) -> CacheStats:
+        """
+        The hit, miss, eviction and expiration counters of the cache.
+
+        Returns
+        -------
+        CacheStats
+            The counters since the cache was created.
+        """
+        with self._lock:
+            return self._stats
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def _get_entry(self, key: Hashable) -> Optional[Tuple[Any, float]]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry[1] <= self.clock():
+            del self._entries[key]
+            self._count(expirations=1)
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def _put_entry(self, key: Hashable, value: Any):
+        self._entries[key] = (value, self.clock() + self.ttl)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._count(evictions=1)
+
+    def _count(self, **increments: int):
+        self._stats = self._stats._replace(
+            **{
+                name: getattr(self._stats, name) + value
+                for name, value in increments.items()
+            }
+        )
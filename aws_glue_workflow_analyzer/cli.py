@@ -1,4 +1,11 @@
 import argparse
+from typing import List
+
+from aws_glue_workflow_analyzer.analyzer.error_retriever import LOG_STRATEGIES
+from aws_glue_workflow_analyzer.constants import FAILURE_STATUSES
+from aws_glue_workflow_analyzer.exceptions import WorkflowAnalyzerError
+from aws_glue_workflow_analyzer.output import check_compression_level
+from aws_glue_workflow_analyzer.result_store import GROUP_BY_COLUMNS
 
 
 def parse_args() -> argparse.Namespace:
@@ -12,8 +19,9 @@ def parse_args() -> argparse.Namespace:
     """
     parser = argparse.ArgumentParser(
         prog="gwfa",
-        usage="%(prog)s [options] -w <workflow1> <workflow2> ...",
+        usage="%(prog)s [options] -w <workflow1> <workflow2> ...\n       %(prog)s query <database> [options]",
         description="Analyze AWS Glue Workflows for errors and generate detailed reports.",
+        epilog="Run '%(prog)s query --help' for the options of the query subcommand, which counts runs and failures in a result store written with --format sqlite.",
         formatter_class=argparse.ArgumentDefaultsHelpFormatter,
         prefix_chars="-",
         fromfile_prefix_chars="@",
@@ -46,8 +54,166 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument(
         "-f",
         "--format",
-        choices=["json", "csv"],
+        choices=["json", "jsonl", "csv", "sqlite", "parquet"],
         default="json",
         help="Output format for the analysis results.",
     )
-    return parser.parse_args()
+    parser.add_argument(
+        "--compress",
+        choices=["gzip", "zstd"],
+        default=None,
+        help="Compress the output files while they are written.",
+    )
+    parser.add_argument(
+        "--compress-level",
+        type=int,
+        default=None,
+        help="Compression level, 1 to 9 for gzip and 1 to 22 for zstd; by default 6 for gzip and 3 for zstd.",
+    )
+    parser.add_argument(
+        "--shard-size-mb",
+        type=int,
+        default=None,
+        help="Continue CSV output in a new numbered file every this many megabytes.",
+    )
+    parser.add_argument(
+        "--row-group-size",
+        type=int,
+        default=100000,
+        help="Number of records per row group with --format parquet.",
+    )
+    parser.add_argument(
+        "-m",
+        "--max-workers",
+        type=int,
+        default=1,
+        help="Maximum number of concurrent AWS requests used during the analysis.",
+    )
+    parser.add_argument(
+        "--two-phase-runs",
+        action="store_true",
+        default=False,
+        help="List runs without their graphs and only fetch the graphs of runs with failed actions.",
+    )
+    parser.add_argument(
+        "--static-graph",
+        action="store_true",
+        default=False,
+        help="Fetch each workflow's graph once and share its topology across the graphs of its runs.",
+    )
+    parser.add_argument(
+        "--log-strategy",
+        choices=LOG_STRATEGIES,
+        default="scan",
+        help="How failure lines are located in CloudWatch Logs: scan reads whole streams locally, filter searches them server-side first, insights searches many runs at once with Logs Insights, and tail reads them backwards from the end.",
+    )
+    parser.add_argument(
+        "--tail-max-events",
+        type=int,
+        default=10000,
+        help="Maximum number of log events read from each stream with the tail log strategy.",
+    )
+    parser.add_argument(
+        "--tail-max-bytes",
+        type=int,
+        default=10 * 1024 * 1024,
+        help="Maximum number of log bytes read from each stream with the tail log strategy.",
+    )
+    parser.add_argument(
+        "--signatures",
+        default=None,
+        help="Path to a JSON file defining the failure signatures searched for in the logs.",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        default=None,
+        help="Directory of a persistent cache of job and crawler definitions and completed runs, shared across invocations.",
+    )
+    parser.add_argument(
+        "--cache-ttl",
+        type=float,
+        default=3600.0,
+        help="Number of seconds a cached job or crawler definition is used before being fetched again.",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        default=False,
+        help="Only analyze the runs started since the previous incremental analysis and the runs that had not finished.",
+    )
+    parser.add_argument(
+        "--state-file",
+        default="gwfa-state.json",
+        help="Path of the file storing the last analyzed run of each workflow for --incremental.",
+    )
+    parser.add_argument(
+        "--enrich-statuses",
+        nargs="+",
+        type=str.upper,
+        default=list(FAILURE_STATUSES),
+        metavar="STATUS",
+        help="Step statuses whose error context and affected tables are retrieved; other steps are reported from the run graph alone.",
+    )
+    parser.add_argument(
+        "--enrich-all",
+        action="store_true",
+        default=False,
+        help="Retrieve the error context and affected tables of every step, whatever its status.",
+    )
+    args = parser.parse_args()
+    try:
+        check_compression_level(args.compress, args.compress_level)
+    except WorkflowAnalyzerError as e:
+        parser.error(str(e))
+    return args
+
+
+def parse_query_args(argv: List[str]) -> argparse.Namespace:
+    """
+    Parses the arguments of the ``gwfa query`` subcommand.
+
+    Parameters
+    ----------
+    argv : List[str]
+        The command-line arguments following ``query``.
+
+    Returns
+    -------
+    argparse.Namespace
+        The parsed command-line arguments.
+    """
+    parser = argparse.ArgumentParser(
+        prog="gwfa query",
+        description="Query the step history stored by --format sqlite without calling AWS.",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+    parser.add_argument("database", help="Path of the SQLite result store.")
+    parser.add_argument(
+        "-g",
+        "--group-by",
+        nargs="*",
+        choices=list(GROUP_BY_COLUMNS),
+        default=["workflow", "node"],
+        help="Columns to count runs and failures by.",
+    )
+    parser.add_argument("--workflow", default=None, help="Only count this workflow.")
+    parser.add_argument(
+        "--node", default=None, help="Only count the node with this ID or name."
+    )
+    parser.add_argument("--status", default=None, help="Only count this status.")
+    parser.add_argument(
+        "--since",
+        default=None,
+        help="Only count steps started at or after this ISO 8601 date or time in UTC.",
+    )
+    parser.add_argument(
+        "--until",
+        default=None,
+        help="Only count steps started before this ISO 8601 date or time in UTC.",
+    )
+    parser.add_argument(
+        "--sql",
+        default=None,
+        help="Run this SQL query against the step_runs table instead.",
+    )
+    return parser.parse_args(argv)
@@ -0,0 +1,323 @@
+import asyncio
+import functools
+import queue
+import threading
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Hashable,
+    Iterable,
+    Iterator,
+    NamedTuple,
+    Optional,
+)
+
+
+class TaskOutcome(NamedTuple):
+    """
+    The outcome of running a task on a single item.
+
+    Attributes
+    ----------
+    item : Any
+        The item the task was run on.
+    result : Any
+        The value returned by the task, or None if it failed.
+    error : Optional[Exception]
+        The exception raised by the task, or None if it succeeded.
+    """
+
+    item: Any
+    result: Any = None
+    error: Optional[Exception] = None
+
+
+def _run_task(func: Callable[[Any], Any], item: Any) -> TaskOutcome:
+    try:
+        return TaskOutcome(item, func(item))
+    except Exception as e:  # pylint: disable=broad-except
+        return TaskOutcome(item, error=e)
+
+
+def iter_ordered(
+    func: Callable[[Any], Any], items: Iterable[Any], max_workers: int = 1
+) -> Iterator[TaskOutcome]:
+    """
+    Runs a task over items on a bounded thread pool, yielding outcomes in input order.
+
+    Items are consumed lazily and at most ``2 * max_workers`` tasks are in flight at
+    any time, so the input may be a generator of unbounded length. Exceptions raised
+    by a task are captured in its outcome instead of aborting the remaining items.
+
+    Parameters
+    ----------
+    func : Callable[[Any], Any]
+        The task to run on each item.
+    items : Iterable[Any]
+        The items to run the task on.
+    max_workers : int, optional
+        The maximum number of worker threads, by default 1. Values lower than 2 run
+        every task inline on the calling thread.
+
+    Yields
+    ------
+    TaskOutcome
+        The outcome of each task, in the same order as the input items.
+    """
+    if max_workers <= 1:
+        for item in items:
+            yield _run_task(func, item)
+        return
+
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    pending: deque = deque()
+    try:
+        for item in items:
+            pending.append(executor.submit(_run_task, func, item))
+            if len(pending) >= 2 * max_workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+    finally:
+        for future in pending:
+            future.cancel()
+        executor.shutdown(wait=True)
+
+
+_DONE = object()
+
+
+def _put(buffer: queue.Queue, value: Any, stop: threading.Event) -> bool:
+    while not stop.is_set():
+        try:
+            buffer.put(value, timeout=0.1)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+def _produce(
+    func: Callable[[Any], Iterable[Any]],
+    item: Any,
+    buffer: queue.Queue,
+    stop: threading.Event,
+):
+    try:
+        for element in func(item):
+            if not _put(buffer, TaskOutcome(item, element), stop):
+                return
+    except Exception as e:  # pylint: disable=broad-except
+        if not _put(buffer, TaskOutcome(item, error=e), stop):
+            return
+    _put(buffer, _DONE, stop)
+
+
+def _drain(buffer: queue.Queue) -> Iterator[TaskOutcome]:
+    while True:
+        value = buffer.get()
+        if value is _DONE:
+            return
+        yield value
+
+
+def _iter_flattened_inline(
+    func: Callable[[Any], Iterable[Any]], items: Iterable[Any]
+) -> Iterator[TaskOutcome]:
+    for item in items:
+        try:
+            for element in func(item):
+                yield TaskOutcome(item, element)
+        except Exception as e:  # pylint: disable=broad-except
+            yield TaskOutcome(item, error=e)
+
+
+def _iter_flattened_threaded(
+    func: Callable[[Any], Iterable[Any]],
+    items: Iterable[Any],
+    max_workers: int,
+    buffer_size: int,
+) -> Iterator[TaskOutcome]:
+    stop = threading.Event()
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    active: deque = deque()
+    try:
+        for item in items:
+            buffer: queue.Queue = queue.Queue(maxsize=buffer_size)
+            executor.submit(_produce, func, item, buffer, stop)
+            active.append(buffer)
+            if len(active) >= max_workers:
+                yield from _drain(active.popleft())
+        while active:
+            yield from _drain(active.popleft())
+    finally:
+        stop.set()
+        executor.shutdown(wait=True)
+
+
+def iter_flattened(
+    func: Callable[[Any], Iterable[Any]],
+    items: Iterable[Any],
+    max_workers: int = 1,
+    buffer_size: int = 100,
+) -> Iterator[TaskOutcome]:
+    """
+    Concatenates the iterables produced for each item, producing up to ``max_workers`` of them concurrently.
+
+    Each iterable is consumed on its own worker thread into a queue of at most
+    ``buffer_size`` elements, so producers running ahead of the consumer block instead
+    of accumulating results, and memory stays bounded regardless of their length.
+    Elements are yielded in input order, then in the order produced for each item.
+
+    Parameters
+    ----------
+    func : Callable[[Any], Iterable[Any]]
+        The function returning the iterable of elements for an item.
+    items : Iterable[Any]
+        The items to produce elements for.
+    max_workers : int, optional
+        The maximum number of worker threads, by default 1. Values lower than 2 consume
+        every iterable inline on the calling thread.
+    buffer_size : int, optional
+        The maximum number of elements buffered per producer, by default 100.
+
+    Yields
+    ------
+    TaskOutcome
+        The outcome for each element. If producing the elements of an item fails, an
+        outcome carrying the error is yielded after the elements produced so far.
+    """
+    if max_workers <= 1:
+        yield from _iter_flattened_inline(func, items)
+    else:
+        yield from _iter_flattened_threaded(func, items, max_workers, buffer_size)
+
+
+class SingleFlight:
+    """
+    Memoizes calls by key, running each call once even when requested concurrently.
+
+    Callers requesting a key whose call is in flight wait for it and share its result.
+    Only the most recently used ``max_entries`` results are kept, and failed calls are
+    not memoized, so a later request retries them.
+    """
+
+    def __init__(self, max_entries: int = 128):
+        """
+        Parameters
+        ----------
+        max_entries : int, optional
+            The maximum number of results kept, by default 128.
+        """
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._results: OrderedDict = OrderedDict()
+        self._calls: Dict[Hashable, Future] = {}
+
+    def do(self, key: Hashable, func: Callable[[], Any]) -> Any:
+        """
+        Returns the result of the call for a key, running it only if no result is known.
+
+        Parameters
+        ----------
+        key : Hashable
+            The key identifying the call.
+        func : Callable[[], Any]
+            The call to run if no result for the key is known or in flight.
+
+        Returns
+        -------
+        Any
+            The result of the call.
+        """
+        with self._lock:
+            if key in self._results:
+                self._results.move_to_end(key)
+                return self._results[key]
+            call = self._calls.get(key)
+            leader = call is None
+            if call is None:
+                call = self._calls[key] = Future()
+        if not leader:
+            return call.result()
+
+        try:
+            result = func()
+        except Exception as e:
+            with self._lock:
+                del self._calls[key]
+            call.set_exception(e)
+            raise
+        with self._lock:
+            del self._calls[key]
+            self._results[key] = result
+            while len(self._results) > self.max_entries:
+                self._results.popitem(last=False)
+        call.set_result(result)
+        return result
+
+    def clear(self):
+        """
+        Forgets all memoized results.
+        """
+        with self._lock:
+            self._results.clear()
+
+
+class AsyncExecutor:
+    """
+    Runs blocking calls, such as Boto3 requests, from coroutines without stalling the event loop.
+
+    Calls are offloaded to a dedicated thread pool and the number of calls in flight is
+    bounded by a semaphore, so thousands of coroutines can be scheduled at once.
+    """
+
+    def __init__(self, max_concurrency: int = 100):
+        """
+        Parameters
+        ----------
+        max_concurrency : int, optional
+            The maximum number of blocking calls in flight, by default 100.
+        """
+        self.max_concurrency = max_concurrency
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    async def run(self, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        Runs a blocking call on the thread pool once a concurrency slot is available.
+
+        Parameters
+        ----------
+        func : Callable[..., Any]
+            The blocking function to call.
+        args : tuple
+            The positional arguments to pass to the function.
+        kwargs : dict
+            The keyword arguments to pass to the function.
+
+        Returns
+        -------
+        Any
+            The value returned by the function.
+        """
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._executor = ThreadPoolExecutor(max_workers=self.max_concurrency)
+        async with self._semaphore:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                self._executor, functools.partial(func, *args, **kwargs)
+            )
+
+    def close(self):
+        """
+        Shuts down the thread pool without blocking the event loop.
+        """
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+        self._executor = None
+        self._semaphore = None
@@ -0,0 +1,3 @@
+# The statuses of the steps whose failure is worth explaining: job runs that failed,
+# were stopped, timed out or errored, and crawls that failed or were cancelled.
+FAILURE_STATUSES = ("FAILED", "STOPPED", "TIMEOUT", "ERROR", "CANCELLED")
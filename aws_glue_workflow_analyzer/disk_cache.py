@@ -0,0 +1,272 @@
+import datetime
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional, Sequence
+
+from aws_glue_workflow_analyzer.exceptions import WorkflowAnalyzerError
+
+_COMPLETED_RUN_STATUSES = ("COMPLETED", "STOPPED", "ERROR")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS definitions (
+    kind TEXT NOT NULL,
+    name TEXT NOT NULL,
+    body TEXT NOT NULL,
+    validated_at REAL NOT NULL,
+    accessed_at REAL NOT NULL,
+    PRIMARY KEY (kind, name)
+);
+CREATE TABLE IF NOT EXISTS runs (
+    workflow_name TEXT NOT NULL,
+    run_id TEXT NOT NULL,
+    body TEXT NOT NULL,
+    accessed_at REAL NOT NULL,
+    PRIMARY KEY (workflow_name, run_id)
+);
+"""
+
+
+def _encode(value: Any) -> Any:
+    if isinstance(value, datetime.datetime):
+        return {"__datetime__": value.isoformat()}
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _decode(value: Dict[str, Any]) -> Any:
+    if set(value) == {"__datetime__"}:
+        return datetime.datetime.fromisoformat(value["__datetime__"])
+    return value
+
+
+class DiskCache:
+    """
+    A SQLite cache of Glue metadata shared across invocations of the analyzer.
+
+    Job and crawler definitions are trusted for ``definition_ttl`` seconds, after which
+    they are fetched again and replace the cached copy. Completed workflow runs never change, so they are kept
+    by ``RunId`` until evicted. Each table is capped in size and evicts its least
+    recently used entries.
+    """
+
+    def __init__(
+        self,
+        cache_dir: str,
+        definition_ttl: float = 3600.0,
+        max_definitions: int = 10000,
+        max_runs: int = 10000,
+    ):
+        """
+        Parameters
+        ----------
+        cache_dir : str
+            The directory holding the cache database, created if missing.
+        definition_ttl : float, optional
+            The number of seconds a definition is used without being fetched again, by
+            default 3600.
+        max_definitions : int, optional
+            The maximum number of job and crawler definitions kept, by default 10000.
+        max_runs : int, optional
+            The maximum number of completed workflow runs kept, by default 10000.
+
+        Raises
+        ------
+        WorkflowAnalyzerError
+            If the cache database cannot be opened.
+        """
+        self.definition_ttl = definition_ttl
+        self.max_definitions = max_definitions
+        self.max_runs = max_runs
+        self.path = os.path.join(cache_dir, "gwfa-cache.sqlite3")
+        self._lock = threading.Lock()
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            # Concurrent cron invocations may share the cache, hence the busy timeout.
+            self._connection = sqlite3.connect(
+                self.path, timeout=30, check_same_thread=False
+            )
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.executescript(_SCHEMA)
+            self._connection.commit()
+        except (OSError, sqlite3.Error) as e:
+            raise WorkflowAnalyzerError(
+                f"Failed to open the cache database {self.path}: {e}"
+            ) from e
+
+    def get_definition(self, kind: str, name: str) -> Optional[Dict[str, Any]]:
+        """
+        Retrieves a cached job or crawler definition that is still within its time to live.
+
+        Parameters
+        ----------
+        kind : str
+            The kind of definition, "Job" or "Crawler".
+        name : str
+            The name of the job or crawler.
+
+        Returns
+        -------
+        Optional[Dict[str, Any]]
+            The definition, or None if it is missing or must be fetched again.
+        """
+        now = time.time()
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT body, validated_at FROM definitions WHERE kind = ? AND name = ?",
+                (kind, name),
+            ).fetchone()
+            if row is None or row[1] + self.definition_ttl <= now:
+                return None
+            self._connection.execute(
+                "UPDATE definitions SET accessed_at = ? WHERE kind = ? AND name = ?",
+                (now, kind, name),
+            )
+            self._connection.commit()
+        return json.loads(row[0], object_hook=_decode)
+
+    def put_definition(self, kind: str, name: str, definition: Dict[str, Any]):
+        """
+        Stores a freshly fetched job or crawler definition.
+
+        Parameters
+        ----------
+        kind : str
+            The kind of definition, "Job" or "Crawler".
+        name : str
+            The name of the job or crawler.
+        definition : Dict[str, Any]
+            The definition returned by AWS Glue.
+        """
+        now = time.time()
+        with self._lock:
+            # Columns are named, as caches created by earlier versions also hold an
+            # unused last_modified column.
+            self._connection.execute(
+                "INSERT OR REPLACE INTO definitions "
+                "(kind, name, body, validated_at, accessed_at) VALUES (?, ?, ?, ?, ?)",
+                (kind, name, json.dumps(definition, default=_encode), now, now),
+            )
+            self._evict("definitions", self.max_definitions)
+            self._connection.commit()
+
+    def get_run(self, workflow_name: str, run_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Retrieves a cached completed workflow run.
+
+        Parameters
+        ----------
+        workflow_name : str
+            The name of the Glue workflow the run belongs to.
+        run_id : str
+            The ID of the workflow run.
+
+        Returns
+        -------
+        Optional[Dict[str, Any]]
+            The workflow run including its graph, or None if it is not cached.
+        """
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT body FROM runs WHERE workflow_name = ? AND run_id = ?",
+                (workflow_name, run_id),
+            ).fetchone()
+            if row is None:
+                return None
+            self._connection.execute(
+                "UPDATE runs SET accessed_at = ? WHERE workflow_name = ? AND run_id = ?",
+                (time.time(), workflow_name, run_id),
+            )
+            self._connection.commit()
+        return json.loads(row[0], object_hook=_decode)
+
+    def count_runs(self, workflow_name: str, run_ids: Sequence[str]) -> int:
+        """
+        Counts how many of the given workflow runs are cached, without reading them.
+
+        Parameters
+        ----------
+        workflow_name : str
+            The name of the Glue workflow the runs belong to.
+        run_ids : Sequence[str]
+            The IDs of the workflow runs, at most a few hundred.
+
+        Returns
+        -------
+        int
+            The number of the runs that are cached.
+        """
+        if not run_ids:
+            return 0
+        placeholders = ", ".join("?" * len(run_ids))
+        with self._lock:
+            return self._connection.execute(
+                f"SELECT COUNT(*) FROM runs WHERE workflow_name = ? AND run_id IN ({placeholders})",
+                (workflow_name, *run_ids),
+            ).fetchone()[0]
+
+    def put_run(self, workflow_name: str, run: Dict[str, Any]) -> bool:
+        """
+        Stores a workflow run if it is completed and can no longer change.
+
+        Parameters
+        ----------
+        workflow_name : str
+            The name of the Glue workflow the run belongs to.
+        run : Dict[str, Any]
+            The workflow run, including its graph.
+
+        Returns
+        -------
+        bool
+            True if the run was stored.
+        """
+        if not self.is_completed(run) or "Graph" not in run:
+            return False
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO runs VALUES (?, ?, ?, ?)",
+                (
+                    workflow_name,
+                    run["RunId"],
+                    json.dumps(run, default=_encode),
+                    time.time(),
+                ),
+            )
+            self._evict("runs", self.max_runs)
+            self._connection.commit()
+        return True
+
+    @staticmethod
+    def is_completed(run: Dict[str, Any]) -> bool:
+        """
+        Determines whether a workflow run has finished and can no longer change.
+
+        Parameters
+        ----------
+        run : Dict[str, Any]
+            The workflow run.
+
+        Returns
+        -------
+        bool
+            True if the run completed, was stopped or errored, and has a completion time.
+        """
+        return run.get("Status") in _COMPLETED_RUN_STATUSES and bool(
+            run.get("CompletedOn")
+        )
+
+    def close(self):
+        """
+        Closes the cache database.
+        """
+        with self._lock:
+            self._connection.close()
+
+    def _evict(self, table: str, max_entries: int):
+        self._connection.execute(
+            f"DELETE FROM {table} WHERE rowid IN ("
+            f"SELECT rowid FROM {table} ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+            (max_entries,),
+        )
@@ -40,3 +40,23 @@ class WorkflowConnectionError(WorkflowAnalyzerError):
     ):
         self.message = message
         super().__init__(self.message)
+
+
+class PartialAnalysisError(APIRequestError):
+    """
+    Raised when some items of an analysis batch fail while the rest succeed.
+
+    Attributes
+    ----------
+    results : list
+        The step execution details that were collected successfully.
+    errors : list
+        The errors raised by the items that failed.
+    """
+
+    def __init__(self, results=None, errors=None, message=None):
+        self.results = results if results is not None else []
+        self.errors = errors if errors is not None else []
+        super().__init__(
+            message or f"{len(self.errors)} item(s) failed during workflow analysis."
+        )
@@ -1,49 +1,616 @@
+import contextlib
 import csv
+import datetime
+import gzip
+import itertools
 import json
-from typing import Any, Dict, List
+import os
+import textwrap
+from typing import IO, Any, Dict, Iterable, List, Optional, Sequence
 
+from aws_glue_workflow_analyzer.exceptions import WorkflowAnalyzerError
 from aws_glue_workflow_analyzer.logger import logger
+from aws_glue_workflow_analyzer.result_store import ResultStore
 
+# The fields of the step records built by StepDetailsCollector, in output order.
+STEP_RECORD_FIELDS = (
+    "execution_id",
+    "workflow_name",
+    "node_id",
+    "node_type",
+    "node_name",
+    "execution_status",
+    "execution_start_timestamp",
+    "execution_end_timestamp",
+    "execution_duration",
+    "error_message",
+    "failure_categories",
+    "affected_tables",
+    "log_group_name",
+    "log_stream_name",
+    "execution_parameters",
+)
 
-def save_to_json(data: List[Dict[str, Any]], file_path: str):
+
+# The compression formats of the output files, mapped to their file extensions.
+COMPRESSIONS = {"gzip": ".gz", "zstd": ".zst"}
+
+# The lowest and highest compression level of each compression format.
+COMPRESSION_LEVELS = {"gzip": (1, 9), "zstd": (1, 22)}
+
+
+def compressed_path(file_path: str, compression: Optional[str]) -> str:
+    """
+    Adds the extension of a compression format to an output path.
+
+    Parameters
+    ----------
+    file_path : str
+        The requested output path, such as "results.jsonl".
+    compression : Optional[str]
+        The compression format, "gzip" or "zstd", or None for no compression.
+
+    Returns
+    -------
+    str
+        The path with the compression extension, such as "results.jsonl.gz", unless
+        it already ends with it or the output is not compressed.
+    """
+    if compression is None or file_path.endswith(COMPRESSIONS[compression]):
+        return file_path
+    return file_path + COMPRESSIONS[compression]
+
+
+def check_compression_level(compression: Optional[str], level: Optional[int]):
+    """
+    Checks that a compression level is valid for a compression format.
+
+    Parameters
+    ----------
+    compression : Optional[str]
+        The compression format, "gzip" or "zstd", or None for no compression.
+    level : Optional[int]
+        The requested compression level, or None for the format's default.
+
+    Raises
+    ------
+    WorkflowAnalyzerError
+        If a level is given without a compression format or outside of the format's
+        range of levels.
+    """
+    if level is None:
+        return
+    if compression is None:
+        raise WorkflowAnalyzerError(
+            "A compression level requires a compression format."
+        )
+    lowest, highest = COMPRESSION_LEVELS[compression]
+    if not lowest <= level <= highest:
+        raise WorkflowAnalyzerError(
+            f"The {compression} compression level must be between {lowest} and {highest}, got {level}."
+        )
+
+
+def open_output(
+    file_path: str,
+    compression: Optional[str] = None,
+    level: Optional[int] = None,
+    **kwargs: Any,
+) -> IO[str]:
+    """
+    Opens an output file for writing text, through a streaming compressor if requested.
+
+    Parameters
+    ----------
+    file_path : str
+        The path of the file, which should include the compression extension.
+    compression : Optional[str], optional
+        The compression format, "gzip" or "zstd", by default None (no compression).
+    level : Optional[int], optional
+        The compression level, by default 6 for gzip and 3 for zstd.
+    **kwargs : Any
+        The text options of the file, such as ``newline``.
+
+    Returns
+    -------
+    IO[str]
+        The file object, encoding text as UTF-8.
+
+    Raises
+    ------
+    WorkflowAnalyzerError
+        If the compression level is invalid, or zstd compression is requested and the
+        zstandard package is not installed.
+    """
+    check_compression_level(compression, level)
+    if compression is None:
+        return open(file_path, "w", encoding="utf-8", **kwargs)
+    if compression == "gzip":
+        return gzip.open(
+            file_path,
+            "wt",
+            compresslevel=6 if level is None else level,
+            encoding="utf-8",
+            newline=kwargs.get("newline"),
+        )
+    try:
+        import zstandard  # pylint: disable=import-outside-toplevel
+    except ImportError as e:
+        raise WorkflowAnalyzerError(
+            "zstd compression requires zstandard: pip install aws-glue-workflow-analyzer[zstd]"
+        ) from e
+    return zstandard.open(
+        file_path,
+        "wt",
+        cctx=zstandard.ZstdCompressor(level=3 if level is None else level),
+        encoding="utf-8",
+        newline=kwargs.get("newline"),
+    )
+
+
+def _encode_value(value: Any) -> Any:
+    """
+    Converts the values the standard JSON encoder cannot serialize.
+
+    Parameters
+    ----------
+    value : Any
+        A value of a step record, such as its start timestamp.
+
+    Returns
+    -------
+    Any
+        The ISO 8601 string of a date or datetime, or a list for sets and tuples.
+
+    Raises
+    ------
+    TypeError
+        If the value cannot be converted.
+    """
+    if isinstance(value, (datetime.datetime, datetime.date)):
+        return value.isoformat()
+    if isinstance(value, (set, frozenset)):
+        return sorted(value, key=str)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+# Built once and reused for every record; compact separators and no indentation let
+# the C implementation of the encoder handle whole records.
+_JSONL_ENCODER = json.JSONEncoder(default=_encode_value, separators=(",", ":"))
+
+
+def save_to_json(
+    data: Iterable[Dict[str, Any]],
+    file_path: str,
+    compression: Optional[str] = None,
+    compression_level: Optional[int] = None,
+) -> bool:
     """
     Saves the analysis results to a JSON file.
 
+    Records are written one at a time as they are produced, so ``data`` may be a
+    generator and is never held in memory as a whole.
+
     Parameters
     ----------
-    data : List[Dict[str, Any]]
+    data : Iterable[Dict[str, Any]]
         The analysis results to save.
     file_path : str
         The file path where the results should be saved.
+    compression : Optional[str], optional
+        The compression format, "gzip" or "zstd", by default None. Its extension is
+        added to ``file_path``.
+    compression_level : Optional[int], optional
+        The compression level, by default the format's default.
+
+    Returns
+    -------
+    bool
+        True if every result was saved, False if saving failed and the error was
+        logged.
     """
+    file_path = compressed_path(file_path, compression)
     try:
-        with open(file_path, "w", encoding="utf-8") as outfile:
-            json.dump(data, outfile, indent=4)
+        with open_output(file_path, compression, compression_level) as outfile:
+            outfile.write("[")
+            separator = "\n"
+            for record in data:
+                outfile.write(separator)
+                outfile.write(
+                    textwrap.indent(
+                        json.dumps(record, indent=4, default=_encode_value), " " * 4
+                    )
+                )
+                separator = ",\n"
+            outfile.write("]" if separator == "\n" else "\n]")
         logger.info(f"Analysis results saved to {file_path}")
-    except IOError as e:
+        return True
+    except (IOError, WorkflowAnalyzerError) as e:
         logger.error(f"Failed to save analysis results to JSON: {e}")
+        return False
 
 
-def save_to_csv(data: List[Dict[str, Any]], file_path: str):
+def save_to_jsonl(
+    data: Iterable[Dict[str, Any]],
+    file_path: str,
+    compression: Optional[str] = None,
+    compression_level: Optional[int] = None,
+) -> bool:
     """
-    Saves the analysis results to a CSV file.
+    Saves the analysis results to a JSON Lines file, one compact record per line.
+
+    Records are encoded and written as they are produced, so ``data`` may be a
+    generator and is never held in memory as a whole. Timestamps are written as
+    ISO 8601 strings.
 
     Parameters
     ----------
-    data : List[Dict[str, Any]]
+    data : Iterable[Dict[str, Any]]
         The analysis results to save.
     file_path : str
         The file path where the results should be saved.
+    compression : Optional[str], optional
+        The compression format, "gzip" or "zstd", by default None. Its extension is
+        added to ``file_path``.
+    compression_level : Optional[int], optional
+        The compression level, by default the format's default.
+
+    Returns
+    -------
+    bool
+        True if every result was saved, False if saving failed and the error was
+        logged.
     """
+    encode = _JSONL_ENCODER.encode
+    file_path = compressed_path(file_path, compression)
     try:
-        if data:
-            keys = data[0].keys()
-            with open(file_path, "w", encoding="utf-8", newline="") as output_file:
-                dict_writer = csv.DictWriter(output_file, fieldnames=keys)
-                dict_writer.writeheader()
-                dict_writer.writerows(data)
-            logger.info(f"Analysis results saved to {file_path}")
-        else:
+        with open_output(
+            file_path, compression, compression_level, buffering=1024 * 1024
+        ) as outfile:
+            for record in data:
+                outfile.write(encode(record))
+                outfile.write("\n")
+        logger.info(f"Analysis results saved to {file_path}")
+        return True
+    except (IOError, WorkflowAnalyzerError) as e:
+        logger.error(f"Failed to save analysis results to JSON Lines: {e}")
+        return False
+
+
+class _CountingWriter:
+    """
+    Forwards writes to a text file, counting the UTF-8 bytes written.
+    """
+
+    def __init__(self, file: IO[str]):
+        self.file = file
+        self.size = 0
+
+    def write(self, text: str) -> int:
+        """
+        Writes text to the file and adds its encoded size to ``size``.
+
+        Parameters
+        ----------
+        text : str
+            The text to write.
+
+        Returns
+        -------
+        int
+            The number of characters written.
+        """
+        self.size += len(text) if text.isascii() else len(text.encode("utf-8"))
+        return self.file.write(text)
+
+
+def _csv_value(value: Any) -> Any:
+    """
+    Flattens a step record value into a CSV field.
+
+    Parameters
+    ----------
+    value : Any
+        The value of a step record field.
+
+    Returns
+    -------
+    Any
+        An empty string for None, compact JSON for lists, sets and dicts, ISO 8601
+        for dates and datetimes, and the value itself otherwise.
+    """
+    if value is None:
+        return ""
+    if isinstance(value, (list, tuple, set, frozenset, dict)):
+        return _JSONL_ENCODER.encode(value)
+    if isinstance(value, (datetime.datetime, datetime.date)):
+        return value.isoformat()
+    return value
+
+
+def shard_path(file_path: str, index: int) -> str:
+    """
+    Builds the path of a numbered output shard.
+
+    Parameters
+    ----------
+    file_path : str
+        The requested output path, such as "results.csv".
+    index : int
+        The number of the shard, starting at 0.
+
+    Returns
+    -------
+    str
+        The path with the shard number before its extension, such as
+        "results-00000.csv".
+    """
+    root, extension = os.path.splitext(file_path)
+    return f"{root}-{index:05d}{extension}"
+
+
+def save_to_csv(  # pylint: disable=too-many-arguments
+    data: Iterable[Dict[str, Any]],
+    file_path: str,
+    *,
+    max_shard_bytes: Optional[int] = None,
+    fieldnames: Sequence[str] = STEP_RECORD_FIELDS,
+    compression: Optional[str] = None,
+    compression_level: Optional[int] = None,
+) -> bool:
+    """
+    Saves the analysis results to CSV files with a fixed header.
+
+    Rows are written one at a time as they are produced, so ``data`` may be a
+    generator and is never held in memory as a whole. Every file has the columns
+    ``fieldnames``, in that order, whatever the fields of the records. Missing
+    values are left empty, lists and dicts such as ``affected_tables`` and
+    ``execution_parameters`` are written as compact JSON, and timestamps in ISO 8601,
+    so the files load as they are with standard bulk loaders.
+
+    Parameters
+    ----------
+    data : Iterable[Dict[str, Any]]
+        The analysis results to save.
+    file_path : str
+        The file path where the results should be saved.
+    max_shard_bytes : Optional[int], optional
+        The approximate uncompressed size, in bytes, after which the rows
+        continue in a new file with its own header, by default None (a single file).
+        Shards are named after ``file_path`` with a five-digit number before the
+        extension, such as "results-00000.csv".
+    fieldnames : Sequence[str], optional
+        The columns of the files, by default ``STEP_RECORD_FIELDS``.
+    compression : Optional[str], optional
+        The compression format, "gzip" or "zstd", by default None. Its extension is
+        added to the path of every file.
+    compression_level : Optional[int], optional
+        The compression level, by default the format's default.
+
+    Returns
+    -------
+    bool
+        True if every result was saved, False if saving failed and the error was
+        logged.
+    """
+    if compression is not None and file_path.endswith(COMPRESSIONS[compression]):
+        file_path = file_path[: -len(COMPRESSIONS[compression])]
+
+    def open_shard(stack: contextlib.ExitStack, index: int) -> _CountingWriter:
+        shard = shard_path(file_path, index) if max_shard_bytes else file_path
+        counter = _CountingWriter(
+            stack.enter_context(
+                open_output(
+                    compressed_path(shard, compression),
+                    compression,
+                    compression_level,
+                    newline="",
+                )
+            )
+        )
+        csv.writer(counter).writerow(fieldnames)
+        return counter
+
+    try:
+        records = iter(data)
+        record = next(records, None)
+        if record is None:
             logger.warning("No data to save to CSV.")
-    except IOError as e:
+            return True
+        with contextlib.ExitStack() as stack:
+            counter = open_shard(stack, 0)
+            writer = csv.writer(counter)
+            shards = 1
+            for record in itertools.chain([record], records):
+                if max_shard_bytes and counter.size >= max_shard_bytes:
+                    stack.close()
+                    counter = open_shard(stack, shards)
+                    writer = csv.writer(counter)
+                    shards += 1
+                writer.writerow([_csv_value(record.get(name)) for name in fieldnames])
+        in_shards = f" in {shards} shards" if max_shard_bytes else ""
+        logger.info(
+            f"Analysis results saved to {compressed_path(file_path, compression)}{in_shards}"
+        )
+        return True
+    except (IOError, WorkflowAnalyzerError) as e:
         logger.error(f"Failed to save analysis results to CSV: {e}")
+        return False
+
+
+def save_to_sqlite(data: Iterable[Dict[str, Any]], file_path: str) -> bool:
+    """
+    Saves the analysis results to a SQLite result store, updating the steps already stored.
+
+    Records are written in batches as they are produced, so ``data`` may be a
+    generator and is never held in memory as a whole. The store can then be queried
+    with ``gwfa query``.
+
+    Parameters
+    ----------
+    data : Iterable[Dict[str, Any]]
+        The analysis results to save.
+    file_path : str
+        The path of the SQLite database, created if missing.
+
+    Returns
+    -------
+    bool
+        True if every result was saved, False if saving failed and the error was
+        logged.
+    """
+    try:
+        store = ResultStore(file_path)
+        try:
+            count = store.upsert(data)
+        finally:
+            store.close()
+        logger.info(f"{count} analysis results saved to {file_path}")
+        return True
+    except WorkflowAnalyzerError as e:
+        logger.error(f"Failed to save analysis results to SQLite: {e}")
+        return False
+
+
+def _import_pyarrow():
+    """
+    Imports pyarrow, which is only needed for Parquet output.
+
+    Returns
+    -------
+    Tuple[module, module]
+        The ``pyarrow`` and ``pyarrow.parquet`` modules.
+
+    Raises
+    ------
+    WorkflowAnalyzerError
+        If pyarrow is not installed.
+    """
+    try:
+        import pyarrow  # pylint: disable=import-outside-toplevel
+        import pyarrow.parquet  # pylint: disable=import-outside-toplevel
+    except ImportError as e:
+        raise WorkflowAnalyzerError(
+            "Parquet output requires pyarrow: pip install aws-glue-workflow-analyzer[parquet]"
+        ) from e
+    return pyarrow, pyarrow.parquet
+
+
+def parquet_schema():
+    """
+    Builds the fixed Arrow schema of step records written to Parquet.
+
+    Returns
+    -------
+    pyarrow.Schema
+        The schema, with timestamps in UTC, the duration in seconds, the failure
+        categories and affected tables as lists of strings and the execution parameters as a string map.
+
+    Raises
+    ------
+    WorkflowAnalyzerError
+        If pyarrow is not installed.
+    """
+    pa, _ = _import_pyarrow()
+    types = {
+        "execution_start_timestamp": pa.timestamp("us", tz="UTC"),
+        "execution_end_timestamp": pa.timestamp("us", tz="UTC"),
+        "execution_duration": pa.float64(),
+        "failure_categories": pa.list_(pa.string()),
+        "affected_tables": pa.list_(pa.string()),
+        "execution_parameters": pa.map_(pa.string(), pa.string()),
+    }
+    return pa.schema(
+        [
+            pa.field(name, types.get(name, pa.string()), nullable=True)
+            for name in STEP_RECORD_FIELDS
+        ]
+    )
+
+
+def _as_utc(value: Any) -> Optional[datetime.datetime]:
+    if not isinstance(value, datetime.datetime):
+        return None
+    return value.astimezone(datetime.timezone.utc)
+
+
+def _parquet_value(name: str, value: Any) -> Any:
+    if name in ("execution_start_timestamp", "execution_end_timestamp"):
+        return _as_utc(value)
+    if name in ("failure_categories", "affected_tables"):
+        return [str(item) for item in value or ()]
+    if name == "execution_parameters":
+        return [(str(key), str(item)) for key, item in (value or {}).items()]
+    if name == "execution_duration":
+        return None if value is None else float(value)
+    return None if value is None else str(value)
+
+
+def save_to_parquet(
+    data: Iterable[Dict[str, Any]],
+    file_path: str,
+    row_group_size: int = 100000,
+    compression: Optional[str] = None,
+    compression_level: Optional[int] = None,
+) -> bool:
+    """
+    Saves the analysis results to a Parquet file with a fixed, typed schema.
+
+    Records are buffered column by column and flushed as a row group every
+    ``row_group_size`` records, so memory use is bounded by the row group size
+    rather than by the number of records. Requires the optional pyarrow dependency.
+
+    Parameters
+    ----------
+    data : Iterable[Dict[str, Any]]
+        The analysis results to save.
+    file_path : str
+        The file path where the results should be saved.
+    row_group_size : int, optional
+        The number of records per row group, by default 100000.
+    compression : Optional[str], optional
+        The Parquet compression codec of the columns, "gzip" or "zstd", by default
+        None (snappy). Parquet files are compressed internally, so ``file_path`` is
+        kept as it is.
+    compression_level : Optional[int], optional
+        The compression level, by default the codec's default. A level requires
+        ``compression``, since snappy has no levels.
+
+    Returns
+    -------
+    bool
+        True if every result was saved, False if saving failed and the error was
+        logged.
+    """
+    try:
+        check_compression_level(compression, compression_level)
+        pa, pq = _import_pyarrow()
+        schema = parquet_schema()
+        columns: Dict[str, List[Any]] = {name: [] for name in STEP_RECORD_FIELDS}
+        count = 0
+        with pq.ParquetWriter(
+            file_path,
+            schema,
+            compression=compression or "snappy",
+            compression_level=compression_level,
+        ) as writer:
+            for record in data:
+                for name, values in columns.items():
+                    values.append(_parquet_value(name, record.get(name)))
+                count += 1
+                if count % row_group_size == 0:
+                    writer.write_table(
+                        pa.Table.from_pydict(columns, schema=schema),
+                        row_group_size=row_group_size,
+                    )
+                    columns = {name: [] for name in STEP_RECORD_FIELDS}
+            if count % row_group_size or not count:
+                writer.write_table(
+                    pa.Table.from_pydict(columns, schema=schema),
+                    row_group_size=row_group_size,
+                )
+        logger.info(f"Analysis results saved to {file_path}")
+        return True
+    except (IOError, WorkflowAnalyzerError) as e:
+        logger.error(f"Failed to save analysis results to Parquet: {e}")
+        return False
@@ -1,4 +1,4 @@
-from typing import Any, Callable, Dict, List
+from typing import Any, Callable, Dict, Iterator, List, Optional
 
 
 def paginate_boto3(
@@ -21,14 +21,67 @@ def paginate_boto3(
     List[Dict[str, Any]]
         A list of all items returned by the paginated API call.
     """
-    all_items = []
+    return list(iter_paginate_boto3(callable_func, dict_key, **kwargs))
+
+
+def iter_paginate_boto3(  # pylint: disable=too-many-arguments
+    callable_func: Callable[..., Dict[str, Any]],
+    dict_key: str,
+    *,
+    stop_when: Optional[Callable[[Dict[str, Any]], bool]] = None,
+    max_items: Optional[int] = None,
+    input_token: str = "NextToken",
+    output_token: str = "NextToken",
+    **kwargs,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Lazily yields the items of a paginated Boto3 API call, requesting pages only as they are consumed.
+
+    Pagination stops as soon as the caller stops iterating, ``stop_when`` returns True
+    for an item or ``max_items`` items have been yielded, so no further pages are
+    requested once the caller has what it needs.
+
+    Parameters
+    ----------
+    callable_func : Callable[..., Dict[str, Any]]
+        The function to call, typically a Boto3 client method that returns paginated results.
+    dict_key : str
+        The key in the response dictionary that contains the list of items to return.
+    stop_when : Optional[Callable[[Dict[str, Any]], bool]], optional
+        A predicate called on each item. When it returns True, pagination stops and the
+        item is not yielded. By default, pagination continues until the last page.
+    max_items : Optional[int], optional
+        The maximum number of items to yield, by default unlimited.
+    input_token : str, optional
+        The request parameter carrying the pagination token, by default "NextToken".
+    output_token : str, optional
+        The response key holding the token of the next page, by default "NextToken".
+        Pagination ends when it is missing or equal to the token just sent, as with
+        the forward tokens of CloudWatch Logs ``get_log_events``.
+    kwargs : dict
+        The parameters to pass to the callable function.
+
+    Yields
+    ------
+    Dict[str, Any]
+        Each item returned by the paginated API call.
+    """
+    if max_items is not None and max_items <= 0:
+        return
+    yielded = 0
     next_token = None
     while True:
         if next_token:
-            kwargs["NextToken"] = next_token
+            kwargs[input_token] = next_token
         response = callable_func(**kwargs)
-        all_items.extend(response.get(dict_key, []))
-        next_token = response.get("NextToken")
-        if not next_token:
+        for item in response.get(dict_key, []):
+            if stop_when is not None and stop_when(item):
+                return
+            yield item
+            yielded += 1
+            if max_items is not None and yielded >= max_items:
+                return
+        token = response.get(output_token)
+        if not token or token == next_token:
             break
-    return all_items
+        next_token = token
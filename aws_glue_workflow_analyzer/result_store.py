@@ -0,0 +1,317 @@
+import datetime
+import json
+import pathlib
+import sqlite3
+from itertools import islice
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from aws_glue_workflow_analyzer.constants import FAILURE_STATUSES
+from aws_glue_workflow_analyzer.exceptions import WorkflowAnalyzerError
+
+# The columns results can be grouped by, mapped to their SQL expressions.
+GROUP_BY_COLUMNS = {
+    "workflow": "workflow_name",
+    "node": "node_id",
+    "node_name": "node_name",
+    "status": "execution_status",
+    "day": "substr(execution_start_timestamp, 1, 10)",
+}
+
+_TABLE = """
+CREATE TABLE IF NOT EXISTS step_runs (
+    execution_id TEXT NOT NULL,
+    node_id TEXT NOT NULL,
+    workflow_name TEXT NOT NULL,
+    node_type TEXT,
+    node_name TEXT,
+    execution_status TEXT,
+    execution_start_timestamp TEXT,
+    execution_end_timestamp TEXT,
+    execution_duration REAL,
+    error_message TEXT,
+    failure_categories TEXT,
+    affected_tables TEXT,
+    log_group_name TEXT,
+    log_stream_name TEXT,
+    execution_parameters TEXT,
+    PRIMARY KEY (execution_id, node_id)
+);
+"""
+
+_INDEXES = """
+CREATE INDEX IF NOT EXISTS step_runs_workflow
+    ON step_runs (workflow_name, execution_start_timestamp);
+CREATE INDEX IF NOT EXISTS step_runs_node
+    ON step_runs (node_id, execution_start_timestamp);
+CREATE INDEX IF NOT EXISTS step_runs_node_name
+    ON step_runs (node_name, execution_start_timestamp);
+CREATE INDEX IF NOT EXISTS step_runs_status
+    ON step_runs (execution_status, execution_start_timestamp);
+CREATE INDEX IF NOT EXISTS step_runs_started
+    ON step_runs (execution_start_timestamp);
+"""
+
+_COLUMNS = (
+    "execution_id",
+    "node_id",
+    "workflow_name",
+    "node_type",
+    "node_name",
+    "execution_status",
+    "execution_start_timestamp",
+    "execution_end_timestamp",
+    "execution_duration",
+    "error_message",
+    "failure_categories",
+    "affected_tables",
+    "log_group_name",
+    "log_stream_name",
+    "execution_parameters",
+)
+
+
+def _to_timestamp(value: Any) -> Optional[str]:
+    """
+    Converts a step timestamp to an ISO 8601 string in UTC, which sorts chronologically.
+
+    Parameters
+    ----------
+    value : Any
+        The timestamp, a naive datetime being assumed to be in local time.
+
+    Returns
+    -------
+    Optional[str]
+        The timestamp in UTC, or None if the step has no timestamp.
+    """
+    if not value:
+        return None
+    if isinstance(value, datetime.datetime):
+        return value.astimezone(datetime.timezone.utc).isoformat()
+    return str(value)
+
+
+class ResultStore:
+    """
+    A local SQLite store of step execution details, queried without calling AWS.
+
+    Steps are keyed by run and node, so analyzing overlapping periods updates the
+    steps already stored instead of duplicating them. The store is indexed by
+    workflow, node, status and start time for the aggregate queries of ``gwfa query``.
+    """
+
+    def __init__(self, path: str, batch_size: int = 1000, read_only: bool = False):
+        """
+        Parameters
+        ----------
+        path : str
+            The path of the SQLite database, created if missing.
+        batch_size : int, optional
+            The number of steps written per transaction, by default 1000.
+        read_only : bool, optional
+            Whether to open an existing database for queries only, by default False.
+
+        Raises
+        ------
+        WorkflowAnalyzerError
+            If the database cannot be opened.
+        """
+        self.path = path
+        self.batch_size = batch_size
+        try:
+            if read_only:
+                uri = f"{pathlib.Path(path).absolute().as_uri()}?mode=ro"
+                self._connection = sqlite3.connect(uri, uri=True)
+                return
+            self._connection = sqlite3.connect(path)
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.executescript(_TABLE)
+            self._add_missing_columns()
+            self._connection.executescript(_INDEXES)
+            self._connection.commit()
+        except sqlite3.Error as e:
+            raise WorkflowAnalyzerError(
+                f"Failed to open the result store {path}: {e}"
+            ) from e
+
+    def upsert(self, records: Iterable[Dict[str, Any]]) -> int:
+        """
+        Inserts step execution details, replacing the steps already stored.
+
+        Records are consumed in batches, so ``records`` may be a generator and is
+        never held in memory as a whole.
+
+        Parameters
+        ----------
+        records : Iterable[Dict[str, Any]]
+            The step execution details to store.
+
+        Returns
+        -------
+        int
+            The number of steps written.
+
+        Raises
+        ------
+        WorkflowAnalyzerError
+            If the steps cannot be written.
+        """
+        statement = (
+            f"INSERT OR REPLACE INTO step_runs ({', '.join(_COLUMNS)}) "
+            f"VALUES ({', '.join('?' for _ in _COLUMNS)})"
+        )
+        records = iter(records)
+        count = 0
+        while True:
+            rows = [self._to_row(record) for record in islice(records, self.batch_size)]
+            if not rows:
+                return count
+            try:
+                with self._connection:
+                    self._connection.executemany(statement, rows)
+            except sqlite3.Error as e:
+                raise WorkflowAnalyzerError(
+                    f"Failed to write to the result store {self.path}: {e}"
+                ) from e
+            count += len(rows)
+
+    def aggregate(  # pylint: disable=too-many-arguments
+        self,
+        group_by: Sequence[str] = ("workflow", "node"),
+        *,
+        workflow_name: Optional[str] = None,
+        node: Optional[str] = None,
+        status: Optional[str] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+    ) -> Tuple[List[str], List[Tuple[Any, ...]]]:
+        """
+        Counts the stored steps and their failures.
+
+        Parameters
+        ----------
+        group_by : Sequence[str], optional
+            The keys of ``GROUP_BY_COLUMNS`` to group the steps by, by default the
+            workflow and the node.
+        workflow_name : Optional[str], optional
+            Only count the steps of this workflow, by default None.
+        node : Optional[str], optional
+            Only count the steps whose node ID or name is this, by default None.
+        status : Optional[str], optional
+            Only count the steps with this status, by default None.
+        since : Optional[str], optional
+            Only count the steps started at or after this ISO 8601 date or time in
+            UTC, by default None.
+        until : Optional[str], optional
+            Only count the steps started before this ISO 8601 date or time in UTC, by
+            default None.
+
+        Returns
+        -------
+        Tuple[List[str], List[Tuple[Any, ...]]]
+            The column names and the rows, most failing groups first.
+
+        Raises
+        ------
+        WorkflowAnalyzerError
+            If a grouping is unknown or the query fails.
+        """
+        unknown = [key for key in group_by if key not in GROUP_BY_COLUMNS]
+        if unknown:
+            raise WorkflowAnalyzerError(f"Unknown grouping: {', '.join(unknown)}")
+        conditions: List[str] = []
+        parameters: List[Any] = []
+        for condition, values in (
+            ("workflow_name = ?", [workflow_name]),
+            ("(node_id = ? OR node_name = ?)", [node, node]),
+            ("execution_status = ?", [status]),
+            ("execution_start_timestamp >= ?", [since]),
+            ("execution_start_timestamp < ?", [until]),
+        ):
+            if values[0] is not None:
+                conditions.append(condition)
+                parameters.extend(values)
+        failure_statuses = ", ".join(f"'{value}'" for value in FAILURE_STATUSES)
+        columns = [f"{GROUP_BY_COLUMNS[key]} AS {key}" for key in group_by] + [
+            "COUNT(*) AS runs",
+            f"SUM(execution_status IN ({failure_statuses})) AS failures",
+            "ROUND(AVG(execution_duration), 1) AS avg_duration",
+            "MAX(execution_start_timestamp) AS last_started",
+        ]
+        query = f"SELECT {', '.join(columns)} FROM step_runs"
+        if conditions:
+            query += f" WHERE {' AND '.join(conditions)}"
+        if group_by:
+            query += f" GROUP BY {', '.join(GROUP_BY_COLUMNS[key] for key in group_by)}"
+        query += " ORDER BY failures DESC, runs DESC"
+        return self.execute(query, parameters)
+
+    def execute(
+        self, query: str, parameters: Sequence[Any] = ()
+    ) -> Tuple[List[str], List[Tuple[Any, ...]]]:
+        """
+        Runs an SQL query against the stored steps.
+
+        Parameters
+        ----------
+        query : str
+            The SQL query, reading the ``step_runs`` table.
+        parameters : Sequence[Any], optional
+            The values of the query's placeholders, by default none.
+
+        Returns
+        -------
+        Tuple[List[str], List[Tuple[Any, ...]]]
+            The column names and the rows.
+
+        Raises
+        ------
+        WorkflowAnalyzerError
+            If the query fails.
+        """
+        try:
+            cursor = self._connection.execute(query, parameters)
+            rows = cursor.fetchall()
+        except sqlite3.Error as e:
+            raise WorkflowAnalyzerError(f"Failed to query the result store: {e}") from e
+        columns = [column[0] for column in cursor.description or ()]
+        return columns, rows
+
+    def close(self):
+        """
+        Closes the result store.
+        """
+        self._connection.close()
+
+    def _add_missing_columns(self):
+        """
+        Adds the columns introduced since a store was created, so older stores stay usable.
+        """
+        existing = {
+            row[1] for row in self._connection.execute("PRAGMA table_info(step_runs)")
+        }
+        for column in _COLUMNS:
+            if column not in existing:
+                self._connection.execute(
+                    f"ALTER TABLE step_runs ADD COLUMN {column} TEXT"
+                )
+
+    @staticmethod
+    def _to_row(record: Dict[str, Any]) -> Tuple[Any, ...]:
+        return (
+            record["execution_id"],
+            record["node_id"],
+            record["workflow_name"],
+            record.get("node_type"),
+            record.get("node_name"),
+            record.get("execution_status"),
+            _to_timestamp(record.get("execution_start_timestamp")),
+            _to_timestamp(record.get("execution_end_timestamp")),
+            record.get("execution_duration"),
+            record.get("error_message"),
+            json.dumps(record.get("failure_categories") or []),
+            json.dumps(record.get("affected_tables") or []),
+            record.get("log_group_name"),
+            record.get("log_stream_name"),
+            json.dumps(record.get("execution_parameters") or {}, default=str),
+        )
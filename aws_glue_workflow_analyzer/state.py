@@ -0,0 +1,239 @@
+import datetime
+import json
+import os
+import threading
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional
+
+from aws_glue_workflow_analyzer.disk_cache import DiskCache
+from aws_glue_workflow_analyzer.exceptions import WorkflowAnalyzerError
+from aws_glue_workflow_analyzer.logger import logger
+
+
+def as_aware(timestamp: datetime.datetime) -> datetime.datetime:
+    """
+    Returns the timestamp as a timezone-aware datetime, assuming local time if it is naive.
+
+    Parameters
+    ----------
+    timestamp : datetime.datetime
+        The timestamp to convert.
+
+    Returns
+    -------
+    datetime.datetime
+        The timezone-aware timestamp.
+    """
+    return timestamp if timestamp.tzinfo else timestamp.astimezone()
+
+
+class HighWaterMark(NamedTuple):
+    """
+    The newest run of a workflow analyzed by a previous invocation.
+
+    Attributes
+    ----------
+    run_id : str
+        The ID of the newest analyzed run.
+    started_on : datetime.datetime
+        The start time of the newest analyzed run.
+    running : Optional[Dict[str, datetime.datetime]]
+        The start times of the analyzed runs that had not finished yet, by run ID, or
+        None if every analyzed run had finished.
+    """
+
+    run_id: str
+    started_on: datetime.datetime
+    running: Optional[Dict[str, datetime.datetime]] = None
+
+    @property
+    def floor(self) -> datetime.datetime:
+        """
+        The start time before which no run needs to be analyzed again.
+
+        Returns
+        -------
+        datetime.datetime
+            The start time of the oldest unfinished run, or of the newest run if every
+            analyzed run had finished.
+        """
+        return min([self.started_on, *(self.running or {}).values()])
+
+    def is_new(self, run: Dict[str, Any]) -> bool:
+        """
+        Determines whether a run must be analyzed.
+
+        Parameters
+        ----------
+        run : Dict[str, Any]
+            The workflow run, with its "RunId" and "StartedOn".
+
+        Returns
+        -------
+        bool
+            True if the run started after the mark or had not finished when analyzed.
+        """
+        if run["RunId"] in (self.running or {}):
+            return True
+        started_on = as_aware(run["StartedOn"])
+        return started_on > self.started_on or (
+            started_on == self.started_on and run["RunId"] != self.run_id
+        )
+
+
+class IncrementalState:
+    """
+    The high-water marks of incremental analyses, persisted in a JSON state file.
+
+    Each workflow's mark records its newest analyzed run and the runs that were still
+    running, so later invocations only analyze runs started since then and the runs
+    that had not finished. Runs whose steps were all analyzed are staged with
+    ``stage`` and only move the marks when ``commit`` is called, once their results
+    are safely written, so a failed invocation analyzes the same runs again.
+    """
+
+    def __init__(self, path: str):
+        """
+        Parameters
+        ----------
+        path : str
+            The path of the state file, which need not exist yet.
+
+        Raises
+        ------
+        WorkflowAnalyzerError
+            If the state file cannot be read.
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._marks: Dict[str, HighWaterMark] = {}
+        self._staged: Dict[str, List[Dict[str, Any]]] = {}
+        if not os.path.exists(path):
+            return
+        try:
+            with open(path, "r", encoding="utf-8") as file:
+                state = json.load(file)
+            for workflow_name, mark in state["workflows"].items():
+                self._marks[workflow_name] = HighWaterMark(
+                    mark["RunId"],
+                    datetime.datetime.fromisoformat(mark["StartedOn"]),
+                    {
+                        run_id: datetime.datetime.fromisoformat(started_on)
+                        for run_id, started_on in mark.get("Running", {}).items()
+                    },
+                )
+        except (OSError, ValueError, KeyError, TypeError, AttributeError) as e:
+            raise WorkflowAnalyzerError(
+                f"Failed to read the state file {path}: {e}"
+            ) from e
+
+    def get_mark(self, workflow_name: str) -> Optional[HighWaterMark]:
+        """
+        Retrieves the high-water mark of a workflow.
+
+        Parameters
+        ----------
+        workflow_name : str
+            The name of the Glue workflow.
+
+        Returns
+        -------
+        Optional[HighWaterMark]
+            The mark, or None if the workflow was never analyzed incrementally.
+        """
+        with self._lock:
+            return self._marks.get(workflow_name)
+
+    def advance(self, workflow_name: str, runs: Iterable[Dict[str, Any]]):
+        """
+        Moves the high-water mark of a workflow past the given analyzed runs.
+
+        Parameters
+        ----------
+        workflow_name : str
+            The name of the Glue workflow.
+        runs : Iterable[Dict[str, Any]]
+            Every run analyzed for the workflow, with its "RunId", "StartedOn" and
+            "Status".
+        """
+        with self._lock:
+            mark = self._marks.get(workflow_name)
+            newest = (mark.run_id, mark.started_on) if mark else None
+            running = {}
+            for run in runs:
+                started_on = as_aware(run["StartedOn"])
+                if newest is None or started_on > newest[1]:
+                    newest = (run["RunId"], started_on)
+                if not DiskCache.is_completed(run):
+                    running[run["RunId"]] = started_on
+            if newest is None:
+                return
+            self._marks[workflow_name] = HighWaterMark(*newest, running)
+        logger.debug(
+            f"High-water mark of '{workflow_name}' is run '{newest[0]}' started on {newest[1]}, "
+            f"{len(running)} runs still running."
+        )
+
+    def stage(self, workflow_name: str, runs: Iterable[Dict[str, Any]]):
+        """
+        Records runs whose steps were all analyzed, to move the marks past once committed.
+
+        Parameters
+        ----------
+        workflow_name : str
+            The name of the Glue workflow.
+        runs : Iterable[Dict[str, Any]]
+            The analyzed runs, with their "RunId", "StartedOn" and "Status".
+        """
+        with self._lock:
+            self._staged.setdefault(workflow_name, []).extend(runs)
+
+    def commit(self):
+        """
+        Moves the high-water marks past the staged runs and writes the state file.
+
+        Raises
+        ------
+        WorkflowAnalyzerError
+            If the state file cannot be written.
+        """
+        with self._lock:
+            staged, self._staged = self._staged, {}
+        for workflow_name, runs in staged.items():
+            self.advance(workflow_name, runs)
+        self.save()
+
+    def save(self):
+        """
+        Writes the high-water marks to the state file, replacing it atomically.
+
+        Raises
+        ------
+        WorkflowAnalyzerError
+            If the state file cannot be written.
+        """
+        with self._lock:
+            state = {
+                "workflows": {
+                    workflow_name: {
+                        "RunId": mark.run_id,
+                        "StartedOn": mark.started_on.isoformat(),
+                        "Running": {
+                            run_id: started_on.isoformat()
+                            for run_id, started_on in (mark.running or {}).items()
+                        },
+                    }
+                    for workflow_name, mark in self._marks.items()
+                }
+            }
+        temporary_path = f"{self.path}.tmp"
+        try:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(temporary_path, "w", encoding="utf-8") as file:
+                json.dump(state, file, indent=4)
+            os.replace(temporary_path, self.path)
+        except OSError as e:
+            raise WorkflowAnalyzerError(
+                f"Failed to write the state file {self.path}: {e}"
+            ) from e
@@ -0,0 +1,81 @@
+"""
+Benchmarks the output writers on synthetic step records.
+
+Compares the indented JSON array writer with the JSON Lines writer, which encodes
+each record on a single line with a pre-built encoder, and with the fixed-schema CSV
+writer. Records are produced by a generator, as they are by the analyzer, and carry
+the datetime timestamps, table lists and parameter dicts of real step records.
+
+Usage::
+
+    python benchmarks/bench_output.py --records 200000
+"""
+
+import argparse
+import datetime
+import os
+import random
+import tempfile
+import time
+from typing import Any, Callable, Dict, Iterator
+
+from aws_glue_workflow_analyzer.logger import logger
+from aws_glue_workflow_analyzer.output import save_to_csv, save_to_json, save_to_jsonl
+
+
+def iter_records(count: int, seed: int = 0) -> Iterator[Dict[str, Any]]:
+    rng = random.Random(seed)
+    started_on = datetime.datetime(2024, 1, 1, tzinfo=datetime.timezone.utc)
+    for index in range(count):
+        start = started_on + datetime.timedelta(minutes=index)
+        duration = rng.uniform(10, 3600)
+        failed = rng.random() < 0.05
+        yield {
+            "execution_id": f"wr_{index // 20:012d}",
+            "workflow_name": f"workflow_{index % 7}",
+            "node_id": f"wnode_{index % 20:04d}",
+            "node_type": "Job" if index % 3 else "Crawler",
+            "node_name": f"load_table_{index % 20}",
+            "execution_status": "FAILED" if failed else "SUCCEEDED",
+            "execution_start_timestamp": start,
+            "execution_end_timestamp": start + datetime.timedelta(seconds=duration),
+            "execution_duration": duration,
+            "error_message": (
+                "py4j.protocol.Py4JJavaError: An error occurred while calling o123.save"
+                if failed
+                else None
+            ),
+            "failure_categories": ["error"] if failed else [],
+            "affected_tables": [f"analytics.table_{index % 20}", "analytics.events"],
+            "log_group_name": "/aws-glue/jobs/error",
+            "log_stream_name": f"jr_{index:016x}",
+            "execution_parameters": {"--day": "2024-01-01", "--env": "prod"},
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--records", type=int, default=200000)
+    args = parser.parse_args()
+    logger.disabled = True
+
+    candidates: Dict[str, Callable[[Iterator[Dict[str, Any]], str], None]] = {
+        "json (indented array)": save_to_json,
+        "jsonl (compact lines)": save_to_jsonl,
+        "csv (fixed schema)": save_to_csv,
+    }
+    with tempfile.TemporaryDirectory() as directory:
+        for name, save in candidates.items():
+            file_path = os.path.join(directory, "results")
+            started = time.perf_counter()
+            save(iter_records(args.records), file_path)
+            elapsed = time.perf_counter() - started
+            size_mb = os.path.getsize(file_path) / 1024 / 1024
+            print(
+                f"{name:<25} {elapsed:8.2f} s {args.records / elapsed:12,.0f} records/s"
+                f" {size_mb:8.1f} MB"
+            )
+
+
+if __name__ == "__main__":
+    main()
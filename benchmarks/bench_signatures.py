@@ -0,0 +1,110 @@
+"""
+Benchmarks failure-signature matching on a synthetic Glue job log.
+
+Compares the original per-line keyword loop with the compiled ``SignatureEngine``,
+both when checking for any failure and when reporting every match. The log is built
+by repeating a block of realistic messages, about one failure line per thousand, up
+to the requested size, so memory stays bounded even for a 1 GB log.
+
+Usage::
+
+    python benchmarks/bench_signatures.py --size-mb 1024
+"""
+
+import argparse
+import random
+import time
+from typing import Callable, Iterator, List
+
+from aws_glue_workflow_analyzer.analyzer.signatures import SignatureEngine
+
+KEYWORDS = ["error", "exception", "failed"]
+
+
+def make_block(size: int, seed: int = 0) -> List[str]:
+    rng = random.Random(seed)
+    templates = [
+        "INFO  [Executor task launch worker for task {n}] storage.BlockManager: Found block rdd_{n}_{m} locally",
+        "INFO  [dispatcher-event-loop-{m}] scheduler.TaskSetManager: Finished task {n}.0 in stage {m}.0 ({n} ms)",
+        "WARN  [main] glue.ProcessLauncher: Retrying request to s3://bucket/prefix/part-{n}.parquet",
+        "DEBUG [main] metastore.HiveMetaStore: get_table : db=analytics tbl=events_{m}",
+    ]
+    failures = [
+        "ERROR [main] glue.ProcessLauncher: Error from Python:Traceback (most recent call last)",
+        "py4j.protocol.Py4JJavaError: An Exception occurred while calling o{n}.save",
+        "Job run FAILED with exit code {m}",
+    ]
+    messages = []
+    total = 0
+    while total < size:
+        pool = failures if rng.random() < 0.001 else templates
+        message = rng.choice(pool).format(n=rng.randint(0, 99999), m=rng.randint(0, 99))
+        messages.append(message)
+        total += len(message) + 1
+    return messages
+
+
+def iter_log(block: List[str], repeats: int) -> Iterator[str]:
+    for _ in range(repeats):
+        yield from block
+
+
+def keyword_loop_any(messages: Iterator[str]) -> int:
+    hits = 0
+    for message in messages:
+        for line in message.splitlines():
+            if any(keyword in line for keyword in KEYWORDS):
+                hits += 1
+    return hits
+
+
+def engine_any(engine: SignatureEngine) -> Callable[[Iterator[str]], int]:
+    def run(messages: Iterator[str]) -> int:
+        hits = 0
+        for message in messages:
+            if engine.matches(message):
+                hits += sum(1 for line in message.splitlines() if engine.matches(line))
+        return hits
+
+    return run
+
+
+def engine_all_matches(engine: SignatureEngine) -> Callable[[Iterator[str]], int]:
+    def run(messages: Iterator[str]) -> int:
+        return sum(1 for message in messages for _ in engine.iter_matches(message))
+
+    return run
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--size-mb", type=int, default=1024)
+    parser.add_argument("--block-mb", type=int, default=8)
+    args = parser.parse_args()
+
+    block = make_block(args.block_mb * 1024 * 1024)
+    block_bytes = sum(len(message) + 1 for message in block)
+    repeats = max(1, args.size_mb * 1024 * 1024 // block_bytes)
+    size_mb = block_bytes * repeats / 1024 / 1024
+    engine = SignatureEngine()
+
+    candidates = [
+        ("keyword loop (case-sensitive, any)", keyword_loop_any),
+        ("signature engine (case-insensitive, any)", engine_any(engine)),
+        (
+            "signature engine (case-insensitive, all matches)",
+            engine_all_matches(engine),
+        ),
+    ]
+    print(f"Synthetic log: {size_mb:.0f} MB, {len(block) * repeats} messages")
+    for name, func in candidates:
+        started = time.perf_counter()
+        hits = func(iter_log(block, repeats))
+        elapsed = time.perf_counter() - started
+        print(
+            f"{name:<50} {elapsed:8.2f} s {size_mb / elapsed:8.1f} MB/s {hits:>10} hits"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,16 @@
+import asyncio
 import os
 from datetime import datetime
-from unittest.mock import MagicMock
+from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 from botocore.exceptions import ClientError
 
-from aws_glue_workflow_analyzer.analyzer.details_collector import StepDetailsCollector
+from aws_glue_workflow_analyzer.analyzer.details_collector import (
+    AsyncStepDetailsCollector,
+    StepDetailsCollector,
+)
+from aws_glue_workflow_analyzer.analyzer.enrichment import EnrichmentPolicy
 from aws_glue_workflow_analyzer.exceptions import APIRequestError
 from aws_glue_workflow_analyzer.logger import logger
 
@@ -188,3 +193,266 @@ def test_get_step_execution_details_no_end_time(step_details_collector):
         workflow_name, workflow_run, node
     )
     assert step_details["execution_duration"] is None
+
+
+def test_async_get_step_execution_details_matches_sync(
+    step_details_collector, error_context_retriever_mock, table_analyzer_mock
+):
+    workflow_name = "test_workflow"
+    workflow_run = {
+        "RunId": "test_run_id",
+        "StartedOn": datetime(2021, 6, 1, 12, 0, 0),
+        "CompletedOn": datetime(2021, 6, 1, 13, 0, 0),
+        "LogGroup": "test_log_group",
+        "LogStream": "test_log_stream",
+        "Graph": {},
+        "Arguments": {"param1": "value1"},
+    }
+    node = {
+        "Id": "test_node_id",
+        "Type": "Job",
+        "Name": "Test Node",
+        "Status": "FAILED",
+    }
+    error_context_retriever_mock.get_error_context.return_value = "error"
+    table_analyzer_mock.get_affected_tables.return_value = ["table1"]
+    async_error_context_retriever = AsyncMock()
+    async_error_context_retriever.get_error_context.return_value = "error"
+    async_table_analyzer = AsyncMock()
+    async_table_analyzer.get_affected_tables.return_value = ["table1"]
+    async_collector = AsyncStepDetailsCollector(
+        async_error_context_retriever, async_table_analyzer
+    )
+
+    step_details = asyncio.run(
+        async_collector.get_step_execution_details(workflow_name, workflow_run, node)
+    )
+
+    assert step_details == step_details_collector.get_step_execution_details(
+        workflow_name, workflow_run, node
+    )
+    async_error_context_retriever.get_error_context.assert_awaited_once_with(
+        "test_log_group",
+        "test_log_stream",
+        int(datetime(2021, 6, 1, 12, 0, 0).timestamp() * 1000),
+        int(datetime(2021, 6, 1, 13, 0, 0).timestamp() * 1000),
+    )
+
+
+def test_iter_step_details_yields_outcomes_in_order(
+    step_details_collector, error_context_retriever_mock, table_analyzer_mock
+):
+    workflow_run = {
+        "RunId": "test_run_id",
+        "StartedOn": datetime(2021, 6, 1, 12, 0, 0),
+        "CompletedOn": datetime(2021, 6, 1, 13, 0, 0),
+        "Graph": {},
+    }
+    nodes = [
+        {"Id": f"node{index}", "Type": "Job", "Name": f"job{index}"}
+        for index in range(4)
+    ]
+    table_analyzer_mock.get_affected_tables.side_effect = [
+        [],
+        ClientError({"Error": {}}, "GetJob"),
+        [],
+        [],
+    ]
+
+    outcomes = list(
+        step_details_collector.iter_step_details(
+            (("test_workflow", workflow_run, node) for node in nodes)
+        )
+    )
+
+    assert [outcome.item[2]["Id"] for outcome in outcomes] == [
+        node["Id"] for node in nodes
+    ]
+    assert isinstance(outcomes[1].error, APIRequestError)
+    assert [outcome.result["node_id"] for outcome in outcomes if outcome.result] == [
+        "node0",
+        "node2",
+        "node3",
+    ]
+
+
+@pytest.mark.parametrize("max_workers", [1, 8])
+def test_iter_step_details_fetches_run_logs_once(
+    step_details_collector, error_context_retriever_mock, max_workers
+):
+    workflow_runs = [
+        {
+            "RunId": f"run{run}",
+            "StartedOn": datetime(2021, 6, 1, 12, run, 0),
+            "CompletedOn": datetime(2021, 6, 1, 13, 0, 0),
+            "LogGroup": "test_log_group",
+            "LogStream": f"test_log_stream_{run}",
+            "Graph": {},
+        }
+        for run in range(2)
+    ]
+    nodes = [
+        {"Id": f"node{index}", "Type": "Job", "Name": f"job{index}"}
+        for index in range(25)
+    ]
+    error_context_retriever_mock.get_error_context.return_value = "error"
+
+    outcomes = list(
+        step_details_collector.iter_step_details(
+            (
+                ("test_workflow", workflow_run, node)
+                for workflow_run in workflow_runs
+                for node in nodes
+            ),
+            max_workers=max_workers,
+        )
+    )
+
+    assert all(outcome.result["error_message"] == "error" for outcome in outcomes)
+    assert error_context_retriever_mock.get_error_context.call_count == 2
+
+
+def test_async_get_step_execution_details_fetches_run_logs_once():
+    workflow_run = {
+        "RunId": "test_run_id",
+        "StartedOn": datetime(2021, 6, 1, 12, 0, 0),
+        "CompletedOn": datetime(2021, 6, 1, 13, 0, 0),
+        "LogGroup": "test_log_group",
+        "LogStream": "test_log_stream",
+        "Graph": {},
+    }
+    async_error_context_retriever = AsyncMock()
+    async_error_context_retriever.get_error_context.return_value = "error"
+    async_table_analyzer = AsyncMock()
+    async_table_analyzer.get_affected_tables.return_value = []
+    async_collector = AsyncStepDetailsCollector(
+        async_error_context_retriever, async_table_analyzer
+    )
+
+    async def collect():
+        return await asyncio.gather(
+            *(
+                async_collector.get_step_execution_details(
+                    "test_workflow",
+                    workflow_run,
+                    {"Id": f"node{index}", "Type": "Job", "Name": f"job{index}"},
+                )
+                for index in range(25)
+            )
+        )
+
+    step_details = asyncio.run(collect())
+
+    assert [details["error_message"] for details in step_details] == ["error"] * 25
+    async_error_context_retriever.get_error_context.assert_awaited_once()
+
+
+def test_get_step_execution_details_skips_healthy_steps(
+    step_details_collector, error_context_retriever_mock, table_analyzer_mock
+):
+    workflow_run = {
+        "RunId": "test_run_id",
+        "StartedOn": datetime(2021, 6, 1, 12, 0, 0),
+        "CompletedOn": datetime(2021, 6, 1, 13, 0, 0),
+        "LogGroup": "test_log_group",
+        "LogStream": "test_log_stream",
+        "Graph": {},
+    }
+    node = {
+        "Id": "test_node_id",
+        "Type": "Job",
+        "Name": "Test Node",
+        "JobDetails": {"JobRuns": [{"JobRunState": "SUCCEEDED"}]},
+    }
+
+    step_details = step_details_collector.get_step_execution_details(
+        "test_workflow", workflow_run, node
+    )
+    async_error_context_retriever = AsyncMock()
+    async_table_analyzer = AsyncMock()
+    async_step_details = asyncio.run(
+        AsyncStepDetailsCollector(
+            async_error_context_retriever, async_table_analyzer
+        ).get_step_execution_details("test_workflow", workflow_run, node)
+    )
+
+    assert step_details["execution_status"] == "SUCCEEDED"
+    assert step_details["error_message"] is None
+    assert step_details["affected_tables"] == []
+    assert step_details["execution_duration"] == 3600
+    assert async_step_details == step_details
+    error_context_retriever_mock.get_error_context.assert_not_called()
+    table_analyzer_mock.get_affected_tables.assert_not_called()
+    async_error_context_retriever.get_error_context.assert_not_awaited()
+    async_table_analyzer.get_affected_tables.assert_not_awaited()
+
+
+def test_get_step_execution_details_enrich_all(
+    error_context_retriever_mock, table_analyzer_mock
+):
+    step_details_collector = StepDetailsCollector(
+        error_context_retriever_mock,
+        table_analyzer_mock,
+        EnrichmentPolicy(enrich_all=True),
+    )
+    workflow_run = {
+        "RunId": "test_run_id",
+        "StartedOn": datetime(2021, 6, 1, 12, 0, 0),
+        "CompletedOn": datetime(2021, 6, 1, 13, 0, 0),
+        "LogGroup": "test_log_group",
+        "LogStream": "test_log_stream",
+        "Graph": {},
+    }
+    node = {
+        "Id": "test_node_id",
+        "Type": "Job",
+        "Name": "Test Node",
+        "Status": "SUCCEEDED",
+    }
+    error_context_retriever_mock.get_error_context.return_value = "warning"
+    table_analyzer_mock.get_affected_tables.return_value = ["table1"]
+
+    step_details = step_details_collector.get_step_execution_details(
+        "test_workflow", workflow_run, node
+    )
+
+    assert step_details["error_message"] == "warning"
+    assert step_details["affected_tables"] == ["table1"]
+
+
+@pytest.mark.parametrize(
+    "error_context, expected",
+    [
+        ("Job failed: java.lang.OutOfMemoryError", ["failed", "error"]),
+        ("No relevant error context found.", []),
+    ],
+)
+def test_get_step_execution_details_failure_categories(
+    step_details_collector,
+    error_context_retriever_mock,
+    table_analyzer_mock,
+    error_context,
+    expected,
+):
+    workflow_run = {
+        "RunId": "test_run_id",
+        "StartedOn": datetime(2021, 6, 1, 12, 0, 0),
+        "CompletedOn": datetime(2021, 6, 1, 13, 0, 0),
+        "LogGroup": "test_log_group",
+        "LogStream": "test_log_stream",
+        "Graph": {},
+    }
+    node = {
+        "Id": "test_node_id",
+        "Type": "Job",
+        "Name": "Test Node",
+        "Status": "FAILED",
+    }
+    error_context_retriever_mock.get_error_context.return_value = error_context
+    table_analyzer_mock.get_affected_tables.return_value = []
+
+    step_details = step_details_collector.get_step_execution_details(
+        "test_workflow", workflow_run, node
+    )
+
+    assert step_details["failure_categories"] == expected
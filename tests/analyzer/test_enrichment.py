@@ -0,0 +1,80 @@
+import pytest
+
+from aws_glue_workflow_analyzer.analyzer.enrichment import (
+    EnrichmentPolicy,
+    get_node_status,
+)
+
+
+@pytest.mark.parametrize(
+    "node, expected",
+    [
+        (
+            {"Status": "FAILED", "JobDetails": {"JobRuns": [{"JobRunState": "X"}]}},
+            "FAILED",
+        ),
+        (
+            {
+                "JobDetails": {
+                    "JobRuns": [{"JobRunState": "FAILED"}, {"JobRunState": "SUCCEEDED"}]
+                }
+            },
+            "SUCCEEDED",
+        ),
+        ({"CrawlerDetails": {"Crawls": [{"State": "CANCELLED"}]}}, "CANCELLED"),
+        ({"Type": "Trigger", "TriggerDetails": {}}, None),
+        ({"JobDetails": {"JobRuns": []}}, None),
+    ],
+)
+def test_get_node_status(node, expected):
+    assert get_node_status(node) == expected
+
+
+def test_should_enrich_failed_steps_only_by_default():
+    policy = EnrichmentPolicy()
+    workflow_run = {"Statistics": {"FailedActions": 1}}
+
+    assert policy.should_enrich(workflow_run, {"Status": "FAILED"})
+    assert policy.should_enrich(
+        workflow_run, {"JobDetails": {"JobRuns": [{"JobRunState": "TIMEOUT"}]}}
+    )
+    assert policy.should_enrich(
+        workflow_run, {"CrawlerDetails": {"Crawls": [{"State": "CANCELLED"}]}}
+    )
+    assert not policy.should_enrich(workflow_run, {"Status": "SUCCEEDED"})
+    assert not policy.should_enrich(workflow_run, {"Status": "RUNNING"})
+
+
+def test_should_enrich_steps_without_status_of_failed_runs():
+    policy = EnrichmentPolicy()
+    trigger = {"Type": "Trigger"}
+
+    assert policy.should_enrich({"Statistics": {"FailedActions": 1}}, trigger)
+    assert policy.should_enrich({}, trigger)
+    assert not policy.should_enrich(
+        {"Statistics": {"FailedActions": 0, "SucceededActions": 3}}, trigger
+    )
+
+
+def test_should_enrich_custom_statuses_and_all():
+    succeeded = {"Status": "SUCCEEDED"}
+
+    assert EnrichmentPolicy(["succeeded"]).should_enrich({}, succeeded)
+    assert not EnrichmentPolicy(["succeeded"]).should_enrich({}, {"Status": "FAILED"})
+    assert EnrichmentPolicy(enrich_all=True).should_enrich({}, succeeded)
+
+
+def test_enriches_run():
+    policy = EnrichmentPolicy()
+    healthy_run = {
+        "Statistics": {"FailedActions": 0},
+        "Graph": {"Nodes": [{"Status": "SUCCEEDED"}, {"Type": "Trigger"}]},
+    }
+    failed_run = {
+        "Statistics": {"FailedActions": 1},
+        "Graph": {"Nodes": [{"Status": "SUCCEEDED"}, {"Status": "FAILED"}]},
+    }
+
+    assert not policy.enriches_run(healthy_run)
+    assert policy.enriches_run(failed_run)
+    assert not policy.enriches_run({})
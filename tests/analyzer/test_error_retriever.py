@@ -128,3 +128,216 @@ def test_get_error_context_client_error(
             start_time=1622553000000,
             end_time=1622556600000,
         )
+
+
+def test_get_error_context_reads_past_first_page(
+    error_context_retriever, cloudwatch_logs_client
+):
+    now = datetime.now()
+    start = int((now - timedelta(minutes=10)).timestamp() * 1000)
+    messages = [f"informational message {index}" for index in range(1500)]
+    messages.append("job failed with an error")
+
+    cloudwatch_logs_client.put_log_events(
+        logGroupName="test_log_group",
+        logStreamName="test_log_stream",
+        logEvents=[
+            {"timestamp": start + index, "message": message}
+            for index, message in enumerate(messages)
+        ],
+    )
+
+    context = error_context_retriever.get_error_context(
+        log_group_name="test_log_group",
+        log_stream_name="test_log_stream",
+        start_time=start,
+        end_time=start + len(messages),
+    )
+
+    assert "job failed with an error" in context
+
+
+def test_get_error_context_stops_paginating_after_match(
+    error_context_retriever, cloudwatch_logs_client, mocker
+):
+    now = datetime.now()
+    start = int((now - timedelta(minutes=10)).timestamp() * 1000)
+    messages = ["an error occurred"] + [
+        f"informational message {index}" for index in range(2500)
+    ]
+
+    cloudwatch_logs_client.put_log_events(
+        logGroupName="test_log_group",
+        logStreamName="test_log_stream",
+        logEvents=[
+            {"timestamp": start + index, "message": message}
+            for index, message in enumerate(messages)
+        ],
+    )
+    get_log_events = mocker.spy(cloudwatch_logs_client, "get_log_events")
+
+    context = error_context_retriever.get_error_context(
+        log_group_name="test_log_group",
+        log_stream_name="test_log_stream",
+        start_time=start,
+        end_time=start + len(messages),
+    )
+
+    assert context.startswith("an error occurred\ninformational message 0")
+    assert get_log_events.call_count == 1
+
+
+@pytest.fixture
+def filter_error_context_retriever(cloudwatch_logs_client):
+    return ErrorContextRetriever(
+        cloudwatch_logs_client, strategy="filter", context_events=5
+    )
+
+
+def put_messages(cloudwatch_logs_client, start, messages):
+    cloudwatch_logs_client.put_log_events(
+        logGroupName="test_log_group",
+        logStreamName="test_log_stream",
+        logEvents=[
+            {"timestamp": start + index, "message": message}
+            for index, message in enumerate(messages)
+        ],
+    )
+
+
+def test_get_error_context_filter_reads_only_neighboring_events(
+    filter_error_context_retriever, cloudwatch_logs_client, mocker
+):
+    start = int((datetime.now() - timedelta(minutes=10)).timestamp() * 1000)
+    messages = [f"informational message {index}" for index in range(3000)]
+    messages[2000] = "job failed with an error"
+    put_messages(cloudwatch_logs_client, start, messages)
+    # The filter pattern syntax is not evaluated by moto, so stand in for it.
+    filter_log_events = mocker.patch.object(
+        cloudwatch_logs_client,
+        "filter_log_events",
+        return_value={
+            "events": [
+                {"timestamp": start + 2000, "message": "job failed with an error"}
+            ]
+        },
+    )
+    get_log_events = mocker.spy(cloudwatch_logs_client, "get_log_events")
+
+    context = filter_error_context_retriever.get_error_context(
+        log_group_name="test_log_group",
+        log_stream_name="test_log_stream",
+        start_time=start,
+        end_time=start + len(messages),
+    )
+
+    full_log = "".join(message + "\n" for message in messages)
+    line_start = full_log.index("job failed with an error")
+    assert context == full_log[line_start - 100 : line_start + 24 + 100]
+    assert filter_log_events.call_args.kwargs["filterPattern"] == (
+        '?"error" ?"Error" ?"ERROR" ?"exception" ?"Exception" ?"EXCEPTION"'
+        ' ?"failed" ?"Failed" ?"FAILED"'
+    )
+    assert get_log_events.call_count == 2
+    assert all(call.kwargs["limit"] == 5 for call in get_log_events.call_args_list)
+
+
+def test_get_error_context_filter_falls_back_to_scan(
+    filter_error_context_retriever, cloudwatch_logs_client, mocker
+):
+    start = int((datetime.now() - timedelta(minutes=10)).timestamp() * 1000)
+    put_messages(
+        cloudwatch_logs_client, start, ["informational message", "an error occurred"]
+    )
+    mocker.patch.object(
+        cloudwatch_logs_client, "filter_log_events", return_value={"events": []}
+    )
+    get_log_events = mocker.spy(cloudwatch_logs_client, "get_log_events")
+
+    context = filter_error_context_retriever.get_error_context(
+        log_group_name="test_log_group",
+        log_stream_name="test_log_stream",
+        start_time=start,
+        end_time=start + 2,
+    )
+
+    assert context == "informational message\nan error occurred\n"
+    assert get_log_events.call_args.kwargs["startFromHead"] is True
+
+
+def test_error_context_retriever_unknown_strategy(cloudwatch_logs_client):
+    with pytest.raises(ValueError):
+        ErrorContextRetriever(cloudwatch_logs_client, strategy="unknown")
+
+
+@pytest.fixture
+def tail_error_context_retriever(cloudwatch_logs_client):
+    return ErrorContextRetriever(cloudwatch_logs_client, strategy="tail")
+
+
+def test_get_error_context_tail_reads_only_last_pages(
+    tail_error_context_retriever, cloudwatch_logs_client, mocker
+):
+    start = int((datetime.now() - timedelta(minutes=10)).timestamp() * 1000)
+    messages = [f"informational message {index}" for index in range(5000)]
+    messages[10] = "an early error"
+    messages[4500] = "job failed with an error"
+    put_messages(cloudwatch_logs_client, start, messages)
+    get_log_events = mocker.spy(cloudwatch_logs_client, "get_log_events")
+
+    context = tail_error_context_retriever.get_error_context(
+        log_group_name="test_log_group",
+        log_stream_name="test_log_stream",
+        start_time=start,
+        end_time=start + len(messages),
+    )
+
+    full_log = "".join(message + "\n" for message in messages)
+    line_start = full_log.index("job failed with an error")
+    assert context == full_log[line_start - 100 : line_start + 24 + 100]
+    assert get_log_events.call_count == 2
+    assert all(
+        call.kwargs["startFromHead"] is False for call in get_log_events.call_args_list
+    )
+    assert get_log_events.call_args.kwargs["limit"] == 25
+
+
+def test_get_error_context_tail_respects_event_budget(cloudwatch_logs_client, mocker):
+    retriever = ErrorContextRetriever(
+        cloudwatch_logs_client, strategy="tail", max_tail_events=1500
+    )
+    start = int((datetime.now() - timedelta(minutes=10)).timestamp() * 1000)
+    messages = [f"informational message {index}" for index in range(5000)]
+    messages[10] = "an early error"
+    put_messages(cloudwatch_logs_client, start, messages)
+    get_log_events = mocker.spy(cloudwatch_logs_client, "get_log_events")
+
+    context = retriever.get_error_context(
+        log_group_name="test_log_group",
+        log_stream_name="test_log_stream",
+        start_time=start,
+        end_time=start + len(messages),
+    )
+
+    assert context == "No relevant error context found."
+    assert [call.kwargs["limit"] for call in get_log_events.call_args_list] == [
+        1000,
+        500,
+    ]
+
+
+def test_get_error_context_tail_reads_whole_short_stream(
+    tail_error_context_retriever, cloudwatch_logs_client
+):
+    start = int((datetime.now() - timedelta(minutes=10)).timestamp() * 1000)
+    messages = ["an error occurred"] + [f"message {index}" for index in range(1500)]
+    put_messages(cloudwatch_logs_client, start, messages)
+
+    context = tail_error_context_retriever.get_error_context(
+        log_group_name="test_log_group",
+        log_stream_name="test_log_stream",
+        start_time=start,
+        end_time=start + len(messages),
+    )
+
+    assert context.startswith("an error occurred\nmessage 0\n")
@@ -0,0 +1,180 @@
+import random
+
+import pytest
+
+from aws_glue_workflow_analyzer.analyzer.enrichment import get_node_status
+from aws_glue_workflow_analyzer.analyzer.graph import (
+    DownstreamClosure,
+    StaticWorkflowGraph,
+    WorkflowGraph,
+)
+
+
+@pytest.fixture
+def graph():
+    return {
+        "Nodes": [{"Id": node_id, "Type": "Job"} for node_id in "abcde"],
+        "Edges": [
+            {"SourceId": "a", "DestinationId": "b"},
+            {"SourceId": "a", "DestinationId": "c"},
+            {"SourceId": "b", "DestinationId": "d"},
+            {"SourceId": "c", "DestinationId": "d"},
+            {"SourceId": "x", "DestinationId": "e"},
+        ],
+    }
+
+
+def test_get_node(graph):
+    workflow_graph = WorkflowGraph(graph)
+
+    assert workflow_graph.get_node("c") == {"Id": "c", "Type": "Job"}
+    assert workflow_graph.get_node("missing") is None
+
+
+def test_downstream_and_upstream(graph):
+    workflow_graph = WorkflowGraph(graph)
+
+    assert workflow_graph.downstream("a") == {"a", "b", "c", "d"}
+    assert workflow_graph.downstream("d") == {"d"}
+    assert workflow_graph.upstream("d") == {"a", "b", "c", "d"}
+    assert workflow_graph.upstream("e") == {"e", "x"}
+
+
+def test_downstream_handles_cycles():
+    workflow_graph = WorkflowGraph(
+        {
+            "Nodes": [{"Id": "a"}, {"Id": "b"}],
+            "Edges": [
+                {"SourceId": "a", "DestinationId": "b"},
+                {"SourceId": "b", "DestinationId": "a"},
+            ],
+        }
+    )
+
+    assert workflow_graph.downstream("b") == {"a", "b"}
+
+
+def test_empty_graph():
+    workflow_graph = WorkflowGraph({})
+
+    assert workflow_graph.downstream("a") == {"a"}
+    assert workflow_graph.get_node("a") is None
+
+
+def reference_downstream(graph, node_id):
+    """The original edge-scanning traversal of TableAnalyzer."""
+    visited = set()
+    stack = [node_id]
+    while stack:
+        current = stack.pop()
+        if current not in visited:
+            visited.add(current)
+            for edge in graph["Edges"]:
+                if edge["SourceId"] == current:
+                    stack.append(edge["DestinationId"])
+    return visited
+
+
+def test_downstream_matches_reference_on_random_graphs():
+    rng = random.Random(0)
+    for _ in range(50):
+        size = rng.randint(1, 30)
+        graph = {
+            "Nodes": [{"Id": str(index)} for index in range(size)],
+            "Edges": [
+                {"SourceId": str(rng.randrange(size)), "DestinationId": str(target)}
+                for target in range(size)
+                for _ in range(rng.randint(0, 2))
+            ],
+        }
+        workflow_graph = WorkflowGraph(graph)
+        for node in graph["Nodes"]:
+            assert workflow_graph.downstream(node["Id"]) == reference_downstream(
+                graph, node["Id"]
+            )
+
+
+def test_downstream_closure_matches_reference_on_random_graphs():
+    rng = random.Random(1)
+    for _ in range(100):
+        size = rng.randint(1, 40)
+        graph = {
+            "Nodes": [{"Id": f"n{index}"} for index in range(size)],
+            "Edges": [
+                {
+                    "SourceId": f"n{rng.randrange(size)}",
+                    "DestinationId": f"n{rng.randrange(size + 2)}",
+                }
+                for _ in range(rng.randint(0, 2 * size))
+            ],
+        }
+        closure = DownstreamClosure(WorkflowGraph(graph))
+        for node_id in [node["Id"] for node in graph["Nodes"]] + ["unknown"]:
+            assert closure.downstream(node_id) == reference_downstream(graph, node_id)
+
+
+def test_structural_hash_ignores_order_and_node_attributes(graph):
+    reordered = {
+        "Nodes": [
+            {"Id": node["Id"], "Type": "Crawler"} for node in reversed(graph["Nodes"])
+        ],
+        "Edges": list(reversed(graph["Edges"])),
+    }
+    changed = {"Nodes": graph["Nodes"], "Edges": graph["Edges"][:-1]}
+
+    assert (
+        WorkflowGraph(graph).structural_hash == WorkflowGraph(reordered).structural_hash
+    )
+    assert (
+        WorkflowGraph(graph).structural_hash != WorkflowGraph(changed).structural_hash
+    )
+
+
+def test_static_graph_overlay_shares_topology(graph):
+    static_graph = StaticWorkflowGraph(graph)
+    run_graph = {
+        "Nodes": [
+            {"Id": "a", "Type": "Job", "JobDetails": {"JobRuns": [{"Id": "jr_1"}]}},
+            {"Id": "b", "Type": "Crawler"},
+            {"Id": "new", "Type": "Job"},
+        ],
+        "Edges": list(reversed(graph["Edges"])),
+    }
+
+    overlaid = static_graph.overlay(run_graph)
+
+    assert overlaid == {"Nodes": run_graph["Nodes"], "Edges": graph["Edges"]}
+    assert overlaid["Edges"] is graph["Edges"]
+    assert overlaid["Nodes"][1] is run_graph["Nodes"][1]
+    assert overlaid["Nodes"][2] is run_graph["Nodes"][2]
+    assert overlaid["Nodes"][0] is not run_graph["Nodes"][0]
+    assert overlaid["Nodes"][0]["JobDetails"] is run_graph["Nodes"][0]["JobDetails"]
+
+
+def test_static_graph_overlay_keeps_run_node_fields(graph):
+    static_graph = StaticWorkflowGraph(
+        {
+            "Nodes": [{"Id": "a", "Type": "Job", "Name": "job_a", "Status": "X"}],
+            "Edges": [],
+        }
+    )
+    run_node = {
+        "Id": "a",
+        "Type": "Job",
+        "Name": "job_a",
+        "Status": "FAILED",
+        "JobDetails": {"JobRuns": [{"Id": "jr_1", "JobRunState": "SUCCEEDED"}]},
+        "UniqueId": "run-unique",
+    }
+
+    overlaid = static_graph.overlay({"Nodes": [run_node], "Edges": []})
+
+    assert overlaid["Nodes"] == [run_node]
+    assert overlaid["Nodes"][0] is not run_node
+    assert get_node_status(overlaid["Nodes"][0]) == "FAILED"
+
+
+def test_static_graph_overlay_keeps_changed_edges(graph):
+    run_graph = {"Nodes": [], "Edges": graph["Edges"][:2]}
+
+    assert StaticWorkflowGraph(graph).overlay(run_graph)["Edges"] is run_graph["Edges"]
@@ -0,0 +1,255 @@
+import json
+import re
+
+import pytest
+from botocore.exceptions import ClientError
+
+from aws_glue_workflow_analyzer.analyzer.error_retriever import ErrorContextRetriever
+from aws_glue_workflow_analyzer.analyzer.insights import InsightsErrorContextBatcher
+from aws_glue_workflow_analyzer.analyzer.log_scanner import ErrorContextScanner
+from aws_glue_workflow_analyzer.exceptions import APIRequestError
+from aws_glue_workflow_analyzer.logger import logger
+
+
+@pytest.fixture(autouse=True)
+def mock_logging(monkeypatch):
+    monkeypatch.setattr(logger, "info", lambda msg: None)
+    monkeypatch.setattr(logger, "error", lambda msg: None)
+    monkeypatch.setattr(logger, "debug", lambda msg: None)
+
+
+class StubLogsInsightsClient:
+    """Evaluates the queries built by InsightsErrorContextBatcher against in-memory log streams."""
+
+    def __init__(self, streams, polls_before_complete=1, final_status="Complete"):
+        self.streams = streams
+        self.polls_before_complete = polls_before_complete
+        self.final_status = final_status
+        self.queries = []
+        self.polls = 0
+        self.stopped = []
+        self.log_event_calls = 0
+
+    def start_query(self, logGroupName, startTime, endTime, queryString):
+        self.queries.append(
+            {
+                "logGroupName": logGroupName,
+                "startTime": startTime,
+                "endTime": endTime,
+                "queryString": queryString,
+            }
+        )
+        return {"queryId": str(len(self.queries) - 1)}
+
+    def get_query_results(self, queryId):
+        self.polls += 1
+        if self.polls <= self.polls_before_complete:
+            return {"status": "Running", "results": []}
+        if self.final_status != "Complete":
+            return {"status": self.final_status, "results": []}
+
+        query = self.queries[int(queryId)]
+        stream_names = json.loads(
+            "[" + re.search(r"in \[(.*?)\]", query["queryString"]).group(1) + "]"
+        )
+        pattern = re.compile(re.search(r"like /(.*)/", query["queryString"]).group(1))
+        results = []
+        for stream_name in stream_names:
+            events = self.streams.get((query["logGroupName"], stream_name), [])
+            matches = [
+                timestamp
+                for timestamp, message in events
+                if query["startTime"] * 1000 <= timestamp <= query["endTime"] * 1000
+                and pattern.search(message)
+            ]
+            if matches:
+                results.append(
+                    [
+                        {"field": "@logStream", "value": stream_name},
+                        {"field": "timestamp", "value": f"{min(matches)}.0"},
+                    ]
+                )
+        return {"status": "Complete", "results": results}
+
+    def get_log_events(
+        self,
+        logGroupName,
+        logStreamName,
+        startTime,
+        endTime,
+        limit,
+        startFromHead,
+    ):
+        self.log_event_calls += 1
+        events = [
+            {"timestamp": timestamp, "message": message}
+            for timestamp, message in self.streams.get(
+                (logGroupName, logStreamName), []
+            )
+            if startTime <= timestamp < endTime
+        ]
+        return {"events": events[:limit] if startFromHead else events[-limit:]}
+
+    def stop_query(self, queryId):
+        self.stopped.append(queryId)
+        return {"success": True}
+
+
+@pytest.fixture
+def streams():
+    return {
+        ("group", f"stream{index}"): [
+            (1_000_000 + index * 1000, f"starting run {index}"),
+            (1_000_500 + index * 1000, f"run {index} failed with an error"),
+        ]
+        for index in range(5)
+    }
+
+
+def make_batcher(client, **kwargs):
+    return InsightsErrorContextBatcher(
+        client, ErrorContextScanner(), poll_interval=0, **kwargs
+    )
+
+
+def test_get_failure_timestamps_demultiplexes_streams(streams):
+    streams[("group", "stream3")] = [(1_003_000, "nothing to see here")]
+    client = StubLogsInsightsClient(streams)
+    log_requests = [
+        ("group", f"stream{index}", 1_000_000 + index * 1000, 1_000_900 + index * 1000)
+        for index in range(5)
+    ]
+
+    timestamps = make_batcher(client).get_failure_timestamps(log_requests)
+
+    assert len(client.queries) == 1
+    assert client.queries[0]["startTime"] == 1000
+    assert client.queries[0]["endTime"] == 1005
+    assert timestamps == {
+        log_request: (
+            None
+            if log_request[1] == "stream3"
+            else 1_000_500 + int(log_request[1][-1]) * 1000
+        )
+        for log_request in log_requests
+    }
+
+
+def test_get_failure_timestamps_batches_by_group_and_stream_count(streams):
+    streams[("other", "stream0")] = [(1_000_000, "an exception occurred")]
+    client = StubLogsInsightsClient(streams, polls_before_complete=0)
+    log_requests = [
+        ("group", f"stream{index}", 1_000_000, 1_010_000) for index in range(5)
+    ] + [("other", "stream0", 1_000_000, 1_010_000)]
+
+    timestamps = make_batcher(client, max_streams_per_query=2).get_failure_timestamps(
+        log_requests
+    )
+
+    assert [query["logGroupName"] for query in client.queries] == [
+        "group",
+        "group",
+        "group",
+        "other",
+    ]
+    assert timestamps[("other", "stream0", 1_000_000, 1_010_000)] == 1_000_000
+
+
+def test_get_failure_timestamps_splits_repeated_streams(streams):
+    client = StubLogsInsightsClient(streams, polls_before_complete=0)
+    log_requests = [
+        ("group", "stream0", 1_000_000, 1_000_400),
+        ("group", "stream0", 1_000_400, 1_001_000),
+    ]
+
+    make_batcher(client).get_failure_timestamps(log_requests)
+
+    assert len(client.queries) == 2
+
+
+def test_get_failure_timestamps_failed_query(streams):
+    client = StubLogsInsightsClient(streams, final_status="Failed")
+
+    with pytest.raises(APIRequestError, match="Failed"):
+        make_batcher(client).get_failure_timestamps(
+            [("group", "stream0", 1_000_000, 1_001_000)]
+        )
+
+
+def test_get_failure_timestamps_timeout_stops_query(streams):
+    client = StubLogsInsightsClient(streams, polls_before_complete=10)
+
+    with pytest.raises(APIRequestError, match="did not complete"):
+        make_batcher(client, timeout=0).get_failure_timestamps(
+            [("group", "stream0", 1_000_000, 1_001_000)]
+        )
+    assert client.stopped == ["0"]
+
+
+def test_get_failure_timestamps_client_error(streams, mocker):
+    client = StubLogsInsightsClient(streams)
+    mocker.patch.object(
+        client,
+        "start_query",
+        side_effect=ClientError(
+            {"Error": {"Code": "LimitExceededException", "Message": "Too many"}},
+            "StartQuery",
+        ),
+    )
+
+    with pytest.raises(APIRequestError, match="Failed to run Logs Insights query"):
+        make_batcher(client).get_failure_timestamps(
+            [("group", "stream0", 1_000_000, 1_001_000)]
+        )
+
+
+def test_error_context_retriever_reads_prefetched_contexts(streams, mocker):
+    streams[("group", "stream1")] = [(1_001_000, "all good")]
+    client = StubLogsInsightsClient(streams, polls_before_complete=0)
+    retriever = ErrorContextRetriever(client, strategy="insights")
+    retriever.insights_batcher.poll_interval = 0
+    scan = mocker.patch.object(
+        retriever, "_scan_error_context", return_value="scanned context"
+    )
+
+    retriever.prefetch_error_contexts(
+        [
+            ("group", "stream0", 1_000_000, 1_000_900),
+            ("group", "stream1", 1_001_000, 1_001_900),
+        ]
+    )
+
+    assert (
+        retriever.get_error_context("group", "stream0", 1_000_000, 1_000_900)
+        == "starting run 0\nrun 0 failed with an error\n"
+    )
+    assert client.log_event_calls == 2
+    assert (
+        retriever.get_error_context("group", "stream1", 1_001_000, 1_001_900)
+        == "No relevant error context found."
+    )
+    scan.assert_not_called()
+    assert (
+        retriever.get_error_context("group", "stream2", 1_002_000, 1_002_900)
+        == "scanned context"
+    )
+    assert len(client.queries) == 1
+
+
+def test_error_context_retriever_scans_when_prefetched_match_is_crowded(mocker):
+    noise = [(1_000_500, f"noise {index}") for index in range(30)]
+    streams = {("group", "stream0"): noise + [(1_000_500, "Job failed")]}
+    client = StubLogsInsightsClient(streams, polls_before_complete=0)
+    retriever = ErrorContextRetriever(client, strategy="insights")
+    retriever.insights_batcher.poll_interval = 0
+    scan = mocker.patch.object(
+        retriever, "_scan_error_context", return_value="Job failed\n"
+    )
+
+    retriever.prefetch_error_contexts([("group", "stream0", 1_000_000, 1_000_900)])
+
+    assert (
+        retriever.get_error_context("group", "stream0", 1_000_000, 1_000_900)
+        == "Job failed\n"
+    )
+    scan.assert_called_once_with("group", "stream0", 1_000_000, 1_000_900)
@@ -0,0 +1,109 @@
+import random
+
+import pytest
+
+from aws_glue_workflow_analyzer.analyzer.log_scanner import ErrorContextScanner
+
+
+def reference_error_context(messages):
+    """The original concatenate-and-index implementation of the error context search."""
+    full_log = ""
+    for message in messages:
+        full_log += message + "\n"
+    for line in full_log.splitlines():
+        if any(keyword in line for keyword in ["error", "exception", "failed"]):
+            context_start = max(0, full_log.index(line) - 100)
+            context_end = min(len(full_log), full_log.index(line) + len(line) + 100)
+            return full_log[context_start:context_end]
+    return None
+
+
+@pytest.fixture
+def scanner():
+    return ErrorContextScanner()
+
+
+@pytest.mark.parametrize(
+    "messages",
+    [
+        [],
+        ["all good", "still good"],
+        ["an error occurred"],
+        ["x" * 250, "an error occurred", "y" * 250],
+        ["short", "an error occurred", "tail"],
+        ["multi\nline message with an exception inside\nand more"],
+        ["windows\r\nline endings failed\r\n", "next"],
+        ["first error", "second error"],
+    ],
+)
+def test_scan_matches_reference(scanner, messages):
+    assert scanner.scan(messages) == reference_error_context(messages)
+
+
+def test_scan_matches_reference_on_random_logs(scanner):
+    rng = random.Random(0)
+    fragments = ["a", "info ", "\n", "\r\n", "\r", "z" * 60, "error", "failed", ""]
+    for _ in range(2000):
+        messages = [
+            "".join(
+                rng.choice(fragments if rng.random() < 0.2 else fragments[:6])
+                for _ in range(rng.randint(0, 8))
+            )
+            for _ in range(rng.randint(0, 12))
+        ]
+        assert scanner.scan(messages) == reference_error_context(messages)
+
+
+def test_scan_stops_consuming_after_trailing_context(scanner):
+    consumed = []
+
+    def messages():
+        for index in range(10000):
+            consumed.append(index)
+            yield "an error occurred" if index == 5 else "x" * 40
+
+    context = scanner.scan(messages())
+
+    assert "an error occurred" in context
+    assert len(consumed) == 9
+
+
+def test_scan_with_custom_context_window():
+    scanner = ErrorContextScanner(keywords=["boom"], context_chars=3)
+
+    assert scanner.scan(["abcdef", "boom", "ghijkl"]) == "ef\nboom\ngh"
+
+
+def reference_last_error_context(messages):
+    """The error context of the last failure line, found by searching the reversed lines."""
+    full_log = "".join(message + "\n" for message in messages)
+    offsets = []
+    offset = 0
+    for line, content in zip(full_log.splitlines(True), full_log.splitlines()):
+        offsets.append((offset, content))
+        offset += len(line)
+    for offset, content in reversed(offsets):
+        if any(keyword in content for keyword in ["error", "exception", "failed"]):
+            return full_log[max(0, offset - 100) : offset + len(content) + 100]
+    return None
+
+
+def test_scan_last_matches_reference_on_random_logs(scanner):
+    rng = random.Random(1)
+    fragments = ["a", "info ", "\n", "\r\n", "\r", "z" * 60, "error", "failed", ""]
+    for _ in range(2000):
+        messages = [
+            "".join(
+                rng.choice(fragments if rng.random() < 0.2 else fragments[:6])
+                for _ in range(rng.randint(0, 8))
+            )
+            for _ in range(rng.randint(0, 12))
+        ]
+        assert scanner.scan_last(messages) == reference_last_error_context(messages)
+
+
+def test_scan_last_returns_last_failure(scanner):
+    assert scanner.scan_last(["first error", "ok", "second error"]) == (
+        "first error\nok\nsecond error\n"
+    )
+    assert scanner.scan_last(["all good"]) is None
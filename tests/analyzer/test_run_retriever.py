@@ -6,8 +6,10 @@ import pytest
 from botocore.exceptions import ClientError
 
 from aws_glue_workflow_analyzer.analyzer.run_retriever import WorkflowRunRetriever
+from aws_glue_workflow_analyzer.disk_cache import DiskCache
 from aws_glue_workflow_analyzer.exceptions import APIRequestError
 from aws_glue_workflow_analyzer.logger import logger
+from aws_glue_workflow_analyzer.state import IncrementalState
 
 
 class MockGlueWorkflow:
@@ -34,7 +36,9 @@ class MockGlueWorkflow:
         self.workflow_runs[Name].append(run)
         return run_id
 
-    def get_workflow_runs(self, Name, IncludeGraph=False, MaxResults=None):
+    def get_workflow_runs(
+        self, Name, IncludeGraph=False, MaxResults=None, NextToken=None
+    ):
         if Name not in self.workflows:
             raise ClientError(
                 {
@@ -46,16 +50,45 @@ class MockGlueWorkflow:
                 "GetWorkflowRuns",
             )
 
-        runs = self.workflow_runs[Name]
+        # Like GetWorkflowRuns, return the newest runs first.
+        runs = sorted(
+            self.workflow_runs[Name], key=lambda run: run["StartedOn"], reverse=True
+        )
+        start = int(NextToken) if NextToken else 0
+        runs = runs[start:]
 
         if not IncludeGraph:
-            for run in runs:
-                run.pop("Graph", None)
-
-        if MaxResults:
-            runs = runs[:MaxResults]
-
-        return {"Runs": runs}
+            runs = [
+                (
+                    {key: value for key, value in run.items() if key != "Graph"}
+                    if "Graph" in run
+                    else run
+                )
+                for run in runs
+            ]
+
+        response = {"Runs": runs}
+        if MaxResults and len(runs) > MaxResults:
+            response["Runs"] = runs[:MaxResults]
+            response["NextToken"] = str(start + MaxResults)
+
+        return response
+
+    def get_workflow_run(self, Name, RunId, IncludeGraph=False):
+        run = next(run for run in self.workflow_runs[Name] if run["RunId"] == RunId)
+        if not IncludeGraph:
+            return {"Run": {key: value for key, value in run.items() if key != "Graph"}}
+        return {"Run": run}
+
+    def batch_get_workflows(self, Names, IncludeGraph=False):
+        return {
+            "Workflows": [
+                {"Name": name, "Graph": self.workflows[name]}
+                for name in Names
+                if name in self.workflows
+            ],
+            "MissingWorkflows": [name for name in Names if name not in self.workflows],
+        }
 
     def delete_workflow(self, Name):
         if Name in self.workflows:
@@ -146,3 +179,282 @@ def test_get_workflow_runs_no_runs(workflow_run_retriever, glue_client):
     workflow_runs = workflow_run_retriever.get_workflow_runs("test_workflow", days=30)
 
     assert len(workflow_runs) == 0, "The workflow should have no runs"
+
+
+def test_iter_workflow_runs_is_lazy(workflow_run_retriever, glue_client):
+    glue_client.create_workflow(Name="test_workflow")
+    glue_client.start_workflow_run(Name="test_workflow")
+
+    workflow_runs = workflow_run_retriever.iter_workflow_runs("test_workflow", days=30)
+    glue_client.delete_workflow(Name="test_workflow")
+
+    with pytest.raises(APIRequestError):
+        next(workflow_runs)
+
+
+def test_get_workflow_runs_stops_paginating_at_cutoff(
+    workflow_run_retriever, glue_client, mocker
+):
+    glue_client.create_workflow(Name="test_workflow")
+    now = datetime.datetime.now()
+    for hours in range(500):
+        glue_client.start_workflow_run(Name="test_workflow")
+        glue_client.workflow_runs["test_workflow"][-1]["StartedOn"] = (
+            now - datetime.timedelta(hours=hours, minutes=30)
+        )
+    get_workflow_runs = mocker.spy(glue_client, "get_workflow_runs")
+
+    workflow_runs = workflow_run_retriever.get_workflow_runs("test_workflow", days=1)
+
+    assert len(workflow_runs) == 24
+    # Only the first of the five pages of hourly runs overlaps the one-day window.
+    assert get_workflow_runs.call_count == 1
+
+
+def test_get_workflow_runs_reads_pages_until_cutoff(
+    workflow_run_retriever, glue_client, mocker
+):
+    glue_client.create_workflow(Name="test_workflow")
+    now = datetime.datetime.now()
+    for hours in range(500):
+        glue_client.start_workflow_run(Name="test_workflow")
+        glue_client.workflow_runs["test_workflow"][-1]["StartedOn"] = (
+            now - datetime.timedelta(hours=hours, minutes=30)
+        )
+    get_workflow_runs = mocker.spy(glue_client, "get_workflow_runs")
+
+    workflow_runs = workflow_run_retriever.get_workflow_runs("test_workflow", days=10)
+
+    assert len(workflow_runs) == 240
+    assert get_workflow_runs.call_count == 3
+
+
+def test_get_workflow_runs_timezone_aware_started_on(
+    workflow_run_retriever, glue_client
+):
+    glue_client.create_workflow(Name="test_workflow")
+    glue_client.start_workflow_run(Name="test_workflow")
+    glue_client.start_workflow_run(Name="test_workflow")
+    now = datetime.datetime.now(datetime.timezone.utc)
+    glue_client.workflow_runs["test_workflow"][0]["StartedOn"] = now
+    glue_client.workflow_runs["test_workflow"][1]["StartedOn"] = (
+        now - datetime.timedelta(days=40)
+    )
+
+    workflow_runs = workflow_run_retriever.get_workflow_runs("test_workflow", days=30)
+
+    assert [run["StartedOn"] for run in workflow_runs] == [now]
+
+
+@pytest.mark.parametrize("max_workers", [1, 4])
+def test_iter_workflow_runs_two_phase(glue_client, mocker, max_workers):
+    glue_client.create_workflow(Name="test_workflow")
+    now = datetime.datetime.now()
+    for index in range(10):
+        glue_client.start_workflow_run(Name="test_workflow")
+        run = glue_client.workflow_runs["test_workflow"][-1]
+        run["StartedOn"] = now - datetime.timedelta(hours=index)
+        run["Statistics"] = {
+            "TotalActions": 2,
+            "SucceededActions": 1 if index in (3, 7) else 2,
+            "FailedActions": 1 if index == 3 else 0,
+            "StoppedActions": 1 if index == 7 else 0,
+        }
+        run["Graph"] = {"Nodes": [{"Id": f"node-{index}"}], "Edges": []}
+    get_workflow_runs = mocker.spy(glue_client, "get_workflow_runs")
+    get_workflow_run = mocker.spy(glue_client, "get_workflow_run")
+    retriever = WorkflowRunRetriever(
+        glue_client, two_phase=True, max_workers=max_workers
+    )
+
+    workflow_runs = retriever.get_workflow_runs("test_workflow", days=30)
+
+    assert [run["RunId"] for run in workflow_runs] == [
+        f"run-{index}" for index in range(1, 11)
+    ]
+    assert [run["RunId"] for run in workflow_runs if "Graph" in run] == [
+        "run-4",
+        "run-8",
+    ]
+    assert get_workflow_runs.call_args.kwargs["IncludeGraph"] is False
+    assert get_workflow_run.call_count == 2
+
+
+def test_has_failed_actions():
+    assert WorkflowRunRetriever.has_failed_actions(
+        {"Status": "COMPLETED", "Statistics": {"TimeoutActions": 1}}
+    )
+    assert WorkflowRunRetriever.has_failed_actions({"Status": "ERROR"})
+    assert not WorkflowRunRetriever.has_failed_actions(
+        {"Status": "COMPLETED", "Statistics": {"SucceededActions": 3}}
+    )
+
+
+def test_iter_workflow_runs_reads_completed_runs_from_disk_cache(
+    glue_client, mocker, tmp_path
+):
+    glue_client.create_workflow(Name="test_workflow")
+    now = datetime.datetime.now(datetime.timezone.utc)
+    for index in range(3):
+        glue_client.start_workflow_run(Name="test_workflow")
+        run = glue_client.workflow_runs["test_workflow"][-1]
+        run["StartedOn"] = now - datetime.timedelta(hours=index + 1)
+        run["Graph"] = {"Nodes": [{"Id": f"node-{index}"}], "Edges": []}
+        if index > 0:
+            run["Status"] = "COMPLETED"
+            run["CompletedOn"] = run["StartedOn"] + datetime.timedelta(minutes=5)
+    get_workflow_run = mocker.spy(glue_client, "get_workflow_run")
+
+    cold_runs = WorkflowRunRetriever(
+        glue_client, disk_cache=DiskCache(str(tmp_path))
+    ).get_workflow_runs("test_workflow", days=30)
+    # The cold cache lists the runs with their graphs rather than fetching each.
+    assert get_workflow_run.call_count == 0
+    warm_runs = WorkflowRunRetriever(
+        glue_client, disk_cache=DiskCache(str(tmp_path))
+    ).get_workflow_runs("test_workflow", days=30)
+
+    assert warm_runs == cold_runs
+    assert [run["Graph"]["Nodes"][0]["Id"] for run in warm_runs] == [
+        "node-0",
+        "node-1",
+        "node-2",
+    ]
+    # Only the running run is fetched again by the warm retriever.
+    assert get_workflow_run.call_count == 1
+    assert get_workflow_run.call_args.kwargs["RunId"] == "run-1"
+
+
+def test_iter_workflow_runs_lists_graphs_on_cold_disk_cache(
+    glue_client, mocker, tmp_path
+):
+    glue_client.create_workflow(Name="test_workflow")
+    now = datetime.datetime.now(datetime.timezone.utc)
+    for index in range(250):
+        glue_client.start_workflow_run(Name="test_workflow")
+        run = glue_client.workflow_runs["test_workflow"][-1]
+        run["StartedOn"] = now - datetime.timedelta(hours=index + 1)
+        run["Status"] = "COMPLETED"
+        run["CompletedOn"] = run["StartedOn"] + datetime.timedelta(minutes=5)
+        run["Graph"] = {"Nodes": [{"Id": f"node-{index}"}], "Edges": []}
+    get_workflow_runs = mocker.spy(glue_client, "get_workflow_runs")
+    get_workflow_run = mocker.spy(glue_client, "get_workflow_run")
+    disk_cache = DiskCache(str(tmp_path))
+
+    runs = WorkflowRunRetriever(glue_client, disk_cache=disk_cache).get_workflow_runs(
+        "test_workflow", days=30
+    )
+
+    assert len(runs) == 250
+    assert all("Graph" in run for run in runs)
+    assert get_workflow_run.call_count == 0
+    # One page without graphs to probe the cache, then three pages with graphs.
+    assert [
+        call.kwargs["IncludeGraph"] for call in get_workflow_runs.call_args_list
+    ] == [
+        False,
+        True,
+        True,
+        True,
+    ]
+    assert disk_cache.count_runs("test_workflow", [run["RunId"] for run in runs]) == 250
+
+
+def test_iter_workflow_runs_overlays_static_graph(glue_client, mocker):
+    glue_client.create_workflow(Name="test_workflow")
+    trigger = {"Id": "trigger", "Type": "Trigger", "TriggerDetails": {"Trigger": {}}}
+    edges = [{"SourceId": "trigger", "DestinationId": "job"}]
+    glue_client.workflows["test_workflow"] = {
+        "Nodes": [trigger, {"Id": "job", "Type": "Job", "Name": "job"}],
+        "Edges": edges,
+    }
+    for index in range(3):
+        glue_client.start_workflow_run(Name="test_workflow")
+        glue_client.workflow_runs["test_workflow"][-1]["Graph"] = {
+            "Nodes": [
+                dict(trigger, TriggerDetails={"Trigger": {}}),
+                {
+                    "Id": "job",
+                    "Type": "Job",
+                    "Name": "job",
+                    "JobDetails": {"JobRuns": [{"Id": f"jr_{index}"}]},
+                },
+            ],
+            "Edges": [dict(edge) for edge in edges],
+        }
+    batch_get_workflows = mocker.spy(glue_client, "batch_get_workflows")
+    retriever = WorkflowRunRetriever(glue_client, static_graph=True)
+
+    workflow_runs = retriever.get_workflow_runs("test_workflow", days=30)
+    retriever.get_workflow_runs("test_workflow", days=30)
+
+    assert batch_get_workflows.call_count == 1
+    assert [
+        run["Graph"]["Nodes"][1]["JobDetails"]["JobRuns"][0]["Id"]
+        for run in workflow_runs
+    ] == ["jr_2", "jr_1", "jr_0"]
+    assert all(run["Graph"]["Edges"] is edges for run in workflow_runs)
+    assert all(
+        run["Graph"]["Nodes"][0]["TriggerDetails"] is trigger["TriggerDetails"]
+        for run in workflow_runs
+    )
+
+
+def test_iter_workflow_runs_without_static_graph(glue_client):
+    glue_client.create_workflow(Name="test_workflow")
+    glue_client.start_workflow_run(Name="test_workflow")
+    graph = {"Nodes": [{"Id": "job", "Type": "Job"}], "Edges": []}
+    glue_client.workflow_runs["test_workflow"][-1]["Graph"] = graph
+    glue_client.batch_get_workflows = lambda Names, IncludeGraph: {
+        "Workflows": [],
+        "MissingWorkflows": Names,
+    }
+    retriever = WorkflowRunRetriever(glue_client, static_graph=True)
+
+    workflow_runs = retriever.get_workflow_runs("test_workflow", days=30)
+
+    assert workflow_runs[0]["Graph"] is graph
+
+
+def test_iter_workflow_runs_incremental(glue_client, mocker, tmp_path):
+    glue_client.create_workflow(Name="test_workflow")
+    now = datetime.datetime.now(datetime.timezone.utc)
+
+    def start_run(hours_ago, status):
+        glue_client.start_workflow_run(Name="test_workflow")
+        run = glue_client.workflow_runs["test_workflow"][-1]
+        run["StartedOn"] = now - datetime.timedelta(hours=hours_ago)
+        run["Status"] = status
+        if status == "COMPLETED":
+            run["CompletedOn"] = run["StartedOn"] + datetime.timedelta(minutes=5)
+        return run
+
+    for hours_ago in range(300, 2, -1):
+        start_run(hours_ago, "COMPLETED")
+    running_run = start_run(2, "RUNNING")
+    start_run(1, "COMPLETED")
+    path = str(tmp_path / "state.json")
+    state = IncrementalState(path)
+
+    first_runs = WorkflowRunRetriever(glue_client, state=state).get_workflow_runs(
+        "test_workflow", days=30
+    )
+    assert state.get_mark("test_workflow") is None
+    state.stage("test_workflow", first_runs)
+    state.commit()
+    running_run["Status"] = "COMPLETED"
+    running_run["CompletedOn"] = now
+    start_run(0, "RUNNING")
+    get_workflow_runs = mocker.spy(glue_client, "get_workflow_runs")
+
+    state = IncrementalState(path)
+    second_runs = WorkflowRunRetriever(glue_client, state=state).get_workflow_runs(
+        "test_workflow", days=30
+    )
+    state.stage("test_workflow", second_runs)
+    state.commit()
+
+    assert len(first_runs) == 300
+    assert [run["RunId"] for run in second_runs] == ["run-301", "run-299"]
+    assert get_workflow_runs.call_count == 1
+    assert list(state.get_mark("test_workflow").running) == ["run-301"]
@@ -0,0 +1,113 @@
+import json
+
+import pytest
+
+from aws_glue_workflow_analyzer.analyzer.log_scanner import ErrorContextScanner
+from aws_glue_workflow_analyzer.analyzer.signatures import (
+    SignatureEngine,
+    SignatureMatch,
+)
+from aws_glue_workflow_analyzer.exceptions import WorkflowAnalyzerError
+
+
+@pytest.fixture
+def engine():
+    return SignatureEngine(
+        {
+            "error": {"keywords": ["error"]},
+            "oom": {"keywords": ["OutOfMemory"], "regexes": [r"exit code 13\d"]},
+            "s3": {"regexes": [r"s3://\S+ (?:not found|access denied)"]},
+        }
+    )
+
+
+def test_search_is_case_insensitive(engine):
+    assert engine.search("java.lang.OUTOFMEMORYError raised") == SignatureMatch(
+        "oom", 10, "OUTOFMEMORY"
+    )
+    assert engine.matches("ERROR: boom")
+    assert engine.search("all good") is None
+
+
+def test_iter_matches_reports_every_match(engine):
+    text = "Error reading s3://bucket/key not found, container exit code 137"
+
+    assert list(engine.iter_matches(text)) == [
+        SignatureMatch("error", 0, "Error"),
+        SignatureMatch("s3", 14, "s3://bucket/key not found"),
+        SignatureMatch("oom", 51, "exit code 137"),
+    ]
+
+
+def test_categorize_lists_distinct_categories(engine):
+    text = "exit code 137 after an error, then another ERROR"
+
+    assert engine.categorize(text) == ["oom", "error"]
+    assert engine.categorize("all good") == []
+
+
+def test_regexes_with_uppercase_match_case_insensitively():
+    engine = SignatureEngine({"spark": {"regexes": [r"Py4J\w+Error"]}})
+
+    assert engine.matches("py4j.protocol.PY4JJAVAERROR: boom")
+    assert not engine.matches("py4j gateway started")
+
+
+def test_case_sensitive_signatures():
+    engine = SignatureEngine({"error": {"keywords": ["error"]}}, case_sensitive=True)
+
+    assert not engine.matches("ERROR")
+    assert engine.matches("an error")
+
+
+def test_keywords_are_matched_literally():
+    engine = SignatureEngine({"glob": {"keywords": ["a.*b"]}})
+
+    assert engine.matches("a.*b")
+    assert not engine.matches("a and b")
+
+
+def test_invalid_signatures():
+    with pytest.raises(WorkflowAnalyzerError):
+        SignatureEngine({"broken": {"regexes": ["("]}})
+    with pytest.raises(WorkflowAnalyzerError):
+        SignatureEngine({"empty": {"keywords": []}})
+
+
+def test_from_config(tmp_path):
+    path = tmp_path / "signatures.json"
+    path.write_text(
+        json.dumps(
+            {
+                "case_sensitive": True,
+                "signatures": {"fatal": {"keywords": ["FATAL"], "regexes": []}},
+            }
+        )
+    )
+
+    engine = SignatureEngine.from_config(str(path))
+
+    assert engine.categories == ["fatal"]
+    assert engine.case_sensitive is True
+    assert engine.matches("FATAL: disk full")
+
+
+def test_from_config_invalid(tmp_path):
+    path = tmp_path / "signatures.json"
+    path.write_text(json.dumps({"keywords": ["error"]}))
+
+    with pytest.raises(WorkflowAnalyzerError):
+        SignatureEngine.from_config(str(path))
+    with pytest.raises(WorkflowAnalyzerError):
+        SignatureEngine.from_config(str(tmp_path / "missing.json"))
+
+
+def test_scanner_uses_signatures(engine):
+    scanner = ErrorContextScanner(signatures=engine)
+
+    assert scanner.scan(["starting", "container exit code 137", "done"]) == (
+        "starting\ncontainer exit code 137\ndone\n"
+    )
+    assert ErrorContextScanner().scan(["Traceback", "ValueError: bad"]) == (
+        "Traceback\nValueError: bad\n"
+    )
@@ -6,7 +6,9 @@ import pytest
 from botocore.exceptions import ClientError
 from moto import mock_glue
 
+from aws_glue_workflow_analyzer.analyzer.graph import DownstreamClosure, WorkflowGraph
 from aws_glue_workflow_analyzer.analyzer.table_analyzer import TableAnalyzer
+from aws_glue_workflow_analyzer.disk_cache import DiskCache
 from aws_glue_workflow_analyzer.exceptions import APIRequestError
 
 
@@ -225,3 +227,167 @@ def test_get_affected_tables_scenario(table_analyzer, glue_client):
         assert (
             set(affected_tables) == expected_tables
         ), f"Expected {expected_tables}, but got {set(affected_tables)}"
+
+
+def test_get_affected_tables_builds_graph_once(table_analyzer, glue_client, mocker):
+    graph = {
+        "Nodes": [
+            {"Id": "node1", "Type": "Trigger", "Name": "trigger"},
+            {"Id": "node2", "Type": "Trigger", "Name": "trigger"},
+        ],
+        "Edges": [
+            {"SourceId": "node1", "DestinationId": "node2"},
+            {"SourceId": "node2", "DestinationId": "missing"},
+        ],
+    }
+    workflow_graph = mocker.patch(
+        "aws_glue_workflow_analyzer.analyzer.table_analyzer.WorkflowGraph",
+        wraps=WorkflowGraph,
+    )
+
+    assert table_analyzer.get_affected_tables(graph, "node1") == []
+    assert table_analyzer.get_affected_tables(graph, "node2") == []
+    assert workflow_graph.call_count == 1
+
+
+def test_get_affected_tables_reuses_closure_for_same_topology(
+    table_analyzer, glue_client, mocker
+):
+    def make_graph():
+        return {
+            "Nodes": [{"Id": "node1", "Type": "Trigger", "Name": "trigger"}],
+            "Edges": [],
+        }
+
+    closure = mocker.patch(
+        "aws_glue_workflow_analyzer.analyzer.table_analyzer.DownstreamClosure",
+        wraps=DownstreamClosure,
+    )
+
+    table_analyzer.get_affected_tables(make_graph(), "node1")
+    table_analyzer.get_affected_tables(make_graph(), "node1")
+
+    assert closure.call_count == 1
+
+
+def test_get_affected_tables_fetches_each_definition_once(table_analyzer, glue_client):
+    graph = {
+        "Nodes": [
+            {"Id": "node1", "Type": "Job", "Name": "test_job"},
+            {"Id": "node2", "Type": "Crawler", "Name": "test_crawler"},
+        ],
+        "Edges": [{"SourceId": "node1", "DestinationId": "node2"}],
+    }
+    with patch.object(
+        glue_client,
+        "get_job",
+        return_value={
+            "Job": {
+                "Name": "test_job",
+                "OutputDataConfig": {"S3Outputs": [{"S3Uri": "s3://bucket/table1"}]},
+            }
+        },
+    ) as get_job, patch.object(
+        glue_client,
+        "get_crawler",
+        return_value={
+            "Crawler": {
+                "Name": "test_crawler",
+                "Targets": {"S3Targets": [{"Path": "s3://bucket/table2"}]},
+            }
+        },
+    ) as get_crawler:
+        for _ in range(3):
+            assert sorted(table_analyzer.get_affected_tables(graph, "node1")) == [
+                "table1",
+                "table2",
+            ]
+            table_analyzer.get_affected_tables(graph, "node2")
+
+    assert get_job.call_count == 1
+    assert get_crawler.call_count == 1
+    assert table_analyzer.definition_cache.stats.misses == 2
+
+
+def test_get_affected_tables_reads_definitions_from_disk_cache(glue_client, tmp_path):
+    graph = {
+        "Nodes": [{"Id": "node1", "Type": "Job", "Name": "test_job"}],
+        "Edges": [],
+    }
+    with patch.object(
+        glue_client,
+        "get_job",
+        return_value={
+            "Job": {
+                "Name": "test_job",
+                "OutputDataConfig": {"S3Outputs": [{"S3Uri": "s3://bucket/table1"}]},
+            }
+        },
+    ) as get_job:
+        for _ in range(2):
+            analyzer = TableAnalyzer(glue_client, disk_cache=DiskCache(str(tmp_path)))
+            assert analyzer.get_affected_tables(graph, "node1") == ["table1"]
+
+    assert get_job.call_count == 1
+
+
+def test_prefetch_definitions_batches_lookups(table_analyzer, glue_client):
+    graphs = [
+        {
+            "Nodes": [
+                {"Id": f"job{index}", "Type": "Job", "Name": f"job{index}"}
+                for index in range(150)
+            ]
+            + [
+                {"Id": "crawler", "Type": "Crawler", "Name": "test_crawler"},
+                {"Id": "trigger", "Type": "Trigger", "Name": "test_trigger"},
+            ]
+        },
+        {"Nodes": [{"Id": "job0", "Type": "Job", "Name": "job0"}]},
+    ]
+    with patch.object(
+        glue_client,
+        "batch_get_jobs",
+        side_effect=lambda JobNames: {
+            "Jobs": [
+                {
+                    "Name": name,
+                    "OutputDataConfig": {
+                        "S3Outputs": [{"S3Uri": f"s3://bucket/{name}_table"}]
+                    },
+                }
+                for name in JobNames
+            ],
+            "JobsNotFound": [],
+        },
+    ) as batch_get_jobs, patch.object(
+        glue_client,
+        "batch_get_crawlers",
+        return_value={"Crawlers": [], "CrawlersNotFound": ["test_crawler"]},
+    ) as batch_get_crawlers, patch.object(
+        glue_client, "get_job"
+    ) as get_job:
+        table_analyzer.prefetch_definitions(graphs, max_workers=2)
+        table_analyzer.prefetch_definitions(graphs)
+        assert table_analyzer.get_affected_tables(graphs[1], "job0") == ["job0_table"]
+
+    assert [len(call.kwargs["JobNames"]) for call in batch_get_jobs.call_args_list] == [
+        100,
+        50,
+    ]
+    assert batch_get_crawlers.call_count == 2
+    assert get_job.call_count == 0
+
+
+def test_prefetch_definitions_api_failure(table_analyzer, glue_client):
+    graph = {"Nodes": [{"Id": "node1", "Type": "Job", "Name": "test_job"}]}
+    with patch.object(
+        glue_client,
+        "batch_get_jobs",
+        side_effect=ClientError(
+            {"Error": {"Code": "InternalServiceException", "Message": "boom"}},
+            "BatchGetJobs",
+        ),
+    ):
+        with pytest.raises(APIRequestError):
+            table_analyzer.prefetch_definitions([graph])
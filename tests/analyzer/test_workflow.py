@@ -1,12 +1,18 @@
+import asyncio
 import os
+from datetime import datetime, timedelta, timezone
 from unittest.mock import patch
 
 import pytest
 from botocore.exceptions import ClientError
 from moto import mock_glue, mock_logs
 
-from aws_glue_workflow_analyzer.analyzer.workflow import GlueWorkflowAnalyzer
-from aws_glue_workflow_analyzer.exceptions import APIRequestError
+from aws_glue_workflow_analyzer.analyzer.workflow import (
+    AnalyzerOptions,
+    GlueWorkflowAnalyzer,
+)
+from aws_glue_workflow_analyzer.exceptions import APIRequestError, PartialAnalysisError
+from aws_glue_workflow_analyzer.state import IncrementalState
 
 
 @pytest.fixture(autouse=True)
@@ -45,7 +51,7 @@ def test_analyze_workflows_success(glue_analyzer):
 
     # Mock the methods to return expected data
     with patch.object(
-        glue_analyzer.run_retriever, "get_workflow_runs", return_value=workflow_runs
+        glue_analyzer.run_retriever, "iter_workflow_runs", return_value=workflow_runs
     ), patch.object(
         glue_analyzer.step_details_collector,
         "get_step_execution_details",
@@ -64,7 +70,7 @@ def test_analyze_workflows_client_error(glue_analyzer):
     """Test handling of ClientError in analyze_workflows."""
     with patch.object(
         glue_analyzer.run_retriever,
-        "get_workflow_runs",
+        "iter_workflow_runs",
         side_effect=ClientError({"Error": {}}, "GetWorkflowRuns"),
     ):
         with pytest.raises(APIRequestError):
@@ -75,7 +81,7 @@ def test_analyze_workflows_api_request_error(glue_analyzer):
     """Test handling of APIRequestError in analyze_workflows."""
     with patch.object(
         glue_analyzer.run_retriever,
-        "get_workflow_runs",
+        "iter_workflow_runs",
         side_effect=APIRequestError("Failed request"),
     ):
         with pytest.raises(APIRequestError):
@@ -86,7 +92,7 @@ def test_analyze_workflows_no_runs(glue_analyzer):
     """Test handling of workflows with no runs."""
     # Mock the methods to return no workflow runs
     with patch.object(
-        glue_analyzer.run_retriever, "get_workflow_runs", return_value=[]
+        glue_analyzer.run_retriever, "iter_workflow_runs", return_value=[]
     ):
         # Call the method
         result = glue_analyzer.analyze_workflows(["test-workflow"], days=30)
@@ -112,7 +118,7 @@ def test_analyze_workflows_partial_failure(glue_analyzer):
 
     # Mock the methods to simulate a failure on the second step
     with patch.object(
-        glue_analyzer.run_retriever, "get_workflow_runs", return_value=workflow_runs
+        glue_analyzer.run_retriever, "iter_workflow_runs", return_value=workflow_runs
     ), patch.object(
         glue_analyzer.step_details_collector,
         "get_step_execution_details",
@@ -130,3 +136,382 @@ def test_analyze_workflows_empty_workflows(glue_analyzer):
 
     # Assertions
     assert result == []
+
+
+@pytest.fixture
+def concurrent_glue_analyzer():
+    """Fixture for initializing GlueWorkflowAnalyzer with a thread pool."""
+    with mock_glue():
+        with mock_logs():
+            analyzer = GlueWorkflowAnalyzer(AnalyzerOptions(max_workers=4))
+            yield analyzer
+
+
+def test_analyze_workflows_concurrent_preserves_order(concurrent_glue_analyzer):
+    """Test that concurrent analysis returns steps in workflow, run and node order."""
+
+    def get_workflow_runs(workflow_name, days):
+        return [
+            {
+                "Graph": {
+                    "Nodes": [
+                        {"Id": f"{workflow_name}-{run}-node{index}", "Type": "Job"}
+                        for index in range(3)
+                    ]
+                },
+                "RunId": f"{workflow_name}-{run}",
+            }
+            for run in range(2)
+        ]
+
+    def get_step_execution_details(workflow_name, workflow_run, node):
+        return {"node_id": node["Id"]}
+
+    with patch.object(
+        concurrent_glue_analyzer.run_retriever,
+        "iter_workflow_runs",
+        side_effect=get_workflow_runs,
+    ), patch.object(
+        concurrent_glue_analyzer.step_details_collector,
+        "get_step_execution_details",
+        side_effect=get_step_execution_details,
+    ):
+        result = concurrent_glue_analyzer.analyze_workflows(["wf1", "wf2"], days=30)
+
+    assert [step["node_id"] for step in result] == [
+        f"{workflow}-{run}-node{index}"
+        for workflow in ["wf1", "wf2"]
+        for run in range(2)
+        for index in range(3)
+    ]
+
+
+def test_analyze_workflows_unexpected_step_error_is_item_error(glue_analyzer):
+    """Test that a step failing with a non-AWS error does not abort the other steps."""
+    workflow_runs = [
+        {"Graph": {"Nodes": [{"Id": "node1"}, {"Id": "node2"}]}, "RunId": "run1"}
+    ]
+
+    def get_step_execution_details(workflow_name, workflow_run, node):
+        if node["Id"] == "node1":
+            raise KeyError("Type")
+        return {"node_id": node["Id"]}
+
+    with patch.object(
+        glue_analyzer.run_retriever, "iter_workflow_runs", return_value=workflow_runs
+    ), patch.object(
+        glue_analyzer.step_details_collector,
+        "get_step_execution_details",
+        side_effect=get_step_execution_details,
+    ):
+        with pytest.raises(PartialAnalysisError) as exc_info:
+            glue_analyzer.analyze_workflows(["wf1"], days=30)
+
+    assert exc_info.value.results == [{"node_id": "node2"}]
+    [error] = exc_info.value.errors
+    assert isinstance(error, APIRequestError)
+    assert isinstance(error.__cause__, KeyError)
+
+
+def test_analyze_workflows_concurrent_partial_failure(concurrent_glue_analyzer):
+    """Test that failing workflows and steps do not abort the rest of the batch."""
+    workflow_runs = [
+        {
+            "Graph": {
+                "Nodes": [
+                    {"Id": "node1", "Type": "Job"},
+                    {"Id": "node2", "Type": "Crawler"},
+                ]
+            },
+            "RunId": "run1",
+        }
+    ]
+
+    def get_workflow_runs(workflow_name, days):
+        if workflow_name == "broken-workflow":
+            raise ClientError({"Error": {}}, "GetWorkflowRuns")
+        return workflow_runs
+
+    def get_step_execution_details(workflow_name, workflow_run, node):
+        if node["Id"] == "node1":
+            raise APIRequestError("Failed step")
+        return {"node_id": node["Id"]}
+
+    with patch.object(
+        concurrent_glue_analyzer.run_retriever,
+        "iter_workflow_runs",
+        side_effect=get_workflow_runs,
+    ), patch.object(
+        concurrent_glue_analyzer.step_details_collector,
+        "get_step_execution_details",
+        side_effect=get_step_execution_details,
+    ):
+        with pytest.raises(PartialAnalysisError) as exc_info:
+            concurrent_glue_analyzer.analyze_workflows(
+                ["broken-workflow", "test-workflow"], days=30
+            )
+
+    assert exc_info.value.results == [{"node_id": "node2"}]
+    assert len(exc_info.value.errors) == 2
+
+
+def test_analyze_workflows_async_matches_sync(glue_analyzer):
+    """Test that the coroutine API returns the same records as the synchronous one."""
+    workflow_runs = [
+        {
+            "Graph": {
+                "Nodes": [
+                    {"Id": "node1", "Type": "Job", "Name": "job1"},
+                    {"Id": "node2", "Type": "Crawler", "Name": "crawler1"},
+                ]
+            },
+            "RunId": "run1",
+        }
+    ]
+
+    with patch.object(
+        glue_analyzer.run_retriever, "iter_workflow_runs", return_value=workflow_runs
+    ), patch.object(
+        glue_analyzer.table_analyzer, "get_affected_tables", return_value=["table1"]
+    ):
+        sync_result = glue_analyzer.analyze_workflows(["wf1", "wf2"], days=30)
+        async_result = asyncio.run(
+            glue_analyzer.analyze_workflows_async(["wf1", "wf2"], days=30)
+        )
+
+    assert async_result == sync_result
+    assert [step["node_id"] for step in async_result] == [
+        "node1",
+        "node2",
+        "node1",
+        "node2",
+    ]
+
+
+def test_analyze_workflows_async_partial_failure(glue_analyzer):
+    """Test that the coroutine API surfaces failures without aborting the batch."""
+
+    def get_workflow_runs(workflow_name, days):
+        if workflow_name == "broken-workflow":
+            raise APIRequestError("Failed request")
+        return [
+            {
+                "Graph": {"Nodes": [{"Id": "node1", "Type": "Job", "Name": "job1"}]},
+                "RunId": "run1",
+            }
+        ]
+
+    with patch.object(
+        glue_analyzer.run_retriever,
+        "iter_workflow_runs",
+        side_effect=get_workflow_runs,
+    ), patch.object(
+        glue_analyzer.table_analyzer, "get_affected_tables", return_value=[]
+    ):
+        with pytest.raises(PartialAnalysisError) as exc_info:
+            asyncio.run(
+                glue_analyzer.analyze_workflows_async(
+                    ["broken-workflow", "test-workflow"], days=30
+                )
+            )
+
+    assert [step["node_id"] for step in exc_info.value.results] == ["node1"]
+    assert len(exc_info.value.errors) == 1
+
+
+def test_iter_step_details_collects_errors(glue_analyzer):
+    """Test that streamed analysis appends failures to the given errors list."""
+    workflow_runs = [
+        {
+            "Graph": {
+                "Nodes": [
+                    {"Id": "node1", "Type": "Job"},
+                    {"Id": "node2", "Type": "Crawler"},
+                ]
+            },
+            "RunId": "run1",
+        }
+    ]
+    errors = []
+
+    with patch.object(
+        glue_analyzer.run_retriever, "iter_workflow_runs", return_value=workflow_runs
+    ), patch.object(
+        glue_analyzer.step_details_collector,
+        "get_step_execution_details",
+        side_effect=[APIRequestError("Failed step"), {"step": "details"}],
+    ):
+        steps = glue_analyzer.iter_step_details(["test-workflow"], 30, errors)
+        assert next(steps) == {"step": "details"}
+        assert len(errors) == 1
+        assert list(steps) == []
+
+
+def test_iter_step_details_failed_run_is_analyzed_again(tmp_path):
+    """Test that a run with a failed step does not move the incremental mark."""
+    state = IncrementalState(str(tmp_path / "state.json"))
+    workflow_run = {
+        "Graph": {"Nodes": [{"Id": "node1", "Type": "Job"}]},
+        "RunId": "run1",
+        "StartedOn": datetime(2024, 1, 1, tzinfo=timezone.utc),
+        "Status": "COMPLETED",
+    }
+    with mock_glue(), mock_logs():
+        analyzer = GlueWorkflowAnalyzer(incremental_state=state)
+        with patch.object(
+            analyzer.run_retriever, "iter_workflow_runs", return_value=[workflow_run]
+        ), patch.object(
+            analyzer.step_details_collector,
+            "get_step_execution_details",
+            side_effect=[APIRequestError("Failed step"), {"step": "details"}],
+        ):
+            errors = []
+            assert list(analyzer.iter_step_details(["test-workflow"], 30, errors)) == []
+            assert len(errors) == 1
+            state.commit()
+            assert state.get_mark("test-workflow") is None
+
+            errors = []
+            assert list(analyzer.iter_step_details(["test-workflow"], 30, errors)) == [
+                {"step": "details"}
+            ]
+            assert errors == []
+            state.commit()
+
+    assert IncrementalState(state.path).get_mark("test-workflow").run_id == "run1"
+
+
+def test_iter_step_details_raises_without_errors_list(glue_analyzer):
+    """Test that streamed analysis raises collected failures once exhausted."""
+    with patch.object(
+        glue_analyzer.run_retriever,
+        "iter_workflow_runs",
+        side_effect=APIRequestError("Failed request"),
+    ):
+        with pytest.raises(PartialAnalysisError):
+            list(glue_analyzer.iter_step_details(["test-workflow"], 30))
+
+
+def test_iter_step_details_insights_prefetches_batches():
+    """Test that the insights strategy searches the logs of each batch of runs once."""
+    with mock_glue(), mock_logs():
+        analyzer = GlueWorkflowAnalyzer(
+            AnalyzerOptions(log_strategy="insights", prefetch_batch_size=2)
+        )
+    started_on = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    workflow_runs = [
+        {
+            "Graph": {"Nodes": [{"Id": f"run{run}-node{index}"} for index in range(2)]},
+            "RunId": f"run{run}",
+            "LogGroup": "group",
+            "LogStream": f"stream{run}",
+            "StartedOn": started_on,
+            "CompletedOn": started_on + timedelta(minutes=5),
+        }
+        for run in range(3)
+    ]
+
+    with patch.object(
+        analyzer.run_retriever, "iter_workflow_runs", return_value=workflow_runs
+    ), patch.object(
+        analyzer.error_context_retriever, "prefetch_error_contexts"
+    ) as prefetch, patch.object(
+        analyzer.step_details_collector,
+        "get_step_execution_details",
+        side_effect=lambda workflow_name, workflow_run, node: {"node_id": node["Id"]},
+    ):
+        result = list(analyzer.iter_step_details(["wf1"], days=30))
+
+    assert len(result) == 6
+    assert [
+        sorted(log_request[1] for log_request in call.args[0])
+        for call in prefetch.call_args_list
+    ] == [["stream0", "stream1"], ["stream2"]]
+
+
+def test_iter_step_details_prefetches_definitions(glue_analyzer):
+    """Test that the definitions of each batch of runs are resolved before its steps."""
+    workflow_runs = [
+        {"Graph": {"Nodes": [{"Id": "node1", "Type": "Job", "Name": "job1"}]}},
+        {"Graph": {"Nodes": [{"Id": "node2", "Type": "Job", "Name": "job2"}]}},
+    ]
+
+    with patch.object(
+        glue_analyzer.run_retriever, "iter_workflow_runs", return_value=workflow_runs
+    ), patch.object(
+        glue_analyzer.table_analyzer,
+        "prefetch_definitions",
+        side_effect=APIRequestError("Failed batch"),
+    ) as prefetch, patch.object(
+        glue_analyzer.step_details_collector,
+        "get_step_execution_details",
+        side_effect=lambda workflow_name, workflow_run, node: {"node_id": node["Id"]},
+    ):
+        result = list(glue_analyzer.iter_step_details(["wf1"], days=30))
+
+    assert result == [{"node_id": "node1"}, {"node_id": "node2"}]
+    assert prefetch.call_count == 1
+    assert list(prefetch.call_args.args[0]) == [
+        workflow_run["Graph"] for workflow_run in workflow_runs
+    ]
+
+
+def test_iter_step_details_unexpected_prefetch_error_degrades(glue_analyzer):
+    """Test that any failure of the batched lookups falls back to per-node lookups."""
+    workflow_runs = [
+        {"Graph": {"Nodes": [{"Id": "node1", "Type": "Job", "Name": "job1"}]}},
+    ]
+    errors = []
+
+    with patch.object(
+        glue_analyzer.run_retriever, "iter_workflow_runs", return_value=workflow_runs
+    ), patch.object(
+        glue_analyzer.table_analyzer,
+        "prefetch_definitions",
+        side_effect=KeyError("Jobs"),
+    ), patch.object(
+        glue_analyzer.step_details_collector,
+        "get_step_execution_details",
+        side_effect=lambda workflow_name, workflow_run, node: {"node_id": node["Id"]},
+    ):
+        result = list(glue_analyzer.iter_step_details(["wf1"], 30, errors))
+
+    assert result == [{"node_id": "node1"}]
+    assert errors == []
+
+
+def test_iter_step_details_skips_prefetch_of_healthy_runs(glue_analyzer):
+    """Test that runs without failed steps are reported without prefetching anything."""
+    workflow_runs = [
+        {
+            "RunId": "run1",
+            "Statistics": {"FailedActions": 0},
+            "Graph": {
+                "Nodes": [
+                    {
+                        "Id": "node1",
+                        "Type": "Job",
+                        "Name": "job1",
+                        "Status": "SUCCEEDED",
+                    },
+                    {"Id": "node2", "Type": "Trigger", "Name": "trigger1"},
+                ]
+            },
+        }
+    ]
+
+    with patch.object(
+        glue_analyzer.run_retriever, "iter_workflow_runs", return_value=workflow_runs
+    ), patch.object(
+        glue_analyzer.table_analyzer, "prefetch_definitions"
+    ) as prefetch, patch.object(
+        glue_analyzer.error_context_retriever, "get_error_context"
+    ) as get_error_context, patch.object(
+        glue_analyzer.table_analyzer, "get_affected_tables"
+    ) as get_affected_tables:
+        result = list(glue_analyzer.iter_step_details(["wf1"], days=30))
+
+    assert [step["execution_status"] for step in result] == ["SUCCEEDED", "UNKNOWN"]
+    prefetch.assert_not_called()
+    get_error_context.assert_not_called()
+    get_affected_tables.assert_not_called()
@@ -0,0 +1,106 @@
+import threading
+import time
+
+import pytest
+
+from aws_glue_workflow_analyzer.cache import CacheStats, TTLCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+def test_get_or_load_caches_values(clock):
+    cache = TTLCache(clock=clock)
+    calls = []
+
+    def load():
+        calls.append(1)
+        return "value"
+
+    assert cache.get_or_load("key", load) == "value"
+    assert cache.get_or_load("key", load) == "value"
+    assert len(calls) == 1
+    assert cache.stats == CacheStats(hits=1, misses=1)
+
+
+def test_entries_expire_after_ttl(clock):
+    cache = TTLCache(ttl=10, clock=clock)
+    cache.put("key", "old")
+
+    clock.now = 9.9
+    assert cache.get_or_load("key", lambda: "new") == "old"
+    clock.now = 10
+    assert cache.get_or_load("key", lambda: "new") == "new"
+    assert cache.stats.expirations == 1
+
+
+def test_least_recently_used_entry_is_evicted(clock):
+    cache = TTLCache(max_entries=2, clock=clock)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.get_or_load("a", lambda: None)
+    cache.put("c", 3)
+
+    assert len(cache) == 2
+    assert cache.get_or_load("a", lambda: "reloaded") == 1
+    assert cache.get_or_load("c", lambda: "reloaded") == 3
+    assert cache.get_or_load("b", lambda: "reloaded") == "reloaded"
+    assert cache.stats.evictions == 2
+
+
+def test_invalidate_and_clear(clock):
+    cache = TTLCache(clock=clock)
+    cache.put("a", 1)
+    cache.put("b", 2)
+
+    assert cache.invalidate("a") is True
+    assert cache.invalidate("a") is False
+    assert cache.get_or_load("a", lambda: "reloaded") == "reloaded"
+    cache.clear()
+    assert len(cache) == 0
+
+
+def test_failed_loads_are_not_cached(clock):
+    cache = TTLCache(clock=clock)
+
+    def fail():
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError):
+        cache.get_or_load("key", fail)
+    assert cache.get_or_load("key", lambda: "value") == "value"
+
+
+def test_concurrent_loads_run_once():
+    cache = TTLCache()
+    calls = []
+    started = threading.Event()
+
+    def load():
+        calls.append(1)
+        started.set()
+        time.sleep(0.05)
+        return "value"
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(cache.get_or_load("key", load)))
+        for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == ["value"] * 8
+    assert len(calls) == 1
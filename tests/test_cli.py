@@ -2,7 +2,7 @@ import sys
 
 import pytest
 
-from aws_glue_workflow_analyzer.cli import parse_args
+from aws_glue_workflow_analyzer.cli import parse_args, parse_query_args
 
 
 def test_parse_args_workflows_required():
@@ -57,6 +57,60 @@ def test_parse_args_defaults():
     assert args.days == 30
     assert args.output == "."
     assert args.format == "json"
+    assert args.max_workers == 1
+    assert args.two_phase_runs is False
+    assert args.static_graph is False
+    assert args.log_strategy == "scan"
+    assert args.tail_max_events == 10000
+    assert args.tail_max_bytes == 10 * 1024 * 1024
+    assert args.cache_dir is None
+    assert args.cache_ttl == 3600.0
+    assert args.incremental is False
+    assert args.enrich_statuses == [
+        "FAILED",
+        "STOPPED",
+        "TIMEOUT",
+        "ERROR",
+        "CANCELLED",
+    ]
+    assert args.enrich_all is False
+    assert args.row_group_size == 100000
+    assert args.shard_size_mb is None
+    assert args.compress is None
+    assert args.compress_level is None
+    assert args.state_file == "gwfa-state.json"
+
+
+def test_parse_args_with_max_workers():
+    """Test parsing with optional max workers argument."""
+    test_args = ["-w", "workflow1", "--max-workers", "8"]
+    sys.argv = ["gwfa"] + test_args
+    args = parse_args()
+    assert args.max_workers == 8
+
+
+def test_parse_args_with_two_phase_runs():
+    """Test parsing with the two-phase run retrieval flag."""
+    test_args = ["-w", "workflow1", "--two-phase-runs"]
+    sys.argv = ["gwfa"] + test_args
+    args = parse_args()
+    assert args.two_phase_runs is True
+
+
+def test_parse_args_with_static_graph():
+    """Test parsing with the static graph flag."""
+    test_args = ["-w", "workflow1", "--static-graph"]
+    sys.argv = ["gwfa"] + test_args
+    args = parse_args()
+    assert args.static_graph is True
+
+
+def test_parse_args_with_log_strategy():
+    """Test parsing with the log strategy argument."""
+    test_args = ["-w", "workflow1", "--log-strategy", "filter"]
+    sys.argv = ["gwfa"] + test_args
+    args = parse_args()
+    assert args.log_strategy == "filter"
 
 
 def test_parse_args_with_all_options():
@@ -78,3 +132,69 @@ def test_parse_args_with_all_options():
     assert args.days == 7
     assert args.output == "results.json"
     assert args.format == "csv"
+
+
+def test_parse_args_with_tail_budget():
+    """Test parsing with the tail log strategy and its budget."""
+    test_args = [
+        "-w",
+        "workflow1",
+        "--log-strategy",
+        "tail",
+        "--tail-max-events",
+        "500",
+        "--tail-max-bytes",
+        "65536",
+    ]
+    sys.argv = ["gwfa"] + test_args
+    args = parse_args()
+    assert args.log_strategy == "tail"
+    assert args.tail_max_events == 500
+    assert args.tail_max_bytes == 65536
+
+
+def test_parse_args_with_cache_dir():
+    """Test parsing with the persistent cache arguments."""
+    test_args = ["-w", "workflow1", "--cache-dir", "/tmp/gwfa", "--cache-ttl", "600"]
+    sys.argv = ["gwfa"] + test_args
+    args = parse_args()
+    assert args.cache_dir == "/tmp/gwfa"
+    assert args.cache_ttl == 600.0
+
+
+@pytest.mark.parametrize(
+    "test_args",
+    [
+        ["--compress", "gzip", "--compress-level", "15"],
+        ["--compress", "zstd", "--compress-level", "99"],
+        ["-f", "parquet", "--compress-level", "5"],
+    ],
+)
+def test_parse_args_rejects_invalid_compress_level(test_args):
+    """Test that compression levels are checked against the compression format."""
+    sys.argv = ["gwfa", "-w", "workflow1"] + test_args
+    with pytest.raises(SystemExit):
+        parse_args()
+
+
+def test_parse_args_help_mentions_query(capsys):
+    """Test that the main help documents the query subcommand."""
+    sys.argv = ["gwfa", "--help"]
+    with pytest.raises(SystemExit):
+        parse_args()
+    assert "gwfa query <database>" in capsys.readouterr().out
+
+
+def test_parse_query_args():
+    """Test parsing the arguments of the query subcommand."""
+    args = parse_query_args(["results.sqlite3"])
+    assert args.database == "results.sqlite3"
+    assert args.group_by == ["workflow", "node"]
+    assert args.sql is None
+
+    args = parse_query_args(
+        ["results.sqlite3", "-g", "day", "--node", "job1", "--since", "2024-01-01"]
+    )
+    assert args.group_by == ["day"]
+    assert args.node == "job1"
+    assert args.since == "2024-01-01"
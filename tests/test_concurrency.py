@@ -0,0 +1,208 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from aws_glue_workflow_analyzer.concurrency import (
+    AsyncExecutor,
+    SingleFlight,
+    iter_flattened,
+    iter_ordered,
+)
+
+
+def test_iter_ordered_serial():
+    """Test that iter_ordered runs tasks inline when max_workers is 1."""
+    outcomes = list(iter_ordered(lambda item: item * 2, [1, 2, 3]))
+
+    assert [outcome.result for outcome in outcomes] == [2, 4, 6]
+    assert all(outcome.error is None for outcome in outcomes)
+
+
+@pytest.mark.parametrize("max_workers", [1, 4])
+def test_iter_ordered_preserves_input_order(max_workers):
+    """Test that outcomes are yielded in input order regardless of completion order."""
+
+    def task(item):
+        time.sleep(0.001 * (10 - item))
+        return item
+
+    outcomes = list(iter_ordered(task, range(10), max_workers=max_workers))
+
+    assert [outcome.item for outcome in outcomes] == list(range(10))
+    assert [outcome.result for outcome in outcomes] == list(range(10))
+
+
+@pytest.mark.parametrize("max_workers", [1, 4])
+def test_iter_ordered_captures_errors(max_workers):
+    """Test that a failing task does not abort the remaining items."""
+
+    def task(item):
+        if item == 2:
+            raise ValueError("boom")
+        return item
+
+    outcomes = list(iter_ordered(task, range(5), max_workers=max_workers))
+
+    assert [outcome.result for outcome in outcomes] == [0, 1, None, 3, 4]
+    assert isinstance(outcomes[2].error, ValueError)
+
+
+def test_iter_ordered_runs_concurrently():
+    """Test that tasks run on multiple threads when max_workers is greater than 1."""
+    barrier = threading.Barrier(3, timeout=5)
+
+    outcomes = list(iter_ordered(lambda item: barrier.wait(), range(3), max_workers=3))
+
+    assert all(outcome.error is None for outcome in outcomes)
+
+
+def test_iter_ordered_consumes_items_lazily():
+    """Test that the number of items pulled ahead of the consumer is bounded."""
+    pulled = []
+
+    def items():
+        for item in range(100):
+            pulled.append(item)
+            yield item
+
+    outcomes = iter_ordered(lambda item: item, items(), max_workers=2)
+    next(outcomes)
+    outcomes.close()
+
+    assert len(pulled) <= 5
+
+
+def test_async_executor_bounds_concurrency():
+    """Test that AsyncExecutor never runs more calls than max_concurrency at once."""
+    lock = threading.Lock()
+    running = []
+    peak = []
+
+    def blocking_call(item):
+        with lock:
+            running.append(item)
+            peak.append(len(running))
+        time.sleep(0.01)
+        with lock:
+            running.remove(item)
+        return item * 2
+
+    async def run_all():
+        executor = AsyncExecutor(max_concurrency=3)
+        try:
+            return await asyncio.gather(
+                *(executor.run(blocking_call, item) for item in range(20))
+            )
+        finally:
+            executor.close()
+
+    results = asyncio.run(run_all())
+
+    assert results == [item * 2 for item in range(20)]
+    assert max(peak) <= 3
+
+
+@pytest.mark.parametrize("max_workers", [1, 3])
+def test_iter_flattened_preserves_order(max_workers):
+    """Test that elements are yielded in item order, then in production order."""
+
+    def produce(item):
+        for index in range(5):
+            time.sleep(0.001 * (3 - item))
+            yield f"{item}-{index}"
+
+    outcomes = list(iter_flattened(produce, range(3), max_workers=max_workers))
+
+    assert [outcome.result for outcome in outcomes] == [
+        f"{item}-{index}" for item in range(3) for index in range(5)
+    ]
+    assert [outcome.item for outcome in outcomes] == [
+        item for item in range(3) for _ in range(5)
+    ]
+
+
+@pytest.mark.parametrize("max_workers", [1, 3])
+def test_iter_flattened_captures_errors(max_workers):
+    """Test that a failing producer yields an error outcome after its elements."""
+
+    def produce(item):
+        yield item
+        if item == 1:
+            raise ValueError("boom")
+
+    outcomes = list(iter_flattened(produce, range(3), max_workers=max_workers))
+
+    assert [outcome.result for outcome in outcomes] == [0, 1, None, 2]
+    assert isinstance(outcomes[2].error, ValueError)
+
+
+def test_iter_flattened_bounds_buffered_elements():
+    """Test that producers running ahead of the consumer stop at the buffer size."""
+    produced = []
+
+    def produce(item):
+        for index in range(1000):
+            produced.append((item, index))
+            yield index
+
+    outcomes = iter_flattened(produce, range(2), max_workers=2, buffer_size=10)
+    next(outcomes)
+    time.sleep(0.2)
+    outcomes.close()
+
+    assert len(produced) <= 2 * 12
+
+
+def test_single_flight_runs_concurrent_calls_once():
+    """Test that concurrent requests for the same key share a single call."""
+    single_flight = SingleFlight()
+    calls = []
+    started = threading.Event()
+
+    def slow_call():
+        calls.append(1)
+        started.set()
+        time.sleep(0.05)
+        return "value"
+
+    outcomes = list(
+        iter_ordered(
+            lambda _: single_flight.do("key", slow_call), range(8), max_workers=8
+        )
+    )
+
+    assert [outcome.result for outcome in outcomes] == ["value"] * 8
+    assert len(calls) == 1
+
+
+def test_single_flight_does_not_memoize_failures():
+    """Test that a failed call is retried by the next request."""
+    single_flight = SingleFlight()
+    results = iter([ValueError("boom"), "value"])
+
+    def call():
+        result = next(results)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    with pytest.raises(ValueError):
+        single_flight.do("key", call)
+    assert single_flight.do("key", call) == "value"
+
+
+def test_single_flight_evicts_least_recently_used():
+    """Test that only max_entries results are kept."""
+    single_flight = SingleFlight(max_entries=2)
+    calls = []
+
+    def call(key):
+        calls.append(key)
+        return key
+
+    for key in ["a", "b", "a", "c", "a", "b"]:
+        single_flight.do(key, lambda key=key: call(key))
+
+    assert calls == ["a", "b", "c", "b"]
@@ -0,0 +1,111 @@
+import datetime
+import sqlite3
+
+import pytest
+
+from aws_glue_workflow_analyzer.disk_cache import DiskCache
+from aws_glue_workflow_analyzer.exceptions import WorkflowAnalyzerError
+
+MODIFIED = datetime.datetime(2024, 1, 1, tzinfo=datetime.timezone.utc)
+
+
+@pytest.fixture
+def disk_cache(tmp_path):
+    cache = DiskCache(str(tmp_path / "cache"))
+    yield cache
+    cache.close()
+
+
+def completed_run(run_id, **overrides):
+    run = {
+        "RunId": run_id,
+        "Status": "COMPLETED",
+        "StartedOn": MODIFIED,
+        "CompletedOn": MODIFIED + datetime.timedelta(minutes=5),
+        "Graph": {"Nodes": [{"Id": "node1"}], "Edges": []},
+    }
+    run.update(overrides)
+    return run
+
+
+def test_definitions_persist_across_instances(disk_cache, tmp_path):
+    job = {"Name": "job", "LastModifiedOn": MODIFIED, "Command": {"Name": "glueetl"}}
+    disk_cache.put_definition("Job", "job", job)
+
+    reopened = DiskCache(str(tmp_path / "cache"))
+
+    assert reopened.get_definition("Job", "job") == job
+    assert reopened.get_definition("Crawler", "job") is None
+
+
+def test_definitions_in_caches_with_last_modified_column(tmp_path):
+    cache_dir = tmp_path / "cache"
+    cache_dir.mkdir()
+    connection = sqlite3.connect(str(cache_dir / "gwfa-cache.sqlite3"))
+    connection.execute(
+        "CREATE TABLE definitions (kind TEXT NOT NULL, name TEXT NOT NULL, "
+        "last_modified TEXT, body TEXT NOT NULL, validated_at REAL NOT NULL, "
+        "accessed_at REAL NOT NULL, PRIMARY KEY (kind, name))"
+    )
+    connection.close()
+    cache = DiskCache(str(cache_dir))
+
+    cache.put_definition("Job", "job", {"Name": "job"})
+
+    assert cache.get_definition("Job", "job") == {"Name": "job"}
+    cache.close()
+
+
+def test_definitions_expire_after_ttl(tmp_path, mocker):
+    cache = DiskCache(str(tmp_path), definition_ttl=60)
+    clock = mocker.patch("aws_glue_workflow_analyzer.disk_cache.time.time")
+    clock.return_value = 1000.0
+    cache.put_definition("Crawler", "crawler", {"Name": "crawler"})
+
+    clock.return_value = 1059.0
+    assert cache.get_definition("Crawler", "crawler") == {"Name": "crawler"}
+    clock.return_value = 1060.0
+    assert cache.get_definition("Crawler", "crawler") is None
+
+
+def test_only_completed_runs_are_stored(disk_cache):
+    assert disk_cache.put_run("wf", completed_run("run-1"))
+    assert not disk_cache.put_run("wf", completed_run("run-2", Status="RUNNING"))
+    assert not disk_cache.put_run("wf", completed_run("run-3", CompletedOn=None))
+
+    assert disk_cache.get_run("wf", "run-1") == completed_run("run-1")
+    assert disk_cache.get_run("wf", "run-2") is None
+    assert disk_cache.get_run("other", "run-1") is None
+
+
+def test_count_runs(disk_cache):
+    disk_cache.put_run("wf", completed_run("run-1"))
+    disk_cache.put_run("wf", completed_run("run-2"))
+    disk_cache.put_run("other", completed_run("run-3"))
+
+    assert disk_cache.count_runs("wf", ["run-1", "run-2", "run-3", "run-4"]) == 2
+    assert disk_cache.count_runs("wf", []) == 0
+
+
+def test_least_recently_used_runs_are_evicted(tmp_path, mocker):
+    cache = DiskCache(str(tmp_path), max_runs=2)
+    clock = mocker.patch("aws_glue_workflow_analyzer.disk_cache.time.time")
+    for index, run_id in enumerate(["run-1", "run-2"]):
+        clock.return_value = float(index)
+        cache.put_run("wf", completed_run(run_id))
+    clock.return_value = 2.0
+    cache.get_run("wf", "run-1")
+    clock.return_value = 3.0
+    cache.put_run("wf", completed_run("run-3"))
+
+    assert cache.get_run("wf", "run-2") is None
+    assert cache.get_run("wf", "run-1") is not None
+    assert cache.get_run("wf", "run-3") is not None
+
+
+def test_unusable_cache_dir(tmp_path):
+    path = tmp_path / "file"
+    path.write_text("not a directory")
+
+    with pytest.raises(WorkflowAnalyzerError):
+        DiskCache(str(path))
@@ -1,7 +1,17 @@
+import sys
 from unittest.mock import MagicMock, patch
 
 from aws_glue_workflow_analyzer.__main__ import main
-from aws_glue_workflow_analyzer.exceptions import WorkflowAnalyzerError
+from aws_glue_workflow_analyzer.cli import parse_args
+from aws_glue_workflow_analyzer.exceptions import APIRequestError, WorkflowAnalyzerError
+
+
+def make_args(**overrides):
+    """Builds parsed arguments with the CLI defaults, overriding the given ones."""
+    with patch.object(sys, "argv", ["gwfa", "-w", "workflow1"]):
+        args = parse_args()
+    vars(args).update(overrides)
+    return args
 
 
 @patch("aws_glue_workflow_analyzer.__main__.parse_args")
@@ -11,17 +21,24 @@ from aws_glue_workflow_analyzer.exceptions import WorkflowAnalyzerError
 def test_main_json_output(
     mock_console, mock_save_to_json, mock_analyzer, mock_parse_args
 ):
-    mock_parse_args.return_value = MagicMock(
+    mock_parse_args.return_value = make_args(
         workflows=["workflow1"], days=30, output="output.json", format="json"
     )
     mock_analyzer_instance = MagicMock()
     mock_analyzer.return_value = mock_analyzer_instance
-    mock_analyzer_instance.analyze_workflows.return_value = [{"key": "value"}]
+    mock_analyzer_instance.iter_step_details.return_value = iter([{"key": "value"}])
 
     main()
 
-    mock_analyzer_instance.analyze_workflows.assert_called_once_with(["workflow1"], 30)
-    mock_save_to_json.assert_called_once_with([{"key": "value"}], "output.json")
+    mock_analyzer_instance.iter_step_details.assert_called_once_with(
+        ["workflow1"], 30, []
+    )
+    mock_save_to_json.assert_called_once_with(
+        mock_analyzer_instance.iter_step_details.return_value,
+        "output.json",
+        compression=None,
+        compression_level=None,
+    )
     mock_console.print_json.assert_not_called()
 
 
@@ -32,17 +49,25 @@ def test_main_json_output(
 def test_main_csv_output(
     mock_console, mock_save_to_csv, mock_analyzer, mock_parse_args
 ):
-    mock_parse_args.return_value = MagicMock(
+    mock_parse_args.return_value = make_args(
         workflows=["workflow1"], days=30, output="output.csv", format="csv"
     )
     mock_analyzer_instance = MagicMock()
     mock_analyzer.return_value = mock_analyzer_instance
-    mock_analyzer_instance.analyze_workflows.return_value = [{"key": "value"}]
+    mock_analyzer_instance.iter_step_details.return_value = iter([{"key": "value"}])
 
     main()
 
-    mock_analyzer_instance.analyze_workflows.assert_called_once_with(["workflow1"], 30)
-    mock_save_to_csv.assert_called_once_with([{"key": "value"}], "output.csv")
+    mock_analyzer_instance.iter_step_details.assert_called_once_with(
+        ["workflow1"], 30, []
+    )
+    mock_save_to_csv.assert_called_once_with(
+        mock_analyzer_instance.iter_step_details.return_value,
+        "output.csv",
+        max_shard_bytes=None,
+        compression=None,
+        compression_level=None,
+    )
     mock_console.print_json.assert_not_called()
 
 
@@ -50,16 +75,18 @@ def test_main_csv_output(
 @patch("aws_glue_workflow_analyzer.__main__.GlueWorkflowAnalyzer")
 @patch("aws_glue_workflow_analyzer.__main__.console")
 def test_main_console_output(mock_console, mock_analyzer, mock_parse_args):
-    mock_parse_args.return_value = MagicMock(
+    mock_parse_args.return_value = make_args(
         workflows=["workflow1"], days=30, output=None, format="json"
     )
     mock_analyzer_instance = MagicMock()
     mock_analyzer.return_value = mock_analyzer_instance
-    mock_analyzer_instance.analyze_workflows.return_value = [{"key": "value"}]
+    mock_analyzer_instance.iter_step_details.return_value = iter([{"key": "value"}])
 
     main()
 
-    mock_analyzer_instance.analyze_workflows.assert_called_once_with(["workflow1"], 30)
+    mock_analyzer_instance.iter_step_details.assert_called_once_with(
+        ["workflow1"], 30, []
+    )
     mock_console.print_json.assert_called_once_with(data={"key": "value"})
 
 
@@ -67,12 +94,12 @@ def test_main_console_output(mock_console, mock_analyzer, mock_parse_args):
 @patch("aws_glue_workflow_analyzer.__main__.GlueWorkflowAnalyzer")
 @patch("aws_glue_workflow_analyzer.__main__.logger")
 def test_main_workflow_analyzer_error(mock_logger, mock_analyzer, mock_parse_args):
-    mock_parse_args.return_value = MagicMock(
+    mock_parse_args.return_value = make_args(
         workflows=["workflow1"], days=30, output=None, format="json"
     )
     mock_analyzer_instance = MagicMock()
     mock_analyzer.return_value = mock_analyzer_instance
-    mock_analyzer_instance.analyze_workflows.side_effect = WorkflowAnalyzerError(
+    mock_analyzer_instance.iter_step_details.side_effect = WorkflowAnalyzerError(
         "Test error"
     )
 
@@ -81,3 +108,154 @@ def test_main_workflow_analyzer_error(mock_logger, mock_analyzer, mock_parse_arg
     mock_logger.error.assert_called_once_with(
         "An error occurred during workflow analysis: Test error"
     )
+
+
+@patch("aws_glue_workflow_analyzer.__main__.parse_args")
+@patch("aws_glue_workflow_analyzer.__main__.GlueWorkflowAnalyzer")
+@patch("aws_glue_workflow_analyzer.__main__.save_to_json")
+@patch("aws_glue_workflow_analyzer.__main__.logger")
+def test_main_partial_analysis_error(
+    mock_logger, mock_save_to_json, mock_analyzer, mock_parse_args
+):
+    mock_parse_args.return_value = make_args(
+        workflows=["workflow1"],
+        days=30,
+        output="output.json",
+        format="json",
+        max_workers=4,
+    )
+    mock_analyzer_instance = MagicMock()
+    mock_analyzer.return_value = mock_analyzer_instance
+
+    def iter_step_details(workflow_names, days, errors):
+        yield {"key": "value"}
+        errors.append(APIRequestError("Failed step"))
+
+    mock_analyzer_instance.iter_step_details.side_effect = iter_step_details
+    mock_save_to_json.side_effect = lambda data, file_path, **kwargs: list(data)
+
+    main()
+
+    assert mock_analyzer.call_args.args[0].max_workers == 4
+    mock_save_to_json.assert_called_once()
+    mock_logger.error.assert_called_once_with(
+        "An error occurred during workflow analysis: 1 item(s) failed during workflow analysis."
+    )
+
+
+@patch("aws_glue_workflow_analyzer.__main__.parse_args")
+@patch("aws_glue_workflow_analyzer.__main__.GlueWorkflowAnalyzer")
+@patch("aws_glue_workflow_analyzer.__main__.IncrementalState")
+@patch("aws_glue_workflow_analyzer.__main__.save_to_json")
+def test_main_incremental_saves_state_after_writing(
+    mock_save_to_json, mock_state, mock_analyzer, mock_parse_args
+):
+    mock_parse_args.return_value = make_args(
+        output="output.json", incremental=True, state_file="state.json"
+    )
+
+    def save_to_json(data, file_path, **kwargs):
+        mock_state.return_value.commit.assert_not_called()
+        return True
+
+    mock_save_to_json.side_effect = save_to_json
+
+    main()
+
+    mock_state.assert_called_once_with("state.json")
+    assert (
+        mock_analyzer.call_args.kwargs["incremental_state"] is mock_state.return_value
+    )
+    mock_state.return_value.commit.assert_called_once_with()
+
+
+@patch("aws_glue_workflow_analyzer.__main__.parse_args")
+@patch("aws_glue_workflow_analyzer.__main__.GlueWorkflowAnalyzer")
+@patch("aws_glue_workflow_analyzer.__main__.IncrementalState")
+@patch("aws_glue_workflow_analyzer.__main__.save_to_json")
+def test_main_incremental_keeps_state_when_writing_fails(
+    mock_save_to_json, mock_state, mock_analyzer, mock_parse_args
+):
+    mock_parse_args.return_value = make_args(
+        output="output.json", incremental=True, state_file="state.json"
+    )
+    mock_save_to_json.return_value = False
+
+    main()
+
+    mock_state.return_value.commit.assert_not_called()
+
+
+@patch("aws_glue_workflow_analyzer.__main__.parse_args")
+@patch("aws_glue_workflow_analyzer.__main__.GlueWorkflowAnalyzer")
+@patch("aws_glue_workflow_analyzer.__main__.IncrementalState")
+@patch("aws_glue_workflow_analyzer.__main__.save_to_json")
+def test_main_incremental_keeps_state_on_errors(
+    mock_save_to_json, mock_state, mock_analyzer, mock_parse_args
+):
+    mock_parse_args.return_value = make_args(
+        output="output.json", incremental=True, state_file="state.json"
+    )
+    mock_save_to_json.return_value = True
+
+    def iter_step_details(workflows, days, errors):
+        errors.append(APIRequestError("Failed step"))
+        return iter([])
+
+    mock_analyzer.return_value.iter_step_details.side_effect = iter_step_details
+
+    main()
+
+    mock_state.return_value.commit.assert_not_called()
+
+
+@patch("aws_glue_workflow_analyzer.__main__.ResultStore")
+@patch("aws_glue_workflow_analyzer.__main__.console")
+def test_main_query(mock_console, mock_store):
+    mock_store.return_value.aggregate.return_value = (
+        ["workflow", "runs"],
+        [("wf1", 3), (None, 1)],
+    )
+
+    with patch.object(
+        sys, "argv", ["gwfa", "query", "results.sqlite3", "-g", "workflow"]
+    ):
+        main()
+
+    mock_store.assert_called_once_with("results.sqlite3", read_only=True)
+    assert mock_store.return_value.aggregate.call_args.kwargs["group_by"] == [
+        "workflow"
+    ]
+    mock_store.return_value.close.assert_called_once_with()
+    table = mock_console.print.call_args.args[0]
+    assert table.row_count == 2
+
+
+@patch("aws_glue_workflow_analyzer.__main__.ResultStore")
+@patch("aws_glue_workflow_analyzer.__main__.logger")
+def test_main_query_error(mock_logger, mock_store):
+    mock_store.side_effect = WorkflowAnalyzerError("missing store")
+
+    with patch.object(sys, "argv", ["gwfa", "query", "missing.sqlite3"]):
+        main()
+
+    mock_logger.error.assert_called_once_with(
+        "An error occurred while querying the result store: missing store"
+    )
+
+
+@patch("aws_glue_workflow_analyzer.__main__.parse_args")
+@patch("aws_glue_workflow_analyzer.__main__.GlueWorkflowAnalyzer")
+@patch("aws_glue_workflow_analyzer.__main__.save_to_json")
+def test_main_passes_enrichment_policy(
+    mock_save_to_json, mock_analyzer, mock_parse_args
+):
+    mock_parse_args.return_value = make_args(
+        output="output.json", enrich_statuses=["FAILED"], enrich_all=True
+    )
+
+    main()
+
+    policy = mock_analyzer.call_args.kwargs["enrichment_policy"]
+    assert policy.statuses == {"FAILED"}
+    assert policy.enrich_all is True
@@ -1,8 +1,21 @@
+import csv
+import datetime
+import gzip
+import json
+import sqlite3
+import sys
 from unittest.mock import mock_open, patch
 
 import pytest
 
-from aws_glue_workflow_analyzer.output import save_to_csv, save_to_json
+from aws_glue_workflow_analyzer.output import (
+    STEP_RECORD_FIELDS,
+    save_to_csv,
+    save_to_json,
+    save_to_jsonl,
+    save_to_parquet,
+    save_to_sqlite,
+)
 
 
 @pytest.fixture
@@ -46,10 +59,10 @@ def test_save_to_json_io_error(mock_logger, mock_file, sample_data):
 @patch("aws_glue_workflow_analyzer.output.open", new_callable=mock_open)
 @patch("aws_glue_workflow_analyzer.output.logger")
 def test_save_to_csv(mock_logger, mock_file, sample_data):
-    """Test saving data to a CSV file."""
+    """Test saving data to a CSV file with the given columns."""
     file_path = "test_output.csv"
 
-    save_to_csv(sample_data, file_path)
+    save_to_csv(sample_data, file_path, fieldnames=["Id", "Name", "Value"])
 
     mock_file.assert_called_once_with(file_path, "w", newline="", encoding="utf-8")
 
@@ -90,3 +103,316 @@ def test_save_to_csv_io_error(mock_logger, mock_file, sample_data):
     mock_logger.error.assert_called_once_with(
         "Failed to save analysis results to CSV: Failed to write to file"
     )
+
+
+@patch("aws_glue_workflow_analyzer.output.logger")
+def test_save_to_json_streams_generator(mock_logger, sample_data, tmp_path):
+    """Test that records from a generator are written as an indented JSON array."""
+    file_path = tmp_path / "test_output.json"
+
+    save_to_json((item for item in sample_data), str(file_path))
+
+    assert file_path.read_text(encoding="utf-8") == json.dumps(sample_data, indent=4)
+
+
+@patch("aws_glue_workflow_analyzer.output.logger")
+def test_save_to_json_empty_generator(mock_logger, tmp_path):
+    """Test that an empty generator produces an empty JSON array."""
+    file_path = tmp_path / "test_output.json"
+
+    save_to_json(iter([]), str(file_path))
+
+    assert json.loads(file_path.read_text(encoding="utf-8")) == []
+
+
+@patch("aws_glue_workflow_analyzer.output.logger")
+def test_save_to_csv_streams_generator(mock_logger, sample_data, tmp_path):
+    """Test that rows from a generator are written after the header."""
+    file_path = tmp_path / "test_output.csv"
+
+    save_to_csv(
+        (item for item in sample_data), str(file_path), fieldnames=["Id", "Name"]
+    )
+
+    assert file_path.read_text(encoding="utf-8").splitlines() == [
+        "Id,Name",
+        "item1,Test Item 1",
+        "item2,Test Item 2",
+    ]
+
+
+def test_save_to_sqlite(tmp_path):
+    """Test upserting streamed data into a SQLite result store."""
+    file_path = str(tmp_path / "results.sqlite3")
+    record = {"execution_id": "run1", "workflow_name": "wf1", "node_id": "node1"}
+
+    save_to_sqlite(iter([record, dict(record, node_id="node2")]), file_path)
+    save_to_sqlite(iter([dict(record, execution_status="FAILED")]), file_path)
+
+    with sqlite3.connect(file_path) as connection:
+        rows = connection.execute(
+            "SELECT node_id, execution_status FROM step_runs ORDER BY node_id"
+        ).fetchall()
+    assert rows == [("node1", "FAILED"), ("node2", None)]
+
+
+@patch("aws_glue_workflow_analyzer.output.logger")
+def test_save_to_sqlite_error(mock_logger, tmp_path):
+    """Test saving data to a SQLite result store that cannot be opened."""
+    save_to_sqlite([], str(tmp_path / "missing" / "results.sqlite3"))
+
+    mock_logger.error.assert_called_once()
+
+
+def make_step_record(index):
+    started_on = datetime.datetime(2024, 1, 1, tzinfo=datetime.timezone.utc)
+    return {
+        "execution_id": f"run{index}",
+        "workflow_name": "wf1",
+        "node_id": f"node{index}",
+        "node_type": "Job",
+        "node_name": "job1",
+        "execution_status": "FAILED",
+        "execution_start_timestamp": started_on,
+        "execution_end_timestamp": "",
+        "execution_duration": None if index else 12,
+        "error_message": "Traceback",
+        "affected_tables": ["table1", "table2"],
+        "log_group_name": "group",
+        "log_stream_name": "stream",
+        "execution_parameters": {"--day": "2024-01-01"},
+    }
+
+
+def test_save_to_parquet(tmp_path):
+    """Test streaming data into Parquet row groups with the fixed schema."""
+    pq = pytest.importorskip("pyarrow.parquet")
+    file_path = str(tmp_path / "results.parquet")
+
+    save_to_parquet((make_step_record(index) for index in range(5)), file_path, 2)
+
+    parquet_file = pq.ParquetFile(file_path)
+    assert parquet_file.metadata.num_row_groups == 3
+    assert parquet_file.schema_arrow.names == list(STEP_RECORD_FIELDS)
+    assert str(parquet_file.schema_arrow.field("affected_tables").type.value_type) == (
+        "string"
+    )
+    rows = parquet_file.read().to_pylist()
+    assert [row["execution_id"] for row in rows] == [f"run{i}" for i in range(5)]
+    assert rows[0]["execution_start_timestamp"] == datetime.datetime(
+        2024, 1, 1, tzinfo=datetime.timezone.utc
+    )
+    assert rows[0]["execution_end_timestamp"] is None
+    assert rows[0]["execution_duration"] == 12.0
+    assert rows[0]["affected_tables"] == ["table1", "table2"]
+    assert rows[0]["execution_parameters"] == [("--day", "2024-01-01")]
+
+
+@patch("aws_glue_workflow_analyzer.output.logger")
+def test_save_to_parquet_without_pyarrow(mock_logger, monkeypatch, tmp_path):
+    """Test that Parquet output reports the missing optional dependency."""
+    monkeypatch.setitem(sys.modules, "pyarrow", None)
+
+    save_to_parquet([{"execution_id": "run1"}], str(tmp_path / "results.parquet"))
+
+    assert "pip install aws-glue-workflow-analyzer[parquet]" in (
+        mock_logger.error.call_args.args[0]
+    )
+
+
+def test_save_to_jsonl(tmp_path):
+    """Test streaming compact records with timestamps to a JSON Lines file."""
+    file_path = tmp_path / "results.jsonl"
+
+    save_to_jsonl((make_step_record(index) for index in range(2)), str(file_path))
+
+    lines = file_path.read_text(encoding="utf-8").splitlines()
+    assert len(lines) == 2
+    assert lines[0].startswith('{"execution_id":"run0","workflow_name":"wf1",')
+    assert json.loads(lines[0])["execution_start_timestamp"] == (
+        "2024-01-01T00:00:00+00:00"
+    )
+    assert json.loads(lines[1])["affected_tables"] == ["table1", "table2"]
+
+
+def test_save_to_json_encodes_timestamps(tmp_path):
+    """Test that the JSON writer serializes the timestamps of step records."""
+    file_path = tmp_path / "results.json"
+
+    save_to_json([make_step_record(0)], str(file_path))
+
+    records = json.loads(file_path.read_text(encoding="utf-8"))
+    assert records[0]["execution_start_timestamp"] == "2024-01-01T00:00:00+00:00"
+
+
+@patch("aws_glue_workflow_analyzer.output.open", new_callable=mock_open)
+@patch("aws_glue_workflow_analyzer.output.logger")
+def test_save_to_jsonl_io_error(mock_logger, mock_file):
+    """Test saving data to a JSON Lines file when an IOError occurs."""
+    mock_file.side_effect = IOError("Failed to write to file")
+
+    save_to_jsonl([{"key": "value"}], "results.jsonl")
+
+    mock_logger.error.assert_called_once_with(
+        "Failed to save analysis results to JSON Lines: Failed to write to file"
+    )
+
+
+def test_save_to_csv_fixed_schema(tmp_path):
+    """Test that step records are written with the declared columns, flattened."""
+    file_path = tmp_path / "results.csv"
+    record = make_step_record(0)
+    record["error_message"] = 'Error: "quoted", with comma'
+    del record["log_group_name"]
+
+    save_to_csv(
+        iter([{"unexpected": "field", "execution_id": "run1"}, record]), str(file_path)
+    )
+
+    with open(file_path, newline="", encoding="utf-8") as csv_file:
+        rows = list(csv.DictReader(csv_file))
+    assert list(rows[0]) == list(STEP_RECORD_FIELDS)
+    assert rows[0]["execution_id"] == "run1"
+    assert rows[0]["affected_tables"] == ""
+    assert rows[1]["execution_start_timestamp"] == "2024-01-01T00:00:00+00:00"
+    assert rows[1]["execution_duration"] == "12"
+    assert rows[1]["error_message"] == 'Error: "quoted", with comma'
+    assert rows[1]["log_group_name"] == ""
+    assert json.loads(rows[1]["affected_tables"]) == ["table1", "table2"]
+    assert json.loads(rows[1]["execution_parameters"]) == {"--day": "2024-01-01"}
+
+
+def test_save_to_csv_shards_by_size(tmp_path):
+    """Test that rows continue in numbered shards, each with a header."""
+    file_path = tmp_path / "results.csv"
+
+    save_to_csv(
+        (make_step_record(index) for index in range(10)),
+        str(file_path),
+        max_shard_bytes=1000,
+    )
+
+    shards = sorted(tmp_path.iterdir())
+    assert not file_path.exists()
+    assert [shard.name for shard in shards][:2] == [
+        "results-00000.csv",
+        "results-00001.csv",
+    ]
+    execution_ids = []
+    for shard in shards:
+        assert shard.stat().st_size < 1000 + 500
+        with open(shard, newline="", encoding="utf-8") as csv_file:
+            execution_ids += [row["execution_id"] for row in csv.DictReader(csv_file)]
+    assert execution_ids == [f"run{index}" for index in range(10)]
+
+
+def test_save_to_csv_shards_by_bytes(tmp_path):
+    """Test that the shard size counts encoded bytes rather than characters."""
+    file_path = tmp_path / "results.csv"
+    records = [
+        dict(make_step_record(index), error_message="\u00e9" * 200)
+        for index in range(10)
+    ]
+
+    save_to_csv(records, str(file_path), max_shard_bytes=1000)
+
+    shards = sorted(tmp_path.iterdir())
+    assert len(shards) > 2
+    for shard in shards:
+        assert shard.stat().st_size < 1000 + 600
+
+
+def test_save_to_jsonl_gzip(tmp_path):
+    """Test streaming JSON Lines through a gzip compressor."""
+    file_path = tmp_path / "results.jsonl"
+
+    save_to_jsonl(
+        (make_step_record(index) for index in range(3)),
+        str(file_path),
+        compression="gzip",
+        compression_level=1,
+    )
+
+    assert not file_path.exists()
+    with gzip.open(f"{file_path}.gz", "rt", encoding="utf-8") as jsonl_file:
+        assert [json.loads(line)["execution_id"] for line in jsonl_file] == [
+            "run0",
+            "run1",
+            "run2",
+        ]
+
+
+@pytest.mark.parametrize(
+    "compression, compression_level", [("gzip", 15), ("zstd", 99), (None, 5)]
+)
+def test_save_to_jsonl_invalid_compression_level(
+    compression, compression_level, tmp_path
+):
+    """Test that an invalid compression level is reported without writing."""
+    file_path = tmp_path / "results.jsonl"
+
+    assert not save_to_jsonl(
+        (make_step_record(index) for index in range(3)),
+        str(file_path),
+        compression=compression,
+        compression_level=compression_level,
+    )
+
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_save_to_parquet_level_without_codec(tmp_path):
+    """Test that a level is rejected for snappy before the file is created."""
+    pytest.importorskip("pyarrow.parquet")
+    file_path = tmp_path / "results.parquet"
+
+    assert not save_to_parquet(
+        (make_step_record(index) for index in range(3)),
+        str(file_path),
+        compression_level=5,
+    )
+
+    assert not file_path.exists()
+
+
+def test_save_to_csv_gzip_shards(tmp_path):
+    """Test that every CSV shard is compressed and keeps its header."""
+    file_path = tmp_path / "results.csv.gz"
+
+    save_to_csv(
+        (make_step_record(index) for index in range(10)),
+        str(file_path),
+        max_shard_bytes=1000,
+        compression="gzip",
+    )
+
+    shards = sorted(tmp_path.iterdir())
+    assert shards[0].name == "results-00000.csv.gz"
+    execution_ids = []
+    for shard in shards:
+        with gzip.open(shard, "rt", newline="", encoding="utf-8") as csv_file:
+            execution_ids += [row["execution_id"] for row in csv.DictReader(csv_file)]
+    assert execution_ids == [f"run{index}" for index in range(10)]
+
+
+def test_save_to_json_zstd(tmp_path):
+    """Test writing a JSON array through a zstd compressor."""
+    zstandard = pytest.importorskip("zstandard")
+    file_path = tmp_path / "results.json"
+
+    save_to_json([make_step_record(0)], str(file_path), compression="zstd")
+
+    with zstandard.open(f"{file_path}.zst", "rt", encoding="utf-8") as json_file:
+        assert json.load(json_file)[0]["execution_id"] == "run0"
+
+
+@patch("aws_glue_workflow_analyzer.output.logger")
+def test_save_to_json_zstd_without_zstandard(mock_logger, monkeypatch, tmp_path):
+    """Test that zstd output reports the missing optional dependency."""
+    monkeypatch.setitem(sys.modules, "zstandard", None)
+
+    save_to_json([{"key": "value"}], str(tmp_path / "results.json"), "zstd")
+
+    assert "pip install aws-glue-workflow-analyzer[zstd]" in (
+        mock_logger.error.call_args.args[0]
+    )
@@ -1,6 +1,6 @@
 from unittest.mock import Mock, call
 
-from aws_glue_workflow_analyzer.paginator import paginate_boto3
+from aws_glue_workflow_analyzer.paginator import iter_paginate_boto3, paginate_boto3
 
 
 def test_paginate_boto3_single_page():
@@ -94,3 +94,80 @@ def test_paginate_boto3_with_additional_params():
     # Check that the result matches the expected output
     assert result == [{"Id": "item1"}]
     mock_callable.assert_called_once_with(Param1="value1", Param2="value2")
+
+
+def test_iter_paginate_boto3_is_lazy():
+    """Test that iter_paginate_boto3 only requests pages as items are consumed."""
+    mock_callable = Mock()
+    mock_callable.side_effect = [
+        {"Items": [{"Id": "item1"}], "NextToken": "token1"},
+        {"Items": [{"Id": "item2"}]},
+    ]
+
+    items = iter_paginate_boto3(mock_callable, dict_key="Items")
+    mock_callable.assert_not_called()
+
+    assert next(items) == {"Id": "item1"}
+    mock_callable.assert_called_once_with()
+
+
+def test_iter_paginate_boto3_stop_when():
+    """Test that pagination stops at the first item matching the stop predicate."""
+    mock_callable = Mock()
+    mock_callable.side_effect = [
+        {"Items": [{"Id": 1}, {"Id": 2}], "NextToken": "token1"},
+        {"Items": [{"Id": 3}, {"Id": 4}], "NextToken": "token2"},
+        {"Items": [{"Id": 5}]},
+    ]
+
+    result = list(
+        iter_paginate_boto3(
+            mock_callable, dict_key="Items", stop_when=lambda item: item["Id"] == 4
+        )
+    )
+
+    assert result == [{"Id": 1}, {"Id": 2}, {"Id": 3}]
+    assert mock_callable.call_count == 2
+
+
+def test_iter_paginate_boto3_max_items():
+    """Test that pagination stops once max_items items have been yielded."""
+    mock_callable = Mock()
+    mock_callable.side_effect = [
+        {"Items": [{"Id": 1}, {"Id": 2}], "NextToken": "token1"},
+        {"Items": [{"Id": 3}]},
+    ]
+
+    result = list(iter_paginate_boto3(mock_callable, dict_key="Items", max_items=2))
+
+    assert result == [{"Id": 1}, {"Id": 2}]
+    mock_callable.assert_called_once_with()
+
+
+def test_iter_paginate_boto3_custom_tokens():
+    """Test pagination with custom token names that repeat on the last page."""
+    mock_callable = Mock()
+    mock_callable.side_effect = [
+        {"events": [{"message": "a"}], "nextForwardToken": "f/1"},
+        {"events": [{"message": "b"}], "nextForwardToken": "f/2"},
+        {"events": [], "nextForwardToken": "f/2"},
+    ]
+
+    result = list(
+        iter_paginate_boto3(
+            mock_callable,
+            dict_key="events",
+            input_token="nextToken",
+            output_token="nextForwardToken",
+            logGroupName="group",
+        )
+    )
+
+    assert result == [{"message": "a"}, {"message": "b"}]
+    mock_callable.assert_has_calls(
+        [
+            call(logGroupName="group"),
+            call(logGroupName="group", nextToken="f/1"),
+            call(logGroupName="group", nextToken="f/2"),
+        ]
+    )
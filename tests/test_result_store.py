@@ -0,0 +1,146 @@
+import datetime
+import sqlite3
+
+import pytest
+
+from aws_glue_workflow_analyzer.exceptions import WorkflowAnalyzerError
+from aws_glue_workflow_analyzer.result_store import ResultStore
+
+STARTED_ON = datetime.datetime(2024, 3, 1, 12, tzinfo=datetime.timezone.utc)
+
+
+def make_record(execution_id, node_id, status="SUCCEEDED", days=0, **overrides):
+    started_on = STARTED_ON + datetime.timedelta(days=days)
+    record = {
+        "execution_id": execution_id,
+        "workflow_name": "wf1",
+        "node_id": node_id,
+        "node_type": "Job",
+        "node_name": f"{node_id}_name",
+        "execution_status": status,
+        "execution_start_timestamp": started_on,
+        "execution_end_timestamp": started_on + datetime.timedelta(minutes=10),
+        "execution_duration": 600.0,
+        "error_message": None,
+        "affected_tables": ["table1"],
+        "log_group_name": "group",
+        "log_stream_name": "stream",
+        "execution_parameters": {"--day": "2024-03-01"},
+    }
+    record.update(overrides)
+    return record
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = ResultStore(str(tmp_path / "results.sqlite3"), batch_size=2)
+    yield store
+    store.close()
+
+
+def test_upsert_replaces_steps_by_run_and_node(store):
+    records = [
+        make_record("run1", "node1", "FAILED"),
+        make_record("run1", "node2"),
+        make_record("run2", "node1", days=1),
+    ]
+
+    assert store.upsert(iter(records)) == 3
+    assert store.upsert([make_record("run1", "node1", "SUCCEEDED")]) == 1
+
+    columns, rows = store.execute(
+        "SELECT execution_id, node_id, execution_status, execution_start_timestamp, "
+        "affected_tables, execution_parameters FROM step_runs ORDER BY execution_id, node_id"
+    )
+    assert columns[0] == "execution_id"
+    assert rows == [
+        (
+            "run1",
+            "node1",
+            "SUCCEEDED",
+            "2024-03-01T12:00:00+00:00",
+            '["table1"]',
+            '{"--day": "2024-03-01"}',
+        ),
+        (
+            "run1",
+            "node2",
+            "SUCCEEDED",
+            "2024-03-01T12:00:00+00:00",
+            '["table1"]',
+            '{"--day": "2024-03-01"}',
+        ),
+        (
+            "run2",
+            "node1",
+            "SUCCEEDED",
+            "2024-03-02T12:00:00+00:00",
+            '["table1"]',
+            '{"--day": "2024-03-01"}',
+        ),
+    ]
+
+
+def test_aggregate_counts_failures(store):
+    store.upsert(
+        [
+            make_record("run1", "node1", "FAILED"),
+            make_record("run2", "node1", "TIMEOUT", days=1),
+            make_record("run3", "node1", days=2),
+            make_record("run1", "node2"),
+            make_record("run4", "node1", "FAILED", days=40),
+        ]
+    )
+
+    columns, rows = store.aggregate(since="2024-03-01", until="2024-04-01")
+    assert columns == [
+        "workflow",
+        "node",
+        "runs",
+        "failures",
+        "avg_duration",
+        "last_started",
+    ]
+    assert rows == [
+        ("wf1", "node1", 3, 2, 600.0, "2024-03-03T12:00:00+00:00"),
+        ("wf1", "node2", 1, 0, 600.0, "2024-03-01T12:00:00+00:00"),
+    ]
+
+    _, rows = store.aggregate(group_by=["day"], node="node1_name", status="FAILED")
+    assert [row[:3] for row in rows] == [("2024-03-01", 1, 1), ("2024-04-10", 1, 1)]
+
+
+def test_aggregate_rejects_unknown_grouping(store):
+    with pytest.raises(WorkflowAnalyzerError):
+        store.aggregate(group_by=["owner"])
+
+
+def test_read_only_store(store):
+    store.upsert([make_record("run1", "node1")])
+    read_only = ResultStore(store.path, read_only=True)
+
+    assert read_only.aggregate(group_by=[])[1][0][0] == 1
+    with pytest.raises(WorkflowAnalyzerError):
+        read_only.execute("DELETE FROM step_runs")
+    read_only.close()
+
+    with pytest.raises(WorkflowAnalyzerError):
+        ResultStore(store.path + ".missing", read_only=True)
+
+
+def test_store_adds_missing_columns(tmp_path):
+    path = str(tmp_path / "old.sqlite3")
+    connection = sqlite3.connect(path)
+    connection.execute(
+        "CREATE TABLE step_runs (execution_id TEXT NOT NULL, node_id TEXT NOT NULL, "
+        "workflow_name TEXT NOT NULL, PRIMARY KEY (execution_id, node_id))"
+    )
+    connection.close()
+
+    store = ResultStore(path)
+    store.upsert([make_record("run1", "node1", failure_categories=["oom"])])
+
+    assert store.execute("SELECT failure_categories FROM step_runs")[1] == [
+        ('["oom"]',)
+    ]
+    store.close()
@@ -0,0 +1,69 @@
+import datetime
+
+import pytest
+
+from aws_glue_workflow_analyzer.exceptions import WorkflowAnalyzerError
+from aws_glue_workflow_analyzer.state import HighWaterMark, IncrementalState
+
+NOW = datetime.datetime(2024, 1, 1, 12, tzinfo=datetime.timezone.utc)
+
+
+def make_run(run_id, hours_ago, status="COMPLETED"):
+    started_on = NOW - datetime.timedelta(hours=hours_ago)
+    run = {"RunId": run_id, "StartedOn": started_on, "Status": status}
+    if status != "RUNNING":
+        run["CompletedOn"] = started_on + datetime.timedelta(minutes=5)
+    return run
+
+
+def test_advance_and_save_round_trip(tmp_path):
+    path = str(tmp_path / "state" / "gwfa-state.json")
+    state = IncrementalState(path)
+    assert state.get_mark("wf") is None
+
+    state.advance(
+        "wf",
+        [make_run("run-3", 1, "RUNNING"), make_run("run-2", 2), make_run("run-1", 3)],
+    )
+    state.advance("empty", [])
+    state.save()
+
+    mark = IncrementalState(path).get_mark("wf")
+    assert mark == HighWaterMark(
+        "run-3", NOW - datetime.timedelta(hours=1), {"run-3": mark.started_on}
+    )
+    assert IncrementalState(path).get_mark("empty") is None
+
+
+def test_advance_keeps_newer_mark(tmp_path):
+    state = IncrementalState(str(tmp_path / "state.json"))
+    state.advance("wf", [make_run("run-2", 1)])
+
+    state.advance("wf", [make_run("run-1", 5, "RUNNING")])
+
+    mark = state.get_mark("wf")
+    assert mark.run_id == "run-2"
+    assert mark.floor == NOW - datetime.timedelta(hours=5)
+
+
+def test_high_water_mark_is_new():
+    mark = HighWaterMark(
+        "run-2",
+        NOW - datetime.timedelta(hours=2),
+        {"run-1": NOW - datetime.timedelta(hours=3)},
+    )
+
+    assert mark.is_new(make_run("run-3", 1))
+    assert mark.is_new(make_run("run-1", 3))
+    assert not mark.is_new(make_run("run-2", 2))
+    assert mark.is_new(make_run("run-2b", 2))
+    assert not mark.is_new(make_run("run-0", 4))
+    assert mark.floor == NOW - datetime.timedelta(hours=3)
+
+
+def test_invalid_state_file(tmp_path):
+    path = tmp_path / "state.json"
+    path.write_text('{"workflows": {"wf": {"StartedOn": "yesterday"}}}')
+
+    with pytest.raises(WorkflowAnalyzerError):
+        IncrementalState(str(path))